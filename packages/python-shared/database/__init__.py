@@ -1 +1,9 @@
-# Database package initialization
\ No newline at end of file
+"""Shared database clients.
+
+The sync client module connects on import (it creates a module-level
+instance), so it is imported explicitly: database.supabase_client.
+"""
+
+from .async_client import AsyncSupabaseClient, LatencyHistogram
+
+__all__ = ['AsyncSupabaseClient', 'LatencyHistogram']
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Async Supabase Client for Python
+
+This module provides an asyncio client for the Supabase REST (PostgREST)
+API. One pooled HTTP session is reused for all requests, a semaphore caps
+the number of requests in flight, failed requests are retried with
+jittered exponential backoff, and request latency is recorded per
+table and operation.
+
+429 responses and connection failures (the request never reached the
+server) are always retried. Timeouts and 5xx responses are retried only
+for idempotent operations: select, update, delete and upserts with a
+conflict target. insert and rpc may already have been applied, so they
+retry those only when called with retry=True.
+
+Usage:
+    async with AsyncSupabaseClient.from_env() as db:
+        rows = await db.select('presentations', columns='id, title', limit=10)
+        await db.upsert('presentation_keywords', records, on_conflict='presentation_id,keyword')
+        print(db.latency_stats())
+"""
+
+import asyncio
+import bisect
+import logging
+import os
+import random
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from dotenv import load_dotenv
+
+try:
+    import httpx
+except ImportError:
+    print("httpx not installed. Install with: pip install httpx")
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Rejected before processing, so safe to retry for any operation
+ALWAYS_RETRY_STATUS_CODES = {429}
+
+# Latency bucket upper bounds in milliseconds
+DEFAULT_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram."""
+
+    def __init__(self, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)  # last bucket is overflow
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, seconds: float):
+        """Record one request duration"""
+        ms = seconds * 1000
+        self.counts[bisect.bisect_left(self.buckets_ms, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, q: float) -> float:
+        """Approximate percentile (bucket upper bound), q in [0, 100]"""
+        if not self.count:
+            return 0.0
+        target = q / 100 * self.count
+        seen = 0
+        for bound, n in zip(self.buckets_ms, self.counts):
+            seen += n
+            if seen >= target:
+                return float(bound)
+        return round(self.max_ms, 2)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary statistics and raw bucket counts"""
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total_ms / self.count, 2) if self.count else 0.0,
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'p99_ms': self.percentile(99),
+            'max_ms': round(self.max_ms, 2),
+            'buckets': {
+                **{f"le_{b}": n for b, n in zip(self.buckets_ms, self.counts)},
+                'inf': self.counts[-1]
+            }
+        }
+
+
+class AsyncSupabaseClient:
+    """Asyncio client for the Supabase REST API"""
+
+    def __init__(
+        self,
+        url: str,
+        key: str,
+        max_concurrency: int = 8,
+        max_connections: int = 20,
+        max_retries: int = 4,
+        backoff_base: float = 0.25,
+        backoff_max: float = 8.0,
+        timeout: float = 30.0
+    ):
+        """
+        Args:
+            url: Supabase project URL
+            key: Service role or anon key
+            max_concurrency: Maximum requests in flight
+            max_connections: Size of the HTTP connection pool
+            max_retries: Retries after the first attempt on retryable failures
+            backoff_base: First backoff ceiling in seconds (doubles per retry)
+            backoff_max: Largest backoff ceiling in seconds
+            timeout: Per-request timeout in seconds
+        """
+        if httpx is None:
+            raise ImportError("httpx is required for AsyncSupabaseClient")
+
+        self.url = url.rstrip('/')
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._histograms: Dict[Tuple[str, str], LatencyHistogram] = defaultdict(LatencyHistogram)
+        self._http = httpx.AsyncClient(
+            base_url=f"{self.url}/rest/v1",
+            headers={
+                'apikey': key,
+                'Authorization': f"Bearer {key}",
+                'Content-Type': 'application/json'
+            },
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            ),
+            timeout=timeout
+        )
+
+    @classmethod
+    def from_env(cls, **kwargs) -> 'AsyncSupabaseClient':
+        """Create a client from the same environment variables as SupabaseClient"""
+        for env_file in ['.env', '.env.local', '.env.development']:
+            if os.path.exists(env_file):
+                load_dotenv(env_file)
+
+        supabase_url = os.getenv('SUPABASE_URL') or os.getenv('CLI_SUPABASE_URL')
+        supabase_key = (os.getenv('SUPABASE_SERVICE_ROLE_KEY') or os.getenv('SUPABASE_SERVICE_KEY')
+                        or os.getenv('SUPABASE_KEY') or os.getenv('CLI_SUPABASE_KEY'))
+
+        if not supabase_url or not supabase_key:
+            raise ValueError("Supabase URL and key must be provided in environment variables")
+
+        return cls(supabase_url, supabase_key, **kwargs)
+
+    async def __aenter__(self) -> 'AsyncSupabaseClient':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the pooled HTTP session"""
+        await self._http.aclose()
+
+    @property
+    def is_closed(self) -> bool:
+        """Whether aclose() has been called"""
+        return self._http.is_closed
+
+    async def select(
+        self,
+        table: str,
+        columns: str = '*',
+        filters: Optional[Dict[str, Any]] = None,
+        order: Optional[str] = None,
+        limit: Optional[int] = None,
+        params: Optional[Dict[str, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Select rows from a table
+
+        Args:
+            table: Table name
+            columns: Columns to select
+            filters: Equality filters (list values become IN filters)
+            order: Order clause, e.g. 'id' or 'created_at.desc'
+            limit: Maximum number of rows
+            params: Raw PostgREST filters, e.g. {'rank': 'lte.5'}
+
+        Returns:
+            Selected rows
+        """
+        query = {'select': columns, **self._filter_params(filters), **(params or {})}
+        if order:
+            query['order'] = order
+        if limit is not None:
+            query['limit'] = str(limit)
+
+        return await self._request('GET', table, 'select', params=query)
+
+    async def insert(self, table: str, data: Union[Dict[str, Any], List[Dict[str, Any]]],
+                     returning: bool = False, retry: bool = False) -> List[Dict[str, Any]]:
+        """Insert one or more rows
+
+        Timeouts and 5xx responses are not retried unless retry is set,
+        since the rows may already have been written.
+        """
+        return await self._request('POST', table, 'insert', json=data,
+                                   prefer=self._return_pref(returning), idempotent=retry)
+
+    async def upsert(self, table: str, data: Union[Dict[str, Any], List[Dict[str, Any]]],
+                     on_conflict: Optional[str] = None, returning: bool = False) -> List[Dict[str, Any]]:
+        """Insert rows, updating those that conflict on on_conflict"""
+        params = {'on_conflict': on_conflict} if on_conflict else None
+        prefer = f"resolution=merge-duplicates,{self._return_pref(returning)}"
+        return await self._request('POST', table, 'upsert', json=data, params=params, prefer=prefer,
+                                   idempotent=on_conflict is not None)
+
+    async def update(self, table: str, data: Dict[str, Any], match: Dict[str, Any],
+                     returning: bool = False) -> List[Dict[str, Any]]:
+        """Update rows matching all equality filters"""
+        return await self._request('PATCH', table, 'update', json=data,
+                                   params=self._filter_params(match),
+                                   prefer=self._return_pref(returning))
+
+    async def delete(self, table: str, match: Dict[str, Any],
+                     params: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        """Delete rows matching all equality filters and raw PostgREST filters in params"""
+        return await self._request('DELETE', table, 'delete',
+                                   params={**self._filter_params(match), **(params or {})},
+                                   prefer=self._return_pref(False))
+
+    async def rpc(self, function_name: str, params: Optional[Dict[str, Any]] = None,
+                  retry: bool = False) -> Any:
+        """Call a Postgres function
+
+        Set retry for functions that are safe to apply twice; otherwise
+        timeouts and 5xx responses are not retried.
+        """
+        return await self._request('POST', f"rpc/{function_name}", 'rpc', json=params or {},
+                                   idempotent=retry)
+
+    def latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Latency summaries keyed by 'table.operation'"""
+        return {f"{table}.{operation}": histogram.to_dict()
+                for (table, operation), histogram in sorted(self._histograms.items())}
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        operation: str,
+        json: Any = None,
+        params: Optional[Dict[str, str]] = None,
+        prefer: Optional[str] = None,
+        idempotent: bool = True
+    ) -> Any:
+        """Send one request with concurrency limiting, retries and latency tracking
+
+        Requests that may have reached the server (timeouts, 5xx) are only
+        retried when idempotent is set.
+        """
+        headers = {'Prefer': prefer} if prefer else None
+        histogram = self._histograms[(path, operation)]
+
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+
+            async with self._semaphore:
+                start = time.perf_counter()
+                try:
+                    response = await self._http.request(method, f"/{path}", json=json,
+                                                        params=params, headers=headers)
+                except httpx.TransportError as e:
+                    histogram.observe(time.perf_counter() - start)
+                    # Connection failures never reached the server
+                    unsent = isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+                    if attempt == self.max_retries or not (idempotent or unsent):
+                        raise
+                    logger.warning(f"{operation} {path} failed ({e}); retrying")
+                else:
+                    histogram.observe(time.perf_counter() - start)
+                    retryable = RETRY_STATUS_CODES if idempotent else ALWAYS_RETRY_STATUS_CODES
+                    if response.status_code not in retryable or attempt == self.max_retries:
+                        response.raise_for_status()
+                        return response.json() if response.content else []
+                    retry_after = self._retry_after(response)
+                    logger.warning(f"{operation} {path} returned {response.status_code}; retrying")
+
+            # Sleep outside the semaphore so waiting retries don't block other requests
+            await asyncio.sleep(self._backoff(attempt, retry_after))
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        """Full-jitter exponential backoff, never shorter than Retry-After"""
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        delay = random.uniform(0, ceiling)
+        return max(delay, retry_after) if retry_after is not None else delay
+
+    @staticmethod
+    def _retry_after(response: 'httpx.Response') -> Optional[float]:
+        """Parse a Retry-After header given in seconds"""
+        try:
+            return float(response.headers['Retry-After'])
+        except (KeyError, ValueError):
+            return None
+
+    @staticmethod
+    def _return_pref(returning: bool) -> str:
+        return 'return=representation' if returning else 'return=minimal'
+
+    @staticmethod
+    def _filter_params(filters: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Translate equality filters to PostgREST query parameters"""
+        params = {}
+        for column, value in (filters or {}).items():
+            if isinstance(value, (list, tuple, set)):
+                params[column] = f"in.({','.join(str(v) for v in value)})"
+            elif value is None:
+                params[column] = 'is.null'
+            else:
+                params[column] = f"eq.{value}"
+        return params
@@ -2,18 +2,28 @@
 """Main CLI for analyzing presentations."""
 
 import click
+import json
 import logging
-from typing import Optional
+from contextlib import nullcontext
+from itertools import islice, tee
+from typing import Any, Optional, List, Dict, Iterable, Iterator, Tuple, Union
 import sys
 from pathlib import Path
 
 # Add package to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from analyzers import EntityExtractor, KeywordExtractor, EmbeddingGenerator
+from analyzers import (
+    EntityExtractor, KeywordExtractor, EmbeddingGenerator, SpacyAnalyzer, DocCache,
+    CorpusTfidfModel, AnalyzerProcessPool, load_spacy_model, required_components
+)
 from db import PresentationQueries
+from db.async_writer import AsyncAnalysisWriter
 from models import Presentation, AnalysisResult
+from pipeline import StagedPipeline, AnalysisPlan, AnalysisPlanner
 from utils import clean_text
+from utils.embedding_codec import EMBEDDING_FORMATS
+from utils.profiling import PROFILE_ENGINES, SampleProfiler, profiler
 
 # Setup logging
 logging.basicConfig(
@@ -23,6 +33,480 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def iter_analysis_states(
+    window_lists: Iterable[Optional[List[Tuple[int, str]]]],
+    analyzers: List[SpacyAnalyzer],
+    batch_size: int,
+    n_process: int
+) -> Iterator[Optional[Dict[SpacyAnalyzer, Dict[str, Any]]]]:
+    """Stream every presentation's windows through spaCy and merge per-window results.
+    
+    Each window is parsed once per distinct spaCy pipeline and the Doc is fed
+    to every analyzer sharing that pipeline. Windows of all presentations flow
+    through one nlp.pipe stream, so only a batch of Docs is alive at a time.
+    window_lists is consumed lazily (each stream reads it through its own tee),
+    so only the presentations nlp.pipe has read ahead are held in memory.
+    
+    Args:
+        window_lists: (offset, text) windows per presentation, e.g. a generator
+            (None entries are skipped)
+        analyzers: Active spaCy analyzers
+        batch_size: nlp.pipe batch size
+        n_process: nlp.pipe worker processes
+        
+    Yields:
+        Mapping of analyzer to its accumulated state for each presentation,
+        or None for skipped or failed presentations
+    """
+    pipelines = {}
+    for analyzer in analyzers:
+        pipelines.setdefault(id(analyzer.nlp), analyzer)
+        
+    sources = tee(window_lists, len(pipelines) + 1)
+    streams = {
+        key: analyzer.parse_many(
+            (text for windows in source if windows for _, text in windows),
+            batch_size=batch_size,
+            n_process=n_process
+        )
+        for (key, analyzer), source in zip(pipelines.items(), sources[1:])
+    }
+    
+    for windows in sources[0]:
+        if windows is None:
+            yield None
+            continue
+            
+        states = {analyzer: analyzer.new_state() for analyzer in analyzers}
+        failed = False
+        
+        for offset, _ in windows:
+            # Always advance every stream so later presentations stay aligned
+            docs = {key: next(stream) for key, stream in streams.items()}
+            profiler.count('tokens', len(next(iter(docs.values()))))
+            if failed:
+                continue
+            try:
+                for analyzer in analyzers:
+                    analyzer.accumulate(states[analyzer], docs[id(analyzer.nlp)], offset)
+            except Exception as e:
+                logger.error(f"Error analyzing window at offset {offset}: {e}")
+                failed = True
+                
+        yield None if failed else states
+
+
+def needs_spacy(plan: AnalysisPlan) -> bool:
+    """Check whether any of a plan's stages parses the text with spaCy."""
+    return plan.needs('entities') or plan.needs('keywords')
+
+
+def finalize_spacy_results(
+    result: AnalysisResult,
+    states: Optional[Dict[SpacyAnalyzer, Dict[str, Any]]],
+    entity_extractor: Optional[EntityExtractor],
+    keyword_extractor: Optional[KeywordExtractor],
+    tfidf_model: Optional[CorpusTfidfModel]
+) -> Optional[List[str]]:
+    """Turn accumulated spaCy states into entity and keyword results.
+    
+    Args:
+        result: Result container to fill
+        states: Accumulated analyzer states, or None if the text was invalid
+        entity_extractor: Active entity extractor
+        keyword_extractor: Active keyword extractor
+        tfidf_model: Corpus TF-IDF model to grow with the presentation
+        
+    Returns:
+        Distinct candidate terms of the presentation, or None if no keywords
+        were extracted
+    """
+    terms = None
+    
+    # Extract entities
+    if entity_extractor:
+        logger.info("  - Extracting entities...")
+        if states is None:
+            entities = {"error": "Invalid input"}
+        else:
+            entities = entity_extractor.finalize(states[entity_extractor])
+        result.entities = entities
+        
+        # Log summary
+        total_entities = sum(len(v) for k, v in entities.items() 
+                           if isinstance(v, list) and k != 'metadata')
+        logger.info(f"    Found {total_entities} entities")
+        
+    # Extract keywords
+    if keyword_extractor:
+        logger.info("  - Extracting keywords...")
+        if states is None:
+            keywords = {"error": "Invalid input"}
+        else:
+            keyword_state = states[keyword_extractor]
+            keywords = keyword_extractor.finalize(keyword_state)
+            terms = list(keyword_state['term_freq'])
+            
+            # Grow the corpus statistics with new presentations
+            # (document frequency only needs the distinct terms)
+            if tfidf_model is not None:
+                tfidf_model.add_documents([terms], [result.presentation_id])
+        result.keywords = keywords
+        
+        # Log summary
+        for method, kws in keywords.items():
+            if isinstance(kws, list) and method != 'metadata':
+                logger.info(f"    {method}: {len(kws)} keywords")
+                
+    return terms
+
+
+def generate_embedding_results(
+    result: AnalysisResult,
+    pres: Presentation,
+    embedding_generator: EmbeddingGenerator,
+    chunk_index_dir: Optional[str]
+):
+    """Generate the presentation embedding and optional chunk index.
+    
+    Args:
+        result: Result container to fill
+        pres: Presentation being analyzed
+        embedding_generator: Embedding generator
+        chunk_index_dir: Directory for per-presentation chunk indexes
+    """
+    logger.info("  - Generating embeddings...")
+    
+    # Generate comprehensive embedding
+    embedding_result = embedding_generator.generate_presentation_embedding(
+        title=pres.title or "",
+        summary=pres.summary or "",
+        transcript=pres.transcript_text or ""
+    )
+    result.embeddings = embedding_result.tolist()
+    logger.info(f"    Generated {len(result.embeddings)}-dimensional embedding")
+    
+    # Build a searchable chunk index over the transcript
+    if chunk_index_dir and pres.transcript_text:
+        chunk_index = embedding_generator.build_chunk_index(
+            pres.transcript_text,
+            metadata={'presentation_id': pres.id}
+        )
+        chunk_index.save(Path(chunk_index_dir) / pres.id)
+        logger.info(f"    Indexed {len(chunk_index)} transcript chunks")
+
+
+def save_results(queries: Union[PresentationQueries, AsyncAnalysisWriter], result: AnalysisResult,
+                 replace: bool = False, manifest: Optional[Dict[str, Dict[str, str]]] = None):
+    """Save analysis results to the database.
+    
+    Args:
+        queries: Database queries, or an AsyncAnalysisWriter (same save methods)
+        result: Analysis results to save
+        replace: Replace previous entities and keywords
+        manifest: Analysis manifest entry to record with each saved stage
+    """
+    logger.info("  - Saving results to database...")
+    
+    # Collect saved stages so the processing status is written once
+    completed = []
+    
+    if result.entities:
+        if queries.save_presentation_entities(result.presentation_id, result.entities,
+                                              mark_processed=False, replace=replace):
+            completed.append('entities')
+        
+    if result.keywords:
+        if queries.save_presentation_keywords(result.presentation_id, result.keywords,
+                                              mark_processed=False, replace=replace):
+            completed.append('keywords')
+        
+    if result.embeddings:
+        if queries.save_presentation_embedding(result.presentation_id, result.embeddings,
+                                               mark_processed=False):
+            completed.append('embeddings')
+            
+    if completed:
+        queries.mark_presentation_processed(
+            result.presentation_id,
+            {stage: (manifest or {}).get(stage, {}) for stage in completed}
+        )
+        
+    logger.info("  ✓ Analysis complete")
+
+
+def run_staged_pipeline(
+    plans: Iterable[AnalysisPlan],
+    queries: PresentationQueries,
+    entity_extractor: Optional[EntityExtractor],
+    keyword_extractor: Optional[KeywordExtractor],
+    embedding_generator: Optional[EmbeddingGenerator],
+    tfidf_model: Optional[CorpusTfidfModel],
+    chunk_index_dir: Optional[str],
+    window_size: int,
+    parse_batch_size: int,
+    n_process: int,
+    save_workers: int,
+    queue_size: int,
+    replace_existing: bool,
+    dry_run: bool
+) -> Tuple[int, int]:
+    """Analyze presentations with fetch, parse, embed and save running concurrently.
+    
+    Args:
+        plans: Presentations and their stages to run (consumed lazily by the source thread)
+        queries: Database queries
+        entity_extractor: Active entity extractor
+        keyword_extractor: Active keyword extractor
+        embedding_generator: Active embedding generator
+        tfidf_model: Corpus TF-IDF model to grow
+        chunk_index_dir: Directory for per-presentation chunk indexes
+        window_size: Characters per analysis window
+        parse_batch_size: nlp.pipe batch size (batches span presentations)
+        n_process: nlp.pipe worker processes
+        save_workers: Concurrent save workers (sharing one async connection pool)
+        queue_size: Capacity of each inter-stage queue
+        replace_existing: Replace previous entities and keywords
+        dry_run: Skip the save stage
+        
+    Returns:
+        Tuple of (presentations that completed every stage, presentations fetched)
+    """
+    spacy_analyzers = [a for a in (entity_extractor, keyword_extractor) if a]
+    
+    def load(plan: AnalysisPlan):
+        pres = plan.presentation
+        analysis_text = pres.get_analysis_text()
+        if not analysis_text:
+            logger.warning(f"No text found for presentation {pres.id}")
+            return None
+        return plan, analysis_text, AnalysisResult(presentation_id=pres.id)
+    
+    def windows_of(item):
+        plan, analysis_text, _ = item
+        if not (spacy_analyzers and needs_spacy(plan) and spacy_analyzers[0].validate_input(analysis_text)):
+            return None
+        return list(plan.presentation.iter_analysis_windows(window_size))
+    
+    def parse(items):
+        # One nlp.pipe stream across all queued presentations keeps batching
+        # (and n_process workers) effective; tee holds only the read-ahead
+        items, pending = tee(items)
+        analysis_states = iter_analysis_states((windows_of(item) for item in items), spacy_analyzers,
+                                               parse_batch_size, n_process)
+        for item, states in zip(pending, analysis_states):
+            plan, _, result = item
+            logger.info(f"Processing: {plan.presentation.title}")
+            try:
+                if states is not None:
+                    finalize_spacy_results(result, states,
+                                           entity_extractor if plan.needs('entities') else None,
+                                           keyword_extractor if plan.needs('keywords') else None,
+                                           tfidf_model)
+            except Exception as e:
+                logger.error(f"Error finalizing presentation {plan.presentation.id}: {e}")
+                yield None
+                continue
+            yield item
+    
+    def embed(item):
+        plan, _, result = item
+        if plan.needs('embeddings'):
+            generate_embedding_results(result, plan.presentation, embedding_generator, chunk_index_dir)
+        return item
+    
+    def save(item):
+        plan, _, result = item
+        save_results(writer, result, replace=replace_existing, manifest=plan.manifest)
+        return result.presentation_id
+    
+    pipeline = StagedPipeline(queue_size=queue_size)
+    pipeline.add_stage('load', load)
+    pipeline.add_stream_stage('spacy', parse)
+    if embedding_generator:
+        pipeline.add_stage('embed', embed)
+    if not dry_run:
+        pipeline.add_stage('save', save, workers=save_workers)
+        
+    # Save workers share one pooled async client; its status buffer is flushed on close
+    writer_context = nullcontext() if dry_run else AsyncAnalysisWriter(
+        queries, status_flush_size=queries.status_writer.flush_size, max_concurrency=2 * save_workers
+    )
+    with writer_context as writer:
+        completed = pipeline.run(profiler.iter_timed('stage.fetch', plans))
+    
+    logger.info("Pipeline stage summary:")
+    pipeline.log_stats()
+    
+    return len(completed), pipeline.source_stats.processed
+
+
+def run_process_pool(
+    plans: Iterable[AnalysisPlan],
+    queries: PresentationQueries,
+    entity_extractor: Optional[EntityExtractor],
+    keyword_extractor: Optional[KeywordExtractor],
+    embedding_generator: Optional[EmbeddingGenerator],
+    tfidf_model: Optional[CorpusTfidfModel],
+    chunk_index_dir: Optional[str],
+    window_size: int,
+    parse_batch_size: int,
+    workers: int,
+    replace_existing: bool,
+    dry_run: bool,
+    sample_profiler: Optional[SampleProfiler] = None,
+    task_timeout: Optional[float] = None
+) -> Tuple[int, int]:
+    """Analyze presentations in forked worker processes sharing the loaded models.
+    
+    Workers run the spaCy and embedding stages; results come back to this
+    process, which grows the TF-IDF model and saves them, so database
+    connections are never shared across a fork. Workers score keywords
+    against the TF-IDF model as it was when they were forked.
+    
+    Args:
+        plans: Presentations and their stages to run (read a few per worker ahead)
+        queries: Database queries
+        entity_extractor: Active entity extractor
+        keyword_extractor: Active keyword extractor
+        embedding_generator: Active embedding generator
+        tfidf_model: Corpus TF-IDF model to grow
+        chunk_index_dir: Directory for per-presentation chunk indexes
+        window_size: Characters per analysis window
+        parse_batch_size: nlp.pipe batch size
+        workers: Worker processes (0 for all cores)
+        replace_existing: Replace previous entities and keywords
+        dry_run: Skip saving
+        sample_profiler: Profiles sampled presentations (every Nth per worker)
+        task_timeout: Seconds to wait for a worker result before aborting
+        
+    Returns:
+        Tuple of (presentations analyzed, presentations fetched)
+        
+    Raises:
+        TimeoutError: If a worker result does not arrive within task_timeout
+    """
+    spacy_analyzers = [a for a in (entity_extractor, keyword_extractor) if a]
+    doc_caches = list({id(a.doc_cache): a.doc_cache for a in spacy_analyzers if a.doc_cache}.values())
+    
+    def analyze(plan: AnalysisPlan):
+        # Runs in a worker process
+        pres = plan.presentation
+        cache_counts = [(cache.hits, cache.misses) for cache in doc_caches]
+        profiles_written = len(sample_profiler.written) if sample_profiler else 0
+        try:
+            analysis_text = pres.get_analysis_text()
+            if not analysis_text:
+                logger.warning(f"No text found for presentation {pres.id}")
+                return None
+            
+            logger.info(f"Processing: {pres.title}")
+            result = AnalysisResult(presentation_id=pres.id)
+            terms = None
+            
+            with sample_profile(sample_profiler, pres.id):
+                if spacy_analyzers and needs_spacy(plan):
+                    with profiler.timer('stage.spacy'):
+                        windows = (list(pres.iter_analysis_windows(window_size))
+                                   if spacy_analyzers[0].validate_input(analysis_text) else None)
+                        states = next(iter_analysis_states([windows], spacy_analyzers, parse_batch_size, 1))
+                        terms = finalize_spacy_results(result, states,
+                                                       entity_extractor if plan.needs('entities') else None,
+                                                       keyword_extractor if plan.needs('keywords') else None,
+                                                       None)
+                    
+                if embedding_generator and plan.needs('embeddings'):
+                    with profiler.timer('stage.embed'):
+                        generate_embedding_results(result, pres, embedding_generator, chunk_index_dir)
+                    
+            # Timings, cache counters and profile paths recorded here would die with the worker
+            cache_counts = [(cache.hits - hits, cache.misses - misses)
+                            for cache, (hits, misses) in zip(doc_caches, cache_counts)]
+            profiles = sample_profiler.written[profiles_written:] if sample_profiler else []
+            return result, terms, plan.manifest, profiler.drain(), cache_counts, profiles
+            
+        except Exception as e:
+            logger.error(f"Error processing presentation {pres.id}: {e}")
+            return None
+    
+    pool = AnalyzerProcessPool(
+        [a for a in (entity_extractor, keyword_extractor, embedding_generator) if a],
+        workers=workers,
+        task_timeout=task_timeout
+    )
+    
+    # Workers inherit the profiler when forked; keep earlier records out of their copies
+    earlier_timings = profiler.drain()
+    
+    success_count = 0
+    total = 0
+    for outcome in pool.map(analyze, profiler.iter_timed('stage.fetch', plans), ordered=False):
+        total += 1
+        if outcome is None:
+            continue
+        result, terms, manifest, timings, cache_counts, profiles = outcome
+        profiler.merge(timings)
+        if pool.workers > 1:
+            # In-process runs already counted on these objects
+            for cache, (hits, misses) in zip(doc_caches, cache_counts):
+                cache.hits += hits
+                cache.misses += misses
+            if sample_profiler:
+                sample_profiler.written.extend(profiles)
+        
+        if tfidf_model is not None and terms is not None:
+            tfidf_model.add_documents([terms], [result.presentation_id])
+            
+        if not dry_run:
+            with profiler.timer('stage.save'):
+                save_results(queries, result, replace=replace_existing, manifest=manifest)
+        success_count += 1
+        
+    profiler.merge(earlier_timings)
+    stats = pool.stats()
+    logger.info(f"Worker pool: {stats['workers']} workers, {stats['processed']} presentations "
+                f"in {stats['elapsed']}s ({stats['items_per_sec']}/s)")
+    
+    return success_count, total
+
+
+def sample_profile(sample_profiler: Optional[SampleProfiler], presentation_id: str):
+    """Profile a presentation's analysis if it is one of the sampled ones."""
+    if sample_profiler is None:
+        return nullcontext()
+    return sample_profiler.profile(f"presentation-{presentation_id}")
+
+
+def finish_run(
+    success_count: int,
+    total: int,
+    tfidf_model: Optional[CorpusTfidfModel],
+    tfidf_model_path: Optional[str],
+    doc_cache: Optional[DocCache],
+    dry_run: bool,
+    profile_dir: Optional[str] = None,
+    sample_profiler: Optional[SampleProfiler] = None
+):
+    """Log the run summary and persist run-level state."""
+    logger.info(f"Successfully processed {success_count}/{total} presentations")
+    
+    if tfidf_model is not None and not dry_run:
+        tfidf_model.save(tfidf_model_path)
+    
+    if doc_cache:
+        logger.info(f"Doc cache: {doc_cache.hits} hits, {doc_cache.misses} misses")
+        
+    if profiler.enabled:
+        profiler.log_summary()
+        if profile_dir:
+            summary_path = Path(profile_dir) / 'timing_summary.json'
+            summary_path.write_text(json.dumps(profiler.summary(), indent=2))
+            logger.info(f"Timing summary written to {summary_path}")
+            
+    if sample_profiler and sample_profiler.written:
+        logger.info(f"Profiled {len(sample_profiler.written)} presentation(s) into {sample_profiler.output_dir}")
+
+
 @click.command()
 @click.option('--presentation-id', help='Analyze a specific presentation by ID')
 @click.option('--batch', is_flag=True, help='Process multiple unprocessed presentations')
@@ -31,6 +515,43 @@ logger = logging.getLogger(__name__)
 @click.option('--skip-entities', is_flag=True, help='Skip entity extraction')
 @click.option('--skip-keywords', is_flag=True, help='Skip keyword extraction')
 @click.option('--skip-embeddings', is_flag=True, help='Skip embedding generation')
+@click.option('--embedding-backend', default='torch', type=click.Choice(EmbeddingGenerator.BACKENDS),
+              help='Embedding inference backend (onnx needs export_embedding_model.py first)')
+@click.option('--onnx-model-dir', type=click.Path(file_okay=False),
+              help='Exported ONNX model directory (defaults to the export location)')
+@click.option('--quantization', help='Load the int8 ONNX model quantized for this preset, e.g. avx512_vnni')
+@click.option('--embedding-format', default='vector', type=click.Choice(EMBEDDING_FORMATS),
+              help='Embedding storage: pgvector column, or packed float32/float16/int8 (smaller payloads)')
+@click.option('--chunk-index-dir', type=click.Path(file_okay=False),
+              help='Build and save a chunk embedding index per presentation in this directory')
+@click.option('--window-size', default=5000, help='Characters per analysis window; whole transcripts are analyzed')
+@click.option('--parse-batch-size', default=32, help='Number of windows per spaCy nlp.pipe batch')
+@click.option('--n-process', default=1, help='spaCy worker processes for parsing (-1 for all cores)')
+@click.option('--doc-cache-dir', type=click.Path(file_okay=False),
+              help='Cache parsed spaCy Docs (DocBin) in this directory and reuse them on later runs')
+@click.option('--tfidf-model', 'tfidf_model_path',
+              help='Corpus TF-IDF model (see build_tfidf_model.py); updated with newly analyzed presentations')
+@click.option('--parallel', is_flag=True,
+              help='Run fetch, spaCy, embedding and save stages concurrently with bounded queues')
+@click.option('--workers', default=1,
+              help='Worker processes forked after loading models, sharing them copy-on-write (0 for all cores)')
+@click.option('--task-timeout', default=1800.0,
+              help='Seconds to wait for a --workers result before aborting (0 to wait forever)')
+@click.option('--save-workers', default=4, help='Concurrent database writers in --parallel mode')
+@click.option('--queue-size', default=8, help='Inter-stage queue capacity in --parallel mode')
+@click.option('--status-batch-size', default=10,
+              help='Presentations whose processing status is written in one database call')
+@click.option('--replace-existing', is_flag=True,
+              help="Replace a presentation's previous entities and keywords")
+@click.option('--incremental', is_flag=True,
+              help='Only re-run analyzers whose input text or version changed since the last run')
+@click.option('--profile', is_flag=True,
+              help='Time database calls, analyzers and stages; log p50/p95 per stage and counters at the end')
+@click.option('--profile-dir', type=click.Path(file_okay=False),
+              help='Also profile sampled presentations and write their profiles and the timing summary here')
+@click.option('--profile-every', default=10, help='Profile every Nth presentation (with --profile-dir)')
+@click.option('--profile-engine', default='cprofile', type=click.Choice(PROFILE_ENGINES),
+              help='Profiler for sampled presentations (pyinstrument must be installed separately)')
 @click.option('--dry-run', is_flag=True, help='Run analysis without saving to database')
 def analyze_presentations(
     presentation_id: Optional[str],
@@ -40,12 +561,50 @@ def analyze_presentations(
     skip_entities: bool,
     skip_keywords: bool,
     skip_embeddings: bool,
+    embedding_backend: str,
+    onnx_model_dir: Optional[str],
+    quantization: Optional[str],
+    embedding_format: str,
+    chunk_index_dir: Optional[str],
+    window_size: int,
+    parse_batch_size: int,
+    n_process: int,
+    doc_cache_dir: Optional[str],
+    tfidf_model_path: Optional[str],
+    parallel: bool,
+    workers: int,
+    task_timeout: float,
+    save_workers: int,
+    queue_size: int,
+    status_batch_size: int,
+    replace_existing: bool,
+    incremental: bool,
+    profile: bool,
+    profile_dir: Optional[str],
+    profile_every: int,
+    profile_engine: str,
     dry_run: bool
 ):
     """Analyze presentation transcripts with NLP."""
     
+    if parallel and workers != 1:
+        logger.error("--workers cannot be combined with --parallel")
+        return
+        
+    # Start timing before anything touches the database or loads a model
+    sample_profiler = None
+    if profile or profile_dir:
+        profiler.enabled = True
+        profiler.reset()
+    if profile_dir:
+        if parallel:
+            # cProfile follows a single thread; stage timings still cover the pipeline
+            logger.warning("Sampled profiling is not supported with --parallel; only timing is collected")
+        else:
+            sample_profiler = SampleProfiler(profile_dir, every=profile_every, engine=profile_engine)
+        
     # Initialize components
-    queries = PresentationQueries()
+    queries = PresentationQueries(status_flush_size=status_batch_size, embedding_format=embedding_format)
     
     # Get presentations to process
     if presentation_id:
@@ -55,115 +614,177 @@ def analyze_presentations(
             logger.error(f"Presentation {presentation_id} not found")
             return
         presentations = [pres_data]
+    elif batch and incremental:
+        # Hashes and manifests are scanned without any text (see the
+        # stale-ID lookup below, once the analyzers are known)
+        logger.info(f"Scanning for up to {limit} presentations with stale analysis")
+        presentations = None
     elif batch:
         logger.info(f"Batch processing up to {limit} presentations")
-        presentations = queries.get_unprocessed_presentations(limit)
-        if not presentations:
-            logger.info("No unprocessed presentations found")
-            return
+        if parallel:
+            # Pages are fetched on the pipeline's source thread as analysis runs
+            presentations = queries.iter_unprocessed_presentations(limit=limit)
+        else:
+            presentations = queries.get_unprocessed_presentations(limit)
+            if not presentations:
+                logger.info("No unprocessed presentations found")
+                return
     else:
         logger.error("Please specify either --presentation-id or --batch")
         return
-        
-    logger.info(f"Processing {len(presentations)} presentation(s)")
     
     # Initialize analyzers
     entity_extractor = None
     keyword_extractor = None
     embedding_generator = None
     
+    doc_cache = DocCache(doc_cache_dir) if doc_cache_dir else None
+    entity_model = "en_core_sci_md" if use_medical else "en_core_web_sm"
+    
+    # Load each spaCy model once with only the components the active analyzers need
+    model_analyzers = {}
+    if not skip_entities:
+        model_analyzers.setdefault(entity_model, []).append(EntityExtractor)
+    if not skip_keywords:
+        model_analyzers.setdefault("en_core_web_sm", []).append(KeywordExtractor)
+    for spacy_model, analyzer_classes in model_analyzers.items():
+        try:
+            load_spacy_model(spacy_model, required_components(analyzer_classes))
+        except OSError:
+            pass  # Reported by the analyzer that needs it
+    
     if not skip_entities:
         try:
-            model_name = "en_core_sci_md" if use_medical else "en_core_web_sm"
-            entity_extractor = EntityExtractor(model_name=model_name, use_medical=use_medical)
+            model_name = entity_model
+            entity_extractor = EntityExtractor(model_name=model_name, use_medical=use_medical,
+                                               doc_cache=doc_cache)
         except Exception as e:
             logger.error(f"Failed to initialize entity extractor: {e}")
             if use_medical:
                 logger.info("Falling back to general model")
-                entity_extractor = EntityExtractor(model_name="en_core_web_sm", use_medical=False)
+                entity_extractor = EntityExtractor(model_name="en_core_web_sm", use_medical=False,
+                                                   doc_cache=doc_cache)
                 
+    tfidf_model = None
     if not skip_keywords:
-        keyword_extractor = KeywordExtractor()
+        if tfidf_model_path and Path(tfidf_model_path).with_suffix('.json').exists():
+            tfidf_model = CorpusTfidfModel.load(tfidf_model_path)
+        elif tfidf_model_path:
+            logger.warning(f"TF-IDF model {tfidf_model_path} not found; starting a new one")
+            tfidf_model = CorpusTfidfModel()
+        keyword_extractor = KeywordExtractor(doc_cache=doc_cache, tfidf_model=tfidf_model)
         
     if not skip_embeddings:
-        embedding_generator = EmbeddingGenerator()
+        embedding_generator = EmbeddingGenerator(backend=embedding_backend, onnx_model_dir=onnx_model_dir,
+                                                 quantization=quantization)
+        
+    # Schedule every active stage, or with --incremental only the stale ones
+    active_analyzers = {
+        stage: analyzer for stage, analyzer in (
+            ('entities', entity_extractor),
+            ('keywords', keyword_extractor),
+            ('embeddings', embedding_generator)
+        ) if analyzer
+    }
+    planner = AnalysisPlanner(active_analyzers, force=not incremental)
+    if presentations is None:
+        # Compare server-side text hashes, then fetch text only for stale presentations
+        stale_ids = islice(planner.iter_stale(queries.iter_presentations(columns=queries.PLANNING_COLUMNS)),
+                           limit)
+        presentations = queries.iter_presentations_by_ids(stale_ids, columns=queries.MANIFEST_COLUMNS)
+    plans = planner.iter_plans(presentations)
+        
+    # Re-analyzed text must not leave the previous run's rows behind
+    replace_existing = replace_existing or incremental
         
-    # Process each presentation
+    # Buffered processing status is flushed on the way out, even on errors or Ctrl-C
+    if parallel:
+        with queries.status_writer:
+            success_count, total = run_staged_pipeline(
+                plans, queries, entity_extractor, keyword_extractor, embedding_generator,
+                tfidf_model, chunk_index_dir, window_size, parse_batch_size, n_process,
+                save_workers, queue_size, replace_existing, dry_run
+            )
+        finish_run(success_count, total, tfidf_model, tfidf_model_path, doc_cache, dry_run, profile_dir)
+        return
+        
+    if workers != 1:
+        with queries.status_writer:
+            success_count, total = run_process_pool(
+                plans, queries, entity_extractor, keyword_extractor, embedding_generator,
+                tfidf_model, chunk_index_dir, window_size, parse_batch_size,
+                workers, replace_existing, dry_run, sample_profiler, task_timeout
+            )
+        finish_run(success_count, total, tfidf_model, tfidf_model_path, doc_cache, dry_run,
+                   profile_dir, sample_profiler)
+        return
+        
+    # Prepare analysis texts
+    items = []
+    total = 0
+    for plan in profiler.iter_timed('stage.fetch', plans):
+        total += 1
+        analysis_text = plan.presentation.get_analysis_text()
+        if not analysis_text:
+            logger.warning(f"No text found for presentation {plan.presentation.id}")
+            continue
+        items.append((plan, analysis_text))
+        
+    if incremental and not total:
+        logger.info("All presentations are up to date")
+        return
+    logger.info(f"Processing {len(items)} presentation(s)")
+        
+    # Stream all presentations through spaCy in windows, once per pipeline
+    spacy_analyzers = [a for a in (entity_extractor, keyword_extractor) if a]
+    analysis_states = iter_analysis_states(
+        (list(plan.presentation.iter_analysis_windows(window_size))
+         if spacy_analyzers and needs_spacy(plan) and spacy_analyzers[0].validate_input(text) else None
+         for plan, text in items),
+        spacy_analyzers,
+        batch_size=parse_batch_size,
+        n_process=n_process
+    )
+        
+    # Process each presentation; parsing happens as the next states are pulled
     success_count = 0
-    for pres_data in presentations:
-        try:
-            # Create presentation object
-            pres = Presentation(**pres_data)
-            logger.info(f"Processing: {pres.title}")
-            
-            # Get text for analysis
-            analysis_text = pres.get_analysis_text()
-            if not analysis_text:
-                logger.warning(f"No text found for presentation {pres.id}")
-                continue
-                
-            # Create result container
-            result = AnalysisResult(presentation_id=pres.id)
-            
-            # Extract entities
-            if entity_extractor:
-                logger.info("  - Extracting entities...")
-                entities = entity_extractor.analyze(analysis_text)
-                result.entities = entities
-                
-                # Log summary
-                total_entities = sum(len(v) for k, v in entities.items() 
-                                   if isinstance(v, list) and k != 'metadata')
-                logger.info(f"    Found {total_entities} entities")
-                
-            # Extract keywords
-            if keyword_extractor:
-                logger.info("  - Extracting keywords...")
-                keywords = keyword_extractor.analyze(analysis_text)
-                result.keywords = keywords
-                
-                # Log summary
-                for method, kws in keywords.items():
-                    if isinstance(kws, list) and method != 'metadata':
-                        logger.info(f"    {method}: {len(kws)} keywords")
-                        
-            # Generate embeddings
-            if embedding_generator:
-                logger.info("  - Generating embeddings...")
-                
-                # Generate comprehensive embedding
-                embedding_result = embedding_generator.generate_presentation_embedding(
-                    title=pres.title or "",
-                    summary=pres.summary or "",
-                    transcript=pres.transcript_text or ""
-                )
-                result.embeddings = embedding_result.tolist()
-                logger.info(f"    Generated {len(result.embeddings)}-dimensional embedding")
-                
-            # Save results
-            if not dry_run:
-                logger.info("  - Saving results to database...")
-                
-                if result.entities and not skip_entities:
-                    queries.save_presentation_entities(pres.id, result.entities)
+    with queries.status_writer:
+        for (plan, analysis_text), states in zip(items, profiler.iter_timed('stage.spacy', analysis_states)):
+            pres = plan.presentation
+            try:
+                logger.info(f"Processing: {pres.title}")
                     
-                if result.keywords and not skip_keywords:
-                    queries.save_presentation_keywords(pres.id, result.keywords)
+                # Create result container
+                result = AnalysisResult(presentation_id=pres.id)
+                
+                # Batched parsing happens outside this block, so samples cover the per-presentation work
+                with sample_profile(sample_profiler, pres.id):
+                    with profiler.timer('stage.finalize'):
+                        finalize_spacy_results(result, states,
+                                               entity_extractor if plan.needs('entities') else None,
+                                               keyword_extractor if plan.needs('keywords') else None,
+                                               tfidf_model)
                     
-                if result.embeddings and not skip_embeddings:
-                    queries.save_presentation_embedding(pres.id, result.embeddings)
+                    # Generate embeddings
+                    if embedding_generator and plan.needs('embeddings'):
+                        with profiler.timer('stage.embed'):
+                            generate_embedding_results(result, pres, embedding_generator, chunk_index_dir)
+                        
+                    # Save results
+                    if not dry_run:
+                        with profiler.timer('stage.save'):
+                            save_results(queries, result, replace=replace_existing, manifest=plan.manifest)
+                    else:
+                        logger.info("  - Dry run: Results not saved")
                     
-                logger.info("  ✓ Analysis complete")
-            else:
-                logger.info("  - Dry run: Results not saved")
+                success_count += 1
                 
-            success_count += 1
-            
-        except Exception as e:
-            logger.error(f"Error processing presentation {pres_data.get('id')}: {e}")
-            continue
-            
-    logger.info(f"Successfully processed {success_count}/{len(presentations)} presentations")
+            except Exception as e:
+                logger.error(f"Error processing presentation {pres.id}: {e}")
+                continue
+                
+    finish_run(success_count, total, tfidf_model, tfidf_model_path, doc_cache, dry_run,
+               profile_dir, sample_profiler)
 
 
 if __name__ == '__main__':
@@ -1,13 +1,31 @@
 """Base analyzer module for NLP presentation analysis."""
 
 from .base_analyzer import BaseAnalyzer
+from .doc_cache import DocCache
+from .spacy_analyzer import SpacyAnalyzer, load_spacy_model, required_components, pipe_docs
 from .entity_extractor import EntityExtractor
 from .keyword_extractor import KeywordExtractor
 from .embedding_generator import EmbeddingGenerator
+from .chunk_index import ChunkIndex
+from .tfidf_model import CorpusTfidfModel
+from .process_pool import AnalyzerProcessPool
+from .bm25_index import BM25Index
+from .search_index import SearchIndex, SearchIndexWriter
 
 __all__ = [
     'BaseAnalyzer',
+    'SpacyAnalyzer',
+    'load_spacy_model',
+    'required_components',
+    'pipe_docs',
+    'DocCache',
     'EntityExtractor', 
     'KeywordExtractor',
-    'EmbeddingGenerator'
+    'EmbeddingGenerator',
+    'ChunkIndex',
+    'CorpusTfidfModel',
+    'AnalyzerProcessPool',
+    'BM25Index',
+    'SearchIndex',
+    'SearchIndexWriter'
 ]
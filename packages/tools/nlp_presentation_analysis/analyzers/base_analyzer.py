@@ -4,9 +4,28 @@ from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
 import logging
 
+from utils import clean_text
+from utils.profiling import timed
+
 class BaseAnalyzer(ABC):
     """Abstract base class for all analyzers."""
     
+    # Bump when a change alters the analyzer's output, so incremental runs
+    # re-analyze presentations processed by an older version
+    VERSION = '1'
+    
+    # Methods timed in the process-wide profiler wherever a subclass defines
+    # them: analyze() as analyze.<Class>, the others as analyze.<Class>.<method>
+    TIMED_METHODS = ('analyze',)
+    
+    def __init_subclass__(cls, **kwargs):
+        """Wrap the TIMED_METHODS the subclass defines with profiler timers."""
+        super().__init_subclass__(**kwargs)
+        for method in cls.TIMED_METHODS:
+            if method in cls.__dict__:
+                name = f"analyze.{cls.__name__}" if method == 'analyze' else f"analyze.{cls.__name__}.{method}"
+                setattr(cls, method, timed(name)(cls.__dict__[method]))
+    
     def __init__(self, model_name: Optional[str] = None):
         """Initialize the analyzer.
         
@@ -21,6 +40,14 @@ class BaseAnalyzer(ABC):
         """Setup method for subclasses to override."""
         pass
     
+    def warm_up(self):
+        """Initialize lazily built state before worker processes are forked.
+        
+        Called in the parent by AnalyzerProcessPool so workers share the
+        result copy-on-write; subclasses with lazy initialization override it.
+        """
+        pass
+    
     @abstractmethod
     def analyze(self, text: str) -> Dict[str, Any]:
         """Analyze the given text.
@@ -33,6 +60,18 @@ class BaseAnalyzer(ABC):
         """
         pass
     
+    def version_info(self) -> Dict[str, str]:
+        """Identify the analyzer and model that produced a result.
+        
+        Returns:
+            Analyzer class name, version and model name
+        """
+        return {
+            'analyzer': self.__class__.__name__,
+            'version': str(self.VERSION),
+            'model': self.model_name or ''
+        }
+    
     def preprocess(self, text: str) -> str:
         """Preprocess text before analysis.
         
@@ -43,10 +82,7 @@ class BaseAnalyzer(ABC):
             Preprocessed text
         """
         # Basic preprocessing - can be overridden by subclasses
-        text = text.strip()
-        # Replace multiple whitespaces with single space
-        text = ' '.join(text.split())
-        return text
+        return clean_text(text)
     
     def validate_input(self, text: str) -> bool:
         """Validate input text.
@@ -0,0 +1,164 @@
+"""Okapi BM25 keyword index over text chunks."""
+
+from array import array
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+from pathlib import Path
+import json
+import re
+import numpy as np
+from scipy import sparse
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:['\-][a-z0-9]+)*")
+
+# Function words that carry no keyword signal
+STOP_WORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'but', 'by', 'for', 'from', 'has', 'have',
+    'he', 'her', 'his', 'i', 'if', 'in', 'into', 'is', 'it', 'its', 'me', 'my', 'not', 'of',
+    'on', 'or', 'our', 'she', 'so', 'than', 'that', 'the', 'their', 'them', 'then', 'there',
+    'these', 'they', 'this', 'those', 'to', 'um', 'uh', 'was', 'we', 'were', 'what', 'when',
+    'which', 'who', 'will', 'with', 'you', 'your'
+})
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase keyword tokens.
+
+    Deliberately simple (no spaCy), so queries tokenize in microseconds and
+    exactly like the indexed chunks.
+
+    Args:
+        text: Input text
+
+    Returns:
+        Tokens without stop words
+    """
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in STOP_WORDS]
+
+
+class BM25Index:
+    """Inverted index scoring chunks with Okapi BM25.
+
+    Term counts are collected into compact arrays as chunks are added;
+    finalize() turns them into a column-compressed (chunks x terms) matrix
+    of precomputed BM25 weights, so a query is the sum of its terms' columns.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """Initialize an empty index.
+
+        Args:
+            k1: Term frequency saturation
+            b: Document length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self.vocabulary: Dict[str, int] = {}
+        self.weights: Optional[sparse.csc_matrix] = None
+        self._indptr = array('q', [0])
+        self._indices = array('i')
+        self._counts = array('i')
+
+    def __len__(self) -> int:
+        return self.weights.shape[0] if self.weights is not None else len(self._indptr) - 1
+
+    def add(self, tokens: Sequence[str]):
+        """Add one chunk.
+
+        Args:
+            tokens: Chunk tokens (see tokenize)
+        """
+        if self.weights is not None:
+            raise RuntimeError("BM25Index is finalized; build a new index to add chunks")
+
+        for token, count in Counter(tokens).items():
+            self._indices.append(self.vocabulary.setdefault(token, len(self.vocabulary)))
+            self._counts.append(count)
+        self._indptr.append(len(self._indices))
+
+    def finalize(self):
+        """Compute BM25 weights from the collected term counts."""
+        n_chunks = len(self._indptr) - 1
+        counts = sparse.csr_matrix(
+            (np.frombuffer(self._counts, dtype=np.int32).astype(np.float32),
+             np.frombuffer(self._indices, dtype=np.int32),
+             np.frombuffer(self._indptr, dtype=np.int64)),
+            shape=(n_chunks, len(self.vocabulary))
+        )
+
+        lengths = np.asarray(counts.sum(axis=1), dtype=np.float32).ravel()
+        mean_length = float(lengths.mean()) if n_chunks else 0.0
+        doc_freq = np.bincount(counts.indices, minlength=len(self.vocabulary))
+        idf = np.log1p((n_chunks - doc_freq + 0.5) / (doc_freq + 0.5)).astype(np.float32)
+
+        # tf * (k1 + 1) / (tf + k1 * (1 - b + b * len / mean_len)), times idf
+        row_lengths = np.repeat(lengths, np.diff(counts.indptr))
+        norm = self.k1 * (1 - self.b + self.b * row_lengths / max(mean_length, 1e-9))
+        tf = counts.data
+        counts.data = idf[counts.indices] * tf * (self.k1 + 1) / (tf + norm)
+
+        self.weights = counts.tocsc()
+        self._indptr, self._indices, self._counts = array('q', [0]), array('i'), array('i')
+
+    def search(self, tokens: Sequence[str], top_k: int = 100) -> Tuple[np.ndarray, np.ndarray]:
+        """Rank chunks for a tokenized query.
+
+        Args:
+            tokens: Query tokens (see tokenize)
+            top_k: Number of chunks to return
+
+        Returns:
+            Tuple of (chunk indices, scores), best first; only chunks
+            containing at least one query term are returned
+        """
+        query = Counter(self.vocabulary[t] for t in tokens if t in self.vocabulary)
+        if not query or top_k <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        term_ids = np.fromiter(query.keys(), dtype=np.int64, count=len(query))
+        term_counts = np.fromiter(query.values(), dtype=np.float32, count=len(query))
+        scores = np.asarray(self.weights[:, term_ids] @ term_counts).ravel()
+
+        # Only chunks with a matching term can score above zero
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > top_k:
+            candidates = candidates[np.argpartition(-scores[candidates], top_k - 1)[:top_k]]
+        order = np.argsort(-scores[candidates], kind='stable')
+
+        return candidates[order], scores[candidates[order]]
+
+    def save(self, path: Union[str, Path]):
+        """Persist the index as <path>.npz (weights) and <path>.json (vocabulary).
+
+        Args:
+            path: Base path without extension
+        """
+        if self.weights is None:
+            self.finalize()
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        sparse.save_npz(path.with_suffix('.npz'), self.weights, compressed=False)
+        with open(path.with_suffix('.json'), 'w') as f:
+            json.dump({'k1': self.k1, 'b': self.b, 'vocabulary': self.vocabulary}, f)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'BM25Index':
+        """Load an index saved with save().
+
+        Args:
+            path: Base path without extension
+
+        Returns:
+            Loaded index
+        """
+        path = Path(path)
+
+        with open(path.with_suffix('.json')) as f:
+            sidecar = json.load(f)
+
+        index = cls(k1=sidecar['k1'], b=sidecar['b'])
+        index.vocabulary = sidecar['vocabulary']
+        index.weights = sparse.load_npz(path.with_suffix('.npz')).tocsc()
+        return index
@@ -0,0 +1,145 @@
+"""Searchable index of pre-normalized chunk embeddings."""
+
+from typing import Dict, List, Any, Optional, Sequence, Union
+from pathlib import Path
+import json
+import numpy as np
+
+from utils.similarity import normalize_rows, top_k_rows
+
+
+class ChunkIndex:
+    """Store normalized chunk embeddings and answer top-k cosine queries.
+
+    Embeddings are normalized once at build time, so each query is a single
+    matrix-vector product followed by a partial top-k selection.
+    """
+
+    def __init__(self, embeddings: np.ndarray, chunks: Sequence[str],
+                 metadata: Optional[Sequence[Dict[str, Any]]] = None,
+                 model_name: Optional[str] = None):
+        """Initialize the index.
+
+        Args:
+            embeddings: Chunk embeddings of shape (n, dim)
+            chunks: Chunk texts, aligned with embeddings
+            metadata: Optional per-chunk metadata, aligned with embeddings
+            model_name: Name of the model that produced the embeddings
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if embeddings.ndim != 2 or len(embeddings) != len(chunks):
+            raise ValueError("embeddings must be a (n, dim) matrix aligned with chunks")
+
+        self.embeddings = normalize_rows(embeddings)
+        self.chunks = list(chunks)
+        self.metadata = list(metadata) if metadata is not None else [{} for _ in self.chunks]
+        self.model_name = model_name
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    @property
+    def dimension(self) -> int:
+        """Embedding dimension of the index."""
+        return self.embeddings.shape[1]
+
+    def add(self, embeddings: np.ndarray, chunks: Sequence[str],
+            metadata: Optional[Sequence[Dict[str, Any]]] = None):
+        """Append chunks to the index.
+
+        Args:
+            embeddings: Chunk embeddings of shape (m, dim)
+            chunks: Chunk texts, aligned with embeddings
+            metadata: Optional per-chunk metadata
+        """
+        embeddings = normalize_rows(embeddings)
+        if len(self.chunks) and embeddings.shape[1] != self.dimension:
+            raise ValueError(f"Expected {self.dimension}-dimensional embeddings, got {embeddings.shape[1]}")
+
+        self.embeddings = np.vstack([self.embeddings, embeddings]) if len(self.chunks) else embeddings
+        self.chunks.extend(chunks)
+        self.metadata.extend(metadata if metadata is not None else [{} for _ in chunks])
+
+    def search(self, query_embedding: np.ndarray, top_k: int = 5) -> List[Dict[str, Any]]:
+        """Find the chunks most similar to a query embedding.
+
+        Args:
+            query_embedding: Query vector of shape (dim,)
+            top_k: Number of chunks to return
+
+        Returns:
+            List of similar chunks with scores, best first
+        """
+        return self.search_batch(np.asarray(query_embedding)[np.newaxis, :], top_k)[0]
+
+    def search_batch(self, query_embeddings: np.ndarray, top_k: int = 5) -> List[List[Dict[str, Any]]]:
+        """Find the most similar chunks for several queries at once.
+
+        Args:
+            query_embeddings: Query vectors of shape (q, dim)
+            top_k: Number of chunks to return per query
+
+        Returns:
+            One result list per query, best first
+        """
+        if not len(self.chunks):
+            return [[] for _ in range(len(query_embeddings))]
+
+        scores = normalize_rows(query_embeddings) @ self.embeddings.T
+        indices, top_scores = top_k_rows(scores, top_k)
+
+        return [
+            [self._result(int(i), float(score)) for i, score in zip(row_indices, row_scores)]
+            for row_indices, row_scores in zip(indices, top_scores)
+        ]
+
+    def save(self, path: Union[str, Path]):
+        """Persist the index as <path>.npy (embeddings) and <path>.json (chunks).
+
+        Args:
+            path: Base path without extension
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        np.save(path.with_suffix('.npy'), self.embeddings)
+        with open(path.with_suffix('.json'), 'w') as f:
+            json.dump({
+                'model_name': self.model_name,
+                'chunks': self.chunks,
+                'metadata': self.metadata
+            }, f)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap: bool = False) -> 'ChunkIndex':
+        """Load an index saved with save().
+
+        Args:
+            path: Base path without extension
+            mmap: Memory-map the embedding matrix instead of reading it into memory
+
+        Returns:
+            Loaded index
+        """
+        path = Path(path)
+
+        with open(path.with_suffix('.json')) as f:
+            sidecar = json.load(f)
+
+        index = cls.__new__(cls)
+        index.embeddings = np.load(path.with_suffix('.npy'), mmap_mode='r' if mmap else None)
+        index.chunks = sidecar['chunks']
+        index.metadata = sidecar['metadata']
+        index.model_name = sidecar.get('model_name')
+        return index
+
+    def _result(self, i: int, score: float) -> Dict[str, Any]:
+        """Build a search result for chunk i."""
+        result = {
+            'chunk_index': i,
+            'chunk_text': self.chunks[i],
+            'similarity': score
+        }
+        if self.metadata[i]:
+            result['metadata'] = self.metadata[i]
+        return result
@@ -0,0 +1,114 @@
+"""On-disk cache of parsed spaCy Docs stored as DocBin files."""
+
+from typing import Optional, Union
+from pathlib import Path
+import hashlib
+import logging
+import os
+from spacy.tokens import Doc, DocBin
+from spacy.vocab import Vocab
+
+logger = logging.getLogger(__name__)
+
+
+class DocCache:
+    """Persist parsed Docs keyed by (model_name, text hash).
+
+    Each Doc is stored as its own DocBin file under
+    <cache_dir>/<model_name>/<hash[:2]>/<hash>.spacy, so re-running an
+    analysis only pays for a disk read instead of a full parse. Analyzers
+    pass their pipeline signature as model_name, so parses made with
+    pruned pipelines are kept apart.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cached DocBin files
+        """
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        """Hash text for use as a cache key.
+
+        Args:
+            text: Text that was parsed
+
+        Returns:
+            Hex digest of the text
+        """
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def path_for(self, model_name: str, text: str) -> Path:
+        """Get the cache file path for a text.
+
+        Args:
+            model_name: spaCy model that parsed the text
+            text: Text that was parsed
+
+        Returns:
+            Path of the DocBin file
+        """
+        digest = self.text_hash(text)
+        return self.cache_dir / model_name / digest[:2] / f"{digest}.spacy"
+
+    def contains(self, model_name: str, text: str) -> bool:
+        """Check whether a parse is cached.
+
+        Args:
+            model_name: spaCy model name
+            text: Text that was parsed
+
+        Returns:
+            True if a cached Doc exists
+        """
+        return self.path_for(model_name, text).exists()
+
+    def get(self, model_name: str, text: str, vocab: Vocab) -> Optional[Doc]:
+        """Load a cached Doc.
+
+        Args:
+            model_name: spaCy model name
+            text: Text that was parsed
+            vocab: Vocab of the pipeline the Doc will be used with
+
+        Returns:
+            Cached Doc, or None on a cache miss
+        """
+        path = self.path_for(model_name, text)
+        if not path.exists():
+            self.misses += 1
+            return None
+
+        try:
+            docs = list(DocBin().from_disk(path).get_docs(vocab))
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cached doc {path}: {e}")
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return docs[0] if docs else None
+
+    def put(self, model_name: str, text: str, doc: Doc):
+        """Store a parsed Doc.
+
+        Args:
+            model_name: spaCy model name
+            text: Text that was parsed
+            doc: Parsed document
+        """
+        path = self.path_for(model_name, text)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        doc_bin = DocBin(store_user_data=False)
+        doc_bin.add(doc)
+
+        # Write then rename so concurrent readers never see a partial file
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        doc_bin.to_disk(tmp_path)
+        os.replace(tmp_path, path)
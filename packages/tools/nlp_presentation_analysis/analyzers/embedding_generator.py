@@ -5,10 +5,16 @@ import numpy as np
 from sentence_transformers import SentenceTransformer
 import logging
 from .base_analyzer import BaseAnalyzer
+from .chunk_index import ChunkIndex
 
 class EmbeddingGenerator(BaseAnalyzer):
     """Generate semantic embeddings for text analysis."""
     
+    VERSION = '2'
+    
+    # The analysis CLIs call these rather than analyze()
+    TIMED_METHODS = ('analyze', 'generate_presentation_embedding', 'build_chunk_index')
+    
     # Recommended models for different use cases
     MODELS = {
         'general': 'all-MiniLM-L6-v2',  # Fast and good quality
@@ -17,24 +23,42 @@ class EmbeddingGenerator(BaseAnalyzer):
         'multilingual': 'paraphrase-multilingual-MiniLM-L12-v2'
     }
     
-    def __init__(self, model_name: Optional[str] = None, model_type: str = 'general'):
+    BACKENDS = ('torch', 'onnx')
+    
+    def __init__(self, model_name: Optional[str] = None, model_type: str = 'general',
+                 backend: str = 'torch', onnx_model_dir: Optional[str] = None,
+                 quantization: Optional[str] = None):
         """Initialize embedding generator.
         
         Args:
             model_name: Specific model name to use
             model_type: Type of model ('general', 'medical', 'similarity')
+            backend: 'torch' (PyTorch fp32) or 'onnx' (ONNX Runtime, see
+                export_embedding_model.py)
+            onnx_model_dir: Directory of the exported ONNX model (onnx backend;
+                defaults to where export_embedding_model.py writes it)
+            quantization: Quantization preset of the int8 model to load
+                (onnx backend; None for the fp32 graph)
         """
         if model_name is None:
             model_name = self.MODELS.get(model_type, self.MODELS['general'])
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown embedding backend: {backend}. Choose from {', '.join(self.BACKENDS)}")
         
-        super().__init__(model_name)
         self.model_type = model_type
+        self.backend = backend
+        self.onnx_model_dir = onnx_model_dir
+        self.quantization = quantization
+        super().__init__(model_name)
         
     def _setup(self):
         """Load the sentence transformer model."""
         try:
-            self.model = SentenceTransformer(self.model_name)
-            self.logger.info(f"Loaded embedding model: {self.model_name}")
+            if self.backend == 'onnx':
+                self.model = self._load_onnx_model()
+            else:
+                self.model = SentenceTransformer(self.model_name)
+            self.logger.info(f"Loaded embedding model: {self.model_name} ({self.backend_name})")
             
             # Get embedding dimension
             self.embedding_dim = self.model.get_sentence_embedding_dimension()
@@ -43,6 +67,40 @@ class EmbeddingGenerator(BaseAnalyzer):
             self.logger.error(f"Error loading model {self.model_name}: {e}")
             raise
             
+    def _load_onnx_model(self) -> SentenceTransformer:
+        """Load the exported ONNX model, checking it was exported from model_name."""
+        from .onnx_backend import load_onnx_model, read_export_info, default_model_dir
+        
+        if self.onnx_model_dir is None:
+            self.onnx_model_dir = str(default_model_dir(self.model_name))
+        info = read_export_info(self.onnx_model_dir)
+        if info.get('model_name', self.model_name) != self.model_name:
+            raise ValueError(f"{self.onnx_model_dir} was exported from {info['model_name']}, "
+                             f"not {self.model_name}")
+        verified = info.get('verified', {}).get(self.quantization or 'fp32')
+        if verified is False:
+            self.logger.warning(f"{self.backend_name} model failed its agreement check at export")
+        
+        return load_onnx_model(self.onnx_model_dir, self.quantization)
+        
+    def warm_up(self):
+        """Encode one short text so the backend's lazily built state exists before forking."""
+        self.model.encode(["Warm up the model before forking workers."], convert_to_numpy=True)
+        
+    @property
+    def backend_name(self) -> str:
+        """Inference backend and precision, e.g. 'torch' or 'onnx-qint8-avx2'."""
+        if self.backend == 'onnx':
+            return f"onnx-qint8-{self.quantization}" if self.quantization else 'onnx-fp32'
+        return self.backend
+        
+    def version_info(self) -> Dict[str, str]:
+        """Identify the model and backend, since ONNX and int8 outputs differ slightly."""
+        info = super().version_info()
+        if self.backend != 'torch':
+            info['model'] = f"{self.model_name}+{self.backend_name}"
+        return info
+        
     def analyze(self, text: Union[str, List[str]]) -> Dict[str, Any]:
         """Generate embeddings for text.
         
@@ -74,6 +132,7 @@ class EmbeddingGenerator(BaseAnalyzer):
             'metadata': {
                 'model_name': self.model_name,
                 'model_type': self.model_type,
+                'backend': self.backend_name,
                 'embedding_dim': self.embedding_dim,
                 'num_texts': len(texts)
             }
@@ -134,35 +193,57 @@ class EmbeddingGenerator(BaseAnalyzer):
         
         return float(similarity)
     
-    def find_similar_chunks(self, query: str, chunks: List[str], top_k: int = 5) -> List[Dict[str, Any]]:
+    def build_chunk_index(self, text: str, chunk_size: int = 512, overlap: int = 128,
+                          metadata: Optional[Dict[str, Any]] = None) -> ChunkIndex:
+        """Chunk, embed and index text for repeated similarity queries.
+        
+        Args:
+            text: Text to chunk and index
+            chunk_size: Size of each chunk in characters
+            overlap: Overlap between chunks
+            metadata: Metadata attached to every chunk (e.g. presentation_id)
+            
+        Returns:
+            Chunk index over the text
+        """
+        chunks = self._create_chunks(text, chunk_size, overlap)
+        return self.index_chunks(chunks, [dict(metadata or {}) for _ in chunks])
+    
+    def index_chunks(self, chunks: List[str], metadata: Optional[List[Dict[str, Any]]] = None) -> ChunkIndex:
+        """Embed pre-split chunks into a chunk index.
+        
+        Args:
+            chunks: Chunk texts
+            metadata: Optional per-chunk metadata
+            
+        Returns:
+            Chunk index over the chunks
+        """
+        if chunks:
+            embeddings = self.model.encode(chunks, convert_to_numpy=True)
+        else:
+            embeddings = np.zeros((0, self.embedding_dim), dtype=np.float32)
+        return ChunkIndex(embeddings, chunks, metadata, model_name=self.model_name)
+    
+    def find_similar_chunks(self, query: Union[str, List[str]], chunks: Union[List[str], ChunkIndex],
+                            top_k: int = 5) -> List[Any]:
         """Find most similar chunks to a query.
         
         Args:
-            query: Query text
-            chunks: List of text chunks to search
+            query: Query text, or a list of queries for batched search
+            chunks: Chunk index, or a list of text chunks to index for this call
             top_k: Number of similar chunks to return
             
         Returns:
-            List of similar chunks with scores
+            List of similar chunks with scores (one list per query for batched search)
         """
-        # Generate embeddings
-        query_embedding = self.model.encode([query], convert_to_numpy=True)[0]
-        chunk_embeddings = self.model.encode(chunks, convert_to_numpy=True)
-        
-        # Compute similarities
-        similarities = []
-        for i, chunk_embedding in enumerate(chunk_embeddings):
-            similarity = self._cosine_similarity(query_embedding, chunk_embedding)
-            similarities.append({
-                'chunk_index': i,
-                'chunk_text': chunks[i],
-                'similarity': float(similarity)
-            })
-            
-        # Sort by similarity
-        similarities.sort(key=lambda x: x['similarity'], reverse=True)
+        index = chunks if isinstance(chunks, ChunkIndex) else self.index_chunks(chunks)
+        
+        queries = [query] if isinstance(query, str) else query
+        query_embeddings = self.model.encode(queries, convert_to_numpy=True)
+        results = index.search_batch(query_embeddings, top_k)
         
-        return similarities[:top_k]
+        return results[0] if isinstance(query, str) else results
     
     def generate_presentation_embedding(self, title: str, summary: str, transcript: str) -> np.ndarray:
         """Generate a comprehensive embedding for a presentation.
@@ -1,14 +1,14 @@
 """Entity extraction using spaCy and scispaCy."""
 
 from typing import Dict, List, Any, Optional, Set
-import spacy
 from spacy.language import Language
+from spacy.tokens import Doc
 from collections import defaultdict
-import logging
 
-from .base_analyzer import BaseAnalyzer
+from .spacy_analyzer import SpacyAnalyzer
+from .doc_cache import DocCache
 
-class EntityExtractor(BaseAnalyzer):
+class EntityExtractor(SpacyAnalyzer):
     """Extract entities from text using spaCy models."""
     
     MEDICAL_ENTITY_TYPES = {
@@ -33,71 +33,105 @@ class EntityExtractor(BaseAnalyzer):
         'AMINO_ACID', 'NUCLEOTIDE_SEQUENCE'
     }
     
-    def __init__(self, model_name: str = "en_core_web_sm", use_medical: bool = False):
+    VERSION = '2'
+    
+    # NER for entities; tagger and parser for noun chunks
+    REQUIRED_COMPONENTS = frozenset({'tagger', 'attribute_ruler', 'parser', 'ner'})
+    
+    def __init__(self, model_name: str = "en_core_web_sm", use_medical: bool = False,
+                 nlp: Optional[Language] = None, doc_cache: Optional[DocCache] = None):
         """Initialize entity extractor.
         
         Args:
             model_name: spaCy model to use
             use_medical: Whether to use medical entity recognition
+            nlp: Already-loaded spaCy pipeline to share
+            doc_cache: Cache of previously parsed Docs
         """
         self.use_medical = use_medical
-        super().__init__(model_name)
-        
-    def _setup(self):
-        """Load the spaCy model."""
-        try:
-            self.nlp = spacy.load(self.model_name)
-            self.logger.info(f"Loaded spaCy model: {self.model_name}")
-        except OSError:
-            self.logger.error(f"Model {self.model_name} not found. Please install it first.")
-            raise
+        super().__init__(model_name, nlp=nlp, doc_cache=doc_cache)
             
-    def analyze(self, text: str) -> Dict[str, Any]:
-        """Extract entities from text.
+    def new_state(self) -> Dict[str, Any]:
+        """Create an empty entity accumulator.
         
-        Args:
-            text: Text to analyze
-            
         Returns:
-            Dictionary containing extracted entities
+            Accumulator for accumulate and finalize
         """
-        if not self.validate_input(text):
-            return {"error": "Invalid input"}
-            
-        text = self.preprocess(text)
-        doc = self.nlp(text)
+        return {
+            'entities': defaultdict(list),
+            'seen_entities': defaultdict(set),
+            'medical_entities': {
+                'conditions': [],
+                'treatments': [],
+                'biological_entities': [],
+                'other_medical': []
+            },
+            'seen_medical': defaultdict(set),
+            'key_phrases': [],
+            'seen_phrases': set(),
+            'text_length': 0,
+            'sentence_count': 0
+        }
+    
+    def accumulate(self, state: Dict[str, Any], doc: Doc, offset: int = 0):
+        """Merge entities from one document into the accumulator.
         
+        Args:
+            state: Accumulator from new_state
+            doc: spaCy document
+            offset: Character offset of the document within the full text
+        """
         # Extract basic entities
-        entities = self._extract_basic_entities(doc)
+        self._extract_basic_entities(doc, state, offset)
         
         # Extract medical entities if using medical model
         if self.use_medical:
-            medical_entities = self._extract_medical_entities(doc)
-            entities.update(medical_entities)
+            self._extract_medical_entities(doc, state, offset)
         
         # Extract key noun phrases
-        entities['key_phrases'] = self._extract_key_phrases(doc)
+        self._extract_key_phrases(doc, state)
+        
+        state['text_length'] += len(doc.text)
+        state['sentence_count'] += sum(1 for _ in doc.sents)
+    
+    def finalize(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the entity result from an accumulator.
+        
+        Args:
+            state: Accumulator from new_state
+            
+        Returns:
+            Dictionary containing extracted entities
+        """
+        entities = dict(state['entities'])
+        
+        if self.use_medical:
+            entities.update(state['medical_entities'])
+        
+        entities['key_phrases'] = [p['text'] for p in state['key_phrases']]
         
         # Add metadata
         entities['metadata'] = {
             'model_used': self.model_name,
-            'text_length': len(text),
-            'sentence_count': len(list(doc.sents))
+            'text_length': state['text_length'],
+            'sentence_count': state['sentence_count']
         }
         
         return entities
     
-    def _extract_basic_entities(self, doc: Language) -> Dict[str, List[Dict[str, Any]]]:
-        """Extract basic named entities.
+    def _extract_basic_entities(self, doc: Doc, state: Dict[str, Any], offset: int = 0):
+        """Extract basic named entities into the accumulator.
         
         Args:
             doc: spaCy document
-            
-        Returns:
-            Dictionary of entity types to entity lists
+            state: Accumulator from new_state
+            offset: Character offset of the document within the full text;
+                the document must have been parsed from already-cleaned text
+                (see Presentation.iter_analysis_windows), since spaCy
+                offsets are positions in the preprocessed window
         """
-        entities = defaultdict(list)
-        seen_entities = defaultdict(set)
+        entities = state['entities']
+        seen_entities = state['seen_entities']
         
         for ent in doc.ents:
             # Skip duplicates
@@ -106,33 +140,25 @@ class EntityExtractor(BaseAnalyzer):
                 
             entity_info = {
                 'text': ent.text,
-                'start': ent.start_char,
-                'end': ent.end_char,
+                'start': offset + ent.start_char,
+                'end': offset + ent.end_char,
                 'label': ent.label_
             }
             
             entities[ent.label_].append(entity_info)
             seen_entities[ent.label_].add(ent.text.lower())
-            
-        return dict(entities)
     
-    def _extract_medical_entities(self, doc: Language) -> Dict[str, List[Dict[str, Any]]]:
-        """Extract medical-specific entities.
+    def _extract_medical_entities(self, doc: Doc, state: Dict[str, Any], offset: int = 0):
+        """Extract medical-specific entities into the accumulator.
         
         Args:
             doc: spaCy document with medical NER
-            
-        Returns:
-            Dictionary of medical entity categories
+            state: Accumulator from new_state
+            offset: Character offset of the document within the full text
+                (see _extract_basic_entities)
         """
-        medical_entities = {
-            'conditions': [],
-            'treatments': [],
-            'biological_entities': [],
-            'other_medical': []
-        }
-        
-        seen = defaultdict(set)
+        medical_entities = state['medical_entities']
+        seen = state['seen_medical']
         
         for ent in doc.ents:
             if ent.text.lower() in seen[ent.label_]:
@@ -141,8 +167,8 @@ class EntityExtractor(BaseAnalyzer):
             entity_info = {
                 'text': ent.text,
                 'type': ent.label_,
-                'start': ent.start_char,
-                'end': ent.end_char
+                'start': offset + ent.start_char,
+                'end': offset + ent.end_char
             }
             
             # Categorize medical entities
@@ -156,22 +182,21 @@ class EntityExtractor(BaseAnalyzer):
                 medical_entities['other_medical'].append(entity_info)
                 
             seen[ent.label_].add(ent.text.lower())
-            
-        return medical_entities
     
-    def _extract_key_phrases(self, doc: Language, max_phrases: int = 20) -> List[str]:
-        """Extract key noun phrases from document.
+    def _extract_key_phrases(self, doc: Doc, state: Dict[str, Any], max_phrases: int = 20):
+        """Extract key noun phrases into the accumulator.
+        
+        Only the current top max_phrases are kept, so the accumulator stays
+        bounded however many documents are merged.
         
         Args:
             doc: spaCy document
-            max_phrases: Maximum number of phrases to return
-            
-        Returns:
-            List of key phrases
+            state: Accumulator from new_state
+            max_phrases: Maximum number of phrases to keep
         """
         # Extract noun chunks
-        noun_phrases = []
-        seen_phrases = set()
+        noun_phrases = state['key_phrases']
+        seen_phrases = state['seen_phrases']
         
         for chunk in doc.noun_chunks:
             # Skip very short phrases
@@ -191,11 +216,10 @@ class EntityExtractor(BaseAnalyzer):
                 })
                 seen_phrases.add(phrase)
         
-        # Sort by length (longer phrases often more specific)
+        # Sort by length (longer phrases often more specific); stable, so
+        # earlier phrases win ties exactly as in a single pass
         noun_phrases.sort(key=lambda x: x['length'], reverse=True)
-        
-        # Return top phrases
-        return [p['text'] for p in noun_phrases[:max_phrases]]
+        del noun_phrases[max_phrases:]
     
     def extract_entity_relationships(self, text: str) -> List[Dict[str, Any]]:
         """Extract relationships between entities.
@@ -206,7 +230,7 @@ class EntityExtractor(BaseAnalyzer):
         Returns:
             List of entity relationships
         """
-        doc = self.nlp(text)
+        doc = self.parse(text)
         relationships = []
         
         # Look for entities connected by specific dependency patterns
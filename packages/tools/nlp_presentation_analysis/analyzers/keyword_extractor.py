@@ -1,33 +1,64 @@
 """Keyword extraction using various algorithms."""
 
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Tuple, Optional, Union
+from bisect import bisect_right
 import spacy
-from collections import Counter
+from spacy.language import Language
+from spacy.tokens import Doc
+from spacy.matcher import Matcher
+from collections import Counter, defaultdict
 import math
-from .base_analyzer import BaseAnalyzer
+from .spacy_analyzer import SpacyAnalyzer
+from .doc_cache import DocCache
+from .tfidf_model import CorpusTfidfModel
+from utils.term_matcher import TermMatcher
 
-class KeywordExtractor(BaseAnalyzer):
+class KeywordExtractor(SpacyAnalyzer):
     """Extract keywords using TF-IDF and other methods."""
     
-    def __init__(self, model_name: str = "en_core_web_sm"):
+    VERSION = '2'
+    
+    # POS tags and lemmas for candidate terms; parser for sentence boundaries
+    REQUIRED_COMPONENTS = frozenset({'tagger', 'attribute_ruler', 'lemmatizer', 'parser'})
+    
+    # POS patterns for multi-word expressions
+    POS_PATTERNS = [
+        ['ADJ', 'NOUN'],           # "medical condition"
+        ['NOUN', 'NOUN'],          # "stress response"
+        ['ADJ', 'ADJ', 'NOUN'],    # "chronic fatigue syndrome"
+        ['NOUN', 'ADP', 'NOUN'],   # "state of health"
+        ['VERB', 'NOUN'],          # "reduce inflammation"
+        ['ADV', 'VERB'],           # "significantly improve"
+    ]
+    
+    def __init__(self, model_name: str = "en_core_web_sm", nlp: Optional[Language] = None,
+                 doc_cache: Optional[DocCache] = None, tfidf_model: Optional[CorpusTfidfModel] = None):
         """Initialize keyword extractor.
         
         Args:
             model_name: spaCy model to use
+            nlp: Already-loaded spaCy pipeline to share
+            doc_cache: Cache of previously parsed Docs
+            tfidf_model: Corpus document frequencies for TF-IDF scoring
         """
-        super().__init__(model_name)
-        self.stop_words = set()
+        self.tfidf_model = tfidf_model
+        super().__init__(model_name, nlp=nlp, doc_cache=doc_cache)
         
     def _setup(self):
-        """Load the spaCy model and setup stop words."""
-        try:
-            self.nlp = spacy.load(self.model_name)
-            # Get stop words from spaCy
-            self.stop_words = self.nlp.Defaults.stop_words
-            self.logger.info(f"Loaded spaCy model: {self.model_name}")
-        except OSError:
-            self.logger.error(f"Model {self.model_name} not found.")
-            raise
+        """Load the spaCy model, setup stop words and compile POS patterns."""
+        super()._setup()
+        # Get stop words from spaCy
+        self.stop_words = self.nlp.Defaults.stop_words
+        
+        # Compile POS patterns, allowing punctuation between pattern tokens
+        self.pos_matcher = Matcher(self.nlp.vocab)
+        for pattern in self.POS_PATTERNS:
+            token_patterns = []
+            for i, pos in enumerate(pattern):
+                if i:
+                    token_patterns.append({'IS_PUNCT': True, 'OP': '*'})
+                token_patterns.append({'POS': pos})
+            self.pos_matcher.add('POS_PATTERN', [token_patterns])
             
     def analyze(self, text: str, method: str = "all", top_k: int = 20) -> Dict[str, Any]:
         """Extract keywords from text.
@@ -40,53 +71,126 @@ class KeywordExtractor(BaseAnalyzer):
         Returns:
             Dictionary containing extracted keywords
         """
-        if not self.validate_input(text):
-            return {"error": "Invalid input"}
+        return super().analyze(text, method=method, top_k=top_k)
+    
+    def analyze_doc(self, doc: Doc, method: str = "all", top_k: int = 20) -> Dict[str, Any]:
+        """Extract keywords from a parsed document.
+        
+        Args:
+            doc: spaCy document
+            method: Method to use ('tfidf', 'frequency', 'textrank', 'all')
+            top_k: Number of top keywords to return
+            
+        Returns:
+            Dictionary containing extracted keywords
+        """
+        return super().analyze_doc(doc, method=method, top_k=top_k)
+    
+    def new_state(self) -> Dict[str, Any]:
+        """Create an empty keyword accumulator.
+        
+        Returns:
+            Accumulator for accumulate and finalize
+        """
+        return {
+            'term_freq': Counter(),
+            'sentence_freq': Counter(),
+            'num_sentences': 0,
+            'pos_patterns': Counter(),
+            'total_tokens': 0,
+            'unique_tokens': set()
+        }
+    
+    def accumulate(self, state: Dict[str, Any], doc: Doc, offset: int = 0):
+        """Merge keyword counts from one document into the accumulator.
+        
+        Args:
+            state: Accumulator from new_state
+            doc: spaCy document
+            offset: Character offset of the document (unused; keywords have no positions)
+        """
+        # Term and sentence frequencies in one pass
+        for sent in doc.sents:
+            words = [token.lemma_.lower() for token in sent if self._is_candidate(token)]
+            state['term_freq'].update(words)
+            state['sentence_freq'].update(set(words))
+            state['num_sentences'] += 1
             
-        text = self.preprocess(text)
-        doc = self.nlp(text)
+        state['pos_patterns'].update(self._count_pos_patterns(doc))
+        state['total_tokens'] += len(doc)
+        state['unique_tokens'].update(token.text.lower() for token in doc if not token.is_stop)
+    
+    def finalize(self, state: Dict[str, Any], method: str = "all", top_k: int = 20) -> Dict[str, Any]:
+        """Build the keyword result from an accumulator.
         
+        Args:
+            state: Accumulator from new_state
+            method: Method to use ('tfidf', 'frequency', 'textrank', 'all')
+            top_k: Number of top keywords to return
+            
+        Returns:
+            Dictionary containing extracted keywords
+        """
         results = {}
         
         if method in ["frequency", "all"]:
-            results['frequency_keywords'] = self._extract_frequency_keywords(doc, top_k)
+            results['frequency_keywords'] = self._extract_frequency_keywords(state, top_k)
             
         if method in ["tfidf", "all"]:
-            results['tfidf_keywords'] = self._extract_tfidf_keywords(doc, top_k)
+            results['tfidf_keywords'] = self._extract_tfidf_keywords(state, top_k)
             
         if method in ["pos_patterns", "all"]:
-            results['pos_pattern_keywords'] = self._extract_pos_patterns(doc, top_k)
+            results['pos_pattern_keywords'] = [
+                phrase for phrase, _ in state['pos_patterns'].most_common(top_k)
+            ]
             
         # Add metadata
         results['metadata'] = {
             'method': method,
             'top_k': top_k,
-            'total_tokens': len(doc),
-            'unique_tokens': len(set(token.text.lower() for token in doc if not token.is_stop))
+            'total_tokens': state['total_tokens'],
+            'unique_tokens': len(state['unique_tokens'])
         }
         
         return results
     
-    def _extract_frequency_keywords(self, doc: spacy.tokens.Doc, top_k: int) -> List[Tuple[str, float]]:
-        """Extract keywords based on frequency.
+    def candidate_terms(self, doc: spacy.tokens.Doc) -> List[str]:
+        """Get candidate keyword terms (lowercased lemmas) in document order.
         
         Args:
             doc: spaCy document
-            top_k: Number of keywords to return
             
         Returns:
-            List of (keyword, score) tuples
+            List of terms, with repeats
         """
-        # Count word frequencies
-        word_freq = Counter()
+        return [token.lemma_.lower() for token in doc if self._is_candidate(token)]
+    
+    def _is_candidate(self, token: spacy.tokens.Token) -> bool:
+        """Check whether a token can be a keyword.
         
-        for token in doc:
-            # Skip stop words, punctuation, and short words
-            if (not token.is_stop and 
+        Args:
+            token: spaCy token
+            
+        Returns:
+            True for content words that are not stop words or punctuation
+        """
+        # Skip stop words, punctuation, and short words
+        return (not token.is_stop and 
                 not token.is_punct and 
                 len(token.text) > 2 and
-                token.pos_ in ['NOUN', 'PROPN', 'VERB', 'ADJ']):
-                word_freq[token.lemma_.lower()] += 1
+                token.pos_ in ['NOUN', 'PROPN', 'VERB', 'ADJ'])
+    
+    def _extract_frequency_keywords(self, state: Dict[str, Any], top_k: int) -> List[Tuple[str, float]]:
+        """Extract keywords based on frequency.
+        
+        Args:
+            state: Keyword accumulator
+            top_k: Number of keywords to return
+            
+        Returns:
+            List of (keyword, score) tuples
+        """
+        word_freq = state['term_freq']
                 
         # Get top keywords
         total_words = sum(word_freq.values())
@@ -98,132 +202,111 @@ class KeywordExtractor(BaseAnalyzer):
             
         return keywords
     
-    def _extract_tfidf_keywords(self, doc: spacy.tokens.Doc, top_k: int) -> List[Tuple[str, float]]:
+    def _extract_tfidf_keywords(self, state: Dict[str, Any], top_k: int) -> List[Tuple[str, float]]:
         """Extract keywords using TF-IDF.
         
+        Uses corpus document frequencies when a TF-IDF model is configured,
+        otherwise treats the document's sentences as the collection.
+        
         Args:
-            doc: spaCy document
+            state: Keyword accumulator
             top_k: Number of keywords to return
             
         Returns:
             List of (keyword, score) tuples
         """
-        # For true TF-IDF, we'd need a document collection
-        # Here we'll use a simplified version based on sentences
+        if self.tfidf_model is not None and len(self.tfidf_model):
+            return self.tfidf_model.top_keywords_from_counts(state['term_freq'], top_k)
         
-        sentences = list(doc.sents)
-        if len(sentences) < 2:
+        num_sentences = state['num_sentences']
+        if num_sentences < 2:
             # Fall back to frequency for short texts
-            return self._extract_frequency_keywords(doc, top_k)
-            
-        # Calculate term frequency per sentence
-        sentence_words = []
-        vocabulary = set()
-        
-        for sent in sentences:
-            words = []
-            for token in sent:
-                if (not token.is_stop and 
-                    not token.is_punct and 
-                    len(token.text) > 2 and
-                    token.pos_ in ['NOUN', 'PROPN', 'VERB', 'ADJ']):
-                    word = token.lemma_.lower()
-                    words.append(word)
-                    vocabulary.add(word)
-            sentence_words.append(words)
-            
-        # Calculate IDF scores
-        idf_scores = {}
-        num_sentences = len(sentences)
-        
-        for word in vocabulary:
-            # Count sentences containing the word
-            doc_freq = sum(1 for words in sentence_words if word in words)
-            idf_scores[word] = math.log((num_sentences + 1) / (doc_freq + 1))
+            return self._extract_frequency_keywords(state, top_k)
             
         # Calculate TF-IDF for the whole document
-        doc_word_freq = Counter()
-        for words in sentence_words:
-            doc_word_freq.update(words)
-            
+        doc_word_freq = state['term_freq']
+        sentence_freq = state['sentence_freq']
         total_words = sum(doc_word_freq.values())
         tfidf_scores = {}
         
         for word, freq in doc_word_freq.items():
             tf = freq / total_words
-            tfidf_scores[word] = tf * idf_scores[word]
+            idf = math.log((num_sentences + 1) / (sentence_freq[word] + 1))
+            tfidf_scores[word] = tf * idf
             
         # Sort and return top keywords
         sorted_keywords = sorted(tfidf_scores.items(), key=lambda x: x[1], reverse=True)
         return [(word, round(score, 4)) for word, score in sorted_keywords[:top_k]]
     
-    def _extract_pos_patterns(self, doc: spacy.tokens.Doc, top_k: int) -> List[str]:
-        """Extract multi-word keywords based on POS patterns.
+    def _count_pos_patterns(self, doc: spacy.tokens.Doc) -> Counter:
+        """Count multi-word keywords based on POS patterns.
+        
+        All patterns are matched in a single pass over the document by the
+        compiled matcher; punctuation between pattern tokens is skipped and
+        matches may not cross sentence boundaries.
         
         Args:
             doc: spaCy document
-            top_k: Number of keywords to return
             
         Returns:
-            List of multi-word keywords
+            Counter of lowercased phrases
         """
-        # Define POS patterns for multi-word expressions
-        patterns = [
-            ['ADJ', 'NOUN'],           # "medical condition"
-            ['NOUN', 'NOUN'],          # "stress response"
-            ['ADJ', 'ADJ', 'NOUN'],    # "chronic fatigue syndrome"
-            ['NOUN', 'ADP', 'NOUN'],   # "state of health"
-            ['VERB', 'NOUN'],          # "reduce inflammation"
-            ['ADV', 'VERB'],           # "significantly improve"
-        ]
-        
         keywords = Counter()
         
-        for sent in doc.sents:
-            tokens = [token for token in sent if not token.is_punct]
-            
-            for i in range(len(tokens)):
-                for pattern in patterns:
-                    if i + len(pattern) <= len(tokens):
-                        # Check if tokens match pattern
-                        if all(tokens[i+j].pos_ == pattern[j] for j in range(len(pattern))):
-                            # Extract the phrase
-                            phrase = ' '.join(tokens[i+j].text for j in range(len(pattern)))
-                            # Only keep if not all stop words
-                            if not all(tokens[i+j].is_stop for j in range(len(pattern))):
-                                keywords[phrase.lower()] += 1
+        for _, start, end in self.pos_matcher(doc):
+            span = doc[start:end]
+            
+            # Patterns match within a sentence only
+            if any(token.is_sent_start for token in span[1:]):
+                continue
+                
+            tokens = [token for token in span if not token.is_punct]
+            # Only keep if not all stop words
+            if not all(token.is_stop for token in tokens):
+                keywords[' '.join(token.text for token in tokens).lower()] += 1
                                 
-        # Return top phrases
-        return [phrase for phrase, _ in keywords.most_common(top_k)]
+        return keywords
     
-    def extract_domain_keywords(self, text: str, domain_terms: List[str]) -> Dict[str, Any]:
+    def extract_domain_keywords(self, text: str,
+                                domain_terms: Union[List[str], TermMatcher]) -> Dict[str, Any]:
         """Extract keywords related to specific domain terms.
         
+        All terms are found in one scan of the text, so large vocabularies
+        cost no more per sentence than small ones.
+        
         Args:
             text: Text to analyze
-            domain_terms: List of domain-specific terms to look for
+            domain_terms: Domain-specific terms to look for, or a prebuilt
+                TermMatcher for vocabularies reused across calls
             
         Returns:
             Dictionary of domain keywords and their contexts
         """
-        doc = self.nlp(text)
+        doc = self.parse(text)
         domain_keywords = {}
         
-        # Convert domain terms to lowercase for matching
-        domain_terms_lower = [term.lower() for term in domain_terms]
+        matcher = domain_terms if isinstance(domain_terms, TermMatcher) else TermMatcher(domain_terms)
+        sentences = list(doc.sents)
+        sentence_starts = [sent.start_char for sent in sentences]
         
-        for sent in doc.sents:
-            sent_lower = sent.text.lower()
-            
-            for i, term in enumerate(domain_terms_lower):
-                if term in sent_lower:
-                    if domain_terms[i] not in domain_keywords:
-                        domain_keywords[domain_terms[i]] = {
-                            'count': 0,
-                            'contexts': []
-                        }
-                    
-                    domain_keywords[domain_terms[i]]['count'] += 1
-                    domain_keywords[domain_terms[i]]['contexts'].append(sent.text.strip())
+        # Sentences containing each term (case-insensitive substring match)
+        found = defaultdict(set)
+        for match in matcher.find_all(doc.text):
+            found[bisect_right(sentence_starts, match.start) - 1].add(match.term)
+            
+        # Report terms in vocabulary order within each sentence
+        order = {term: i for i, term in enumerate(matcher.terms)}
+        
+        for sent_index in sorted(found):
+            sent = sentences[sent_index]
+            for term in sorted(found[sent_index], key=order.get):
+                if term not in domain_keywords:
+                    domain_keywords[term] = {
+                        'count': 0,
+                        'contexts': []
+                    }
+                
+                domain_keywords[term]['count'] += 1
+                domain_keywords[term]['contexts'].append(sent.text.strip())
                     
         return domain_keywords
@@ -0,0 +1,187 @@
+"""ONNX Runtime backend with int8 dynamic quantization for sentence embeddings."""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+import json
+import logging
+import time
+from sentence_transformers import SentenceTransformer
+
+logger = logging.getLogger(__name__)
+
+# Instruction sets supported by sentence-transformers' quantization presets
+QUANTIZATION_CONFIGS = ('avx2', 'avx512', 'avx512_vnni', 'arm64')
+
+# Written next to the exported model; records how it was built and verified
+EXPORT_INFO_FILE = 'export_info.json'
+
+# Fixed sample for checking the exported model against the reference model
+REFERENCE_SENTENCES = [
+    "Chronic inflammation is linked to insulin resistance and metabolic syndrome.",
+    "Vitamin D deficiency is common in patients with autoimmune disease.",
+    "The gut microbiome influences immune function and mood.",
+    "Intermittent fasting improved fasting glucose in the study cohort.",
+    "Sleep deprivation raises cortisol and impairs recovery after exercise.",
+    "Omega-3 fatty acids reduced triglycerides by twenty percent.",
+    "Patients reported less joint pain after eliminating processed foods.",
+    "Mitochondrial dysfunction contributes to chronic fatigue syndrome.",
+    "Thyroid hormone levels should be interpreted alongside symptoms.",
+    "Strength training preserves muscle mass and bone density with age.",
+    "Blood pressure medication was adjusted after the follow-up visit.",
+    "The speaker compared ketogenic and Mediterranean diets for heart health.",
+    "Heavy metal exposure was measured with a urine provocation test.",
+    "Magnesium supplementation may help with migraines and muscle cramps.",
+    "Stress management techniques lowered reported anxiety scores.",
+    "Genetic variants in MTHFR affect folate metabolism.",
+]
+
+
+# Where export_embedding_model.py writes exported models by default
+DEFAULT_EXPORT_DIR = 'data/onnx_models'
+
+
+def default_model_dir(model_name: str, export_dir: Union[str, Path] = DEFAULT_EXPORT_DIR) -> Path:
+    """Directory an exported model is written to and loaded from by default.
+
+    Args:
+        model_name: Hugging Face model name
+        export_dir: Parent directory of exported models
+
+    Returns:
+        Export directory for the model
+    """
+    return Path(export_dir) / model_name.replace('/', '__')
+
+
+def quantized_file_name(quantization: str) -> str:
+    """Path of the quantized model inside an export directory.
+
+    Args:
+        quantization: One of QUANTIZATION_CONFIGS
+
+    Returns:
+        File name relative to the export directory
+    """
+    return f"onnx/model_qint8_{quantization}.onnx"
+
+
+def export_onnx_model(model_name: str, output_dir: Union[str, Path],
+                      quantization: Optional[str] = 'avx512_vnni') -> Path:
+    """Export a sentence-transformers model to ONNX, optionally int8-quantized.
+
+    The fp32 ONNX graph is always saved; with quantization a dynamically
+    quantized (int8 weights, activations quantized at run time) copy is saved
+    alongside it for the given instruction set.
+
+    Args:
+        model_name: Hugging Face model name or local path
+        output_dir: Directory to write the exported model to
+        quantization: Quantization preset (None for fp32 only)
+
+    Returns:
+        Export directory
+    """
+    from sentence_transformers import export_dynamic_quantized_onnx_model
+
+    if quantization is not None and quantization not in QUANTIZATION_CONFIGS:
+        raise ValueError(f"Unknown quantization: {quantization}. Choose from {', '.join(QUANTIZATION_CONFIGS)}")
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Loading with the ONNX backend exports the graph when the model has none
+    model = SentenceTransformer(model_name, backend='onnx', device='cpu')
+    model.save_pretrained(str(output_dir))
+
+    if quantization is not None:
+        export_dynamic_quantized_onnx_model(model, quantization, str(output_dir))
+
+    logger.info(f"Exported {model_name} to {output_dir}"
+                + (f" (int8, {quantization})" if quantization else ""))
+    return output_dir
+
+
+def load_onnx_model(model_dir: Union[str, Path], quantization: Optional[str] = None) -> SentenceTransformer:
+    """Load an exported model for inference with ONNX Runtime.
+
+    Args:
+        model_dir: Directory written by export_onnx_model
+        quantization: Load the int8 model for this preset (None for fp32)
+
+    Returns:
+        SentenceTransformer whose encode runs on ONNX Runtime
+    """
+    file_name = quantized_file_name(quantization) if quantization else 'onnx/model.onnx'
+    if not (Path(model_dir) / file_name).exists():
+        raise FileNotFoundError(f"No exported model at {Path(model_dir) / file_name}; "
+                                f"run export_embedding_model.py first")
+
+    return SentenceTransformer(str(model_dir), backend='onnx', device='cpu',
+                               model_kwargs={'file_name': file_name})
+
+
+def read_export_info(model_dir: Union[str, Path]) -> Dict[str, Any]:
+    """Read the export record of an exported model.
+
+    Args:
+        model_dir: Export directory
+
+    Returns:
+        Export info (empty if the model was exported elsewhere)
+    """
+    path = Path(model_dir) / EXPORT_INFO_FILE
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def write_export_info(model_dir: Union[str, Path], info: Dict[str, Any]):
+    """Record how a model was exported and how well it agreed with the reference.
+
+    Args:
+        model_dir: Export directory
+        info: Export info
+    """
+    (Path(model_dir) / EXPORT_INFO_FILE).write_text(json.dumps(info, indent=2))
+
+
+def cosine_agreement(reference: SentenceTransformer, candidate: SentenceTransformer,
+                     sentences: Sequence[str] = REFERENCE_SENTENCES) -> Dict[str, float]:
+    """Compare a candidate model's embeddings with the reference model's.
+
+    Args:
+        reference: Reference (PyTorch fp32) model
+        candidate: Exported model
+        sentences: Sample to embed with both
+
+    Returns:
+        Mean and minimum cosine similarity between paired embeddings
+    """
+    sentences = list(sentences)
+    expected = reference.encode(sentences, convert_to_numpy=True, normalize_embeddings=True)
+    actual = candidate.encode(sentences, convert_to_numpy=True, normalize_embeddings=True)
+    cosines = (expected * actual).sum(axis=1)
+
+    return {'mean_cosine': float(cosines.mean()), 'min_cosine': float(cosines.min())}
+
+
+def measure_throughput(model: SentenceTransformer, sentences: List[str],
+                       batch_size: int = 32, rounds: int = 3) -> float:
+    """Best-of-rounds encode throughput.
+
+    Args:
+        model: Model to time
+        sentences: Sentences to encode per round
+        batch_size: Encode batch size
+        rounds: Timed rounds
+
+    Returns:
+        Sentences per second
+    """
+    model.encode(sentences[:batch_size], batch_size=batch_size)  # warm up
+
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        model.encode(sentences, batch_size=batch_size, convert_to_numpy=True)
+        best = min(best, time.perf_counter() - start)
+
+    return len(sentences) / best if best > 0 else 0.0
@@ -0,0 +1,199 @@
+"""Run analyzers in forked worker processes that share preloaded models."""
+
+from collections import deque
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+import gc
+import logging
+import multiprocessing
+import os
+import queue
+import sys
+import time
+
+from .base_analyzer import BaseAnalyzer
+
+logger = logging.getLogger(__name__)
+
+# Task function of the pool being started; set in the parent before forking,
+# so workers inherit it (and the analyzers it closes over) without pickling
+_worker_func: Optional[Callable[[Any], Any]] = None
+
+
+def _init_worker(threads_per_worker: int):
+    """Keep each worker's native thread pools from oversubscribing the cores."""
+    os.environ['OMP_NUM_THREADS'] = str(threads_per_worker)
+    torch = sys.modules.get('torch')
+    if torch is not None:
+        torch.set_num_threads(threads_per_worker)
+
+
+def _run_chunk(chunk: List[Any]) -> List[Any]:
+    return [_worker_func(item) for item in chunk]
+
+
+class AnalyzerProcessPool:
+    """Distribute work over forked processes after preloading analyzer models.
+
+    Analyzers are constructed (and warmed up) in the parent, then workers are
+    forked, so spaCy pipelines and SentenceTransformer weights are shared
+    copy-on-write instead of being loaded once per worker. Objects alive at
+    fork time are moved out of the garbage collector's reach (gc.freeze),
+    so collections in the workers don't touch, and copy, the shared pages.
+
+    The task function may close over the analyzers; only the items and the
+    results cross process boundaries and must be picklable. Items are read
+    only as workers free up (at most workers * prefetch chunks ahead), so
+    memory does not grow with the input. A worker that dies mid-task (e.g.
+    killed for using too much memory) never reports back, so with
+    task_timeout set a result that takes longer aborts the run with
+    TimeoutError. With one worker, or where fork is unavailable, tasks run
+    in the calling process.
+    """
+
+    def __init__(self, analyzers: Sequence[BaseAnalyzer], workers: int = 1,
+                 chunksize: int = 1, threads_per_worker: int = 1, prefetch: int = 2,
+                 task_timeout: Optional[float] = None):
+        """Initialize the pool.
+
+        Args:
+            analyzers: Loaded analyzers the task function uses
+            workers: Worker processes (0 or less for all cores)
+            chunksize: Items sent to a worker per round trip
+            threads_per_worker: Native (torch/BLAS) threads per worker
+            prefetch: Chunks submitted per worker ahead of the results
+            task_timeout: Seconds to wait for the next result before
+                assuming its worker died (None waits forever)
+        """
+        self.analyzers = list(analyzers)
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.chunksize = max(1, chunksize)
+        self.threads_per_worker = max(1, threads_per_worker)
+        self.prefetch = max(1, prefetch)
+        self.task_timeout = task_timeout if task_timeout and task_timeout > 0 else None
+        self.processed = 0
+        self.elapsed = 0.0
+
+        if self.workers > 1 and 'fork' not in multiprocessing.get_all_start_methods():
+            logger.warning("fork is not available on this platform; running in a single process")
+            self.workers = 1
+
+    def map(self, func: Callable[[Any], Any], items: Iterable[Any],
+            ordered: bool = True) -> Iterator[Any]:
+        """Apply func to every item in the worker processes.
+
+        Args:
+            func: Task function; exceptions it raises stop the run, so it
+                should report per-item failures in its result
+            items: Work items, read at most workers * prefetch chunks
+                ahead of the results
+            ordered: Yield results in input order rather than as they finish
+
+        Yields:
+            One result per item
+
+        Raises:
+            TimeoutError: If no result arrives within task_timeout
+        """
+        global _worker_func
+
+        self.processed = 0
+        start = time.perf_counter()
+
+        if self.workers == 1:
+            for item in items:
+                yield func(item)
+                self.processed += 1
+            self.elapsed = time.perf_counter() - start
+            return
+
+        if _worker_func is not None:
+            raise RuntimeError("Another AnalyzerProcessPool is already running")
+
+        for analyzer in self.analyzers:
+            analyzer.warm_up()
+
+        _worker_func = func
+        gc.collect()
+        gc.freeze()
+
+        try:
+            context = multiprocessing.get_context('fork')
+            with context.Pool(self.workers, initializer=_init_worker,
+                              initargs=(self.threads_per_worker,)) as pool:
+                # Pool.imap would read the whole input ahead in its task thread
+                iterator = iter(items)
+                chunks = iter(lambda: list(islice(iterator, self.chunksize)), [])
+                results = self._map_ordered(pool, chunks) if ordered else self._map_unordered(pool, chunks)
+                for chunk_results in results:
+                    for result in chunk_results:
+                        yield result
+                        self.processed += 1
+        finally:
+            gc.unfreeze()
+            _worker_func = None
+            self.elapsed = time.perf_counter() - start
+
+    def _map_ordered(self, pool: Any, chunks: Iterator[List[Any]]) -> Iterator[List[Any]]:
+        """Submit chunks with a bounded backlog and yield results in input order."""
+        max_in_flight = self.workers * self.prefetch
+        pending = deque()
+
+        def next_finished() -> List[Any]:
+            try:
+                return pending.popleft().get(self.task_timeout)
+            except multiprocessing.TimeoutError:
+                raise self._timeout_error() from None
+
+        for chunk in chunks:
+            pending.append(pool.apply_async(_run_chunk, (chunk,)))
+            if len(pending) >= max_in_flight:
+                yield next_finished()
+
+        while pending:
+            yield next_finished()
+
+    def _map_unordered(self, pool: Any, chunks: Iterator[List[Any]]) -> Iterator[List[Any]]:
+        """Submit chunks with a bounded backlog and yield results as they finish."""
+        max_in_flight = self.workers * self.prefetch
+        finished = queue.SimpleQueue()
+        in_flight = 0
+
+        def next_finished() -> List[Any]:
+            try:
+                chunk_results, error = finished.get(timeout=self.task_timeout)
+            except queue.Empty:
+                raise self._timeout_error() from None
+            if error is not None:
+                raise error
+            return chunk_results
+
+        for chunk in chunks:
+            pool.apply_async(_run_chunk, (chunk,),
+                             callback=lambda r: finished.put((r, None)),
+                             error_callback=lambda e: finished.put((None, e)))
+            in_flight += 1
+            if in_flight >= max_in_flight:
+                in_flight -= 1
+                yield next_finished()
+
+        while in_flight:
+            in_flight -= 1
+            yield next_finished()
+
+    def _timeout_error(self) -> TimeoutError:
+        return TimeoutError(f"No worker result within {self.task_timeout}s; "
+                            f"a worker process may have been killed")
+
+    def stats(self) -> Dict[str, Any]:
+        """Throughput of the last map call.
+
+        Returns:
+            Worker count, items processed, elapsed seconds and items/sec
+        """
+        return {
+            'workers': self.workers,
+            'processed': self.processed,
+            'elapsed': round(self.elapsed, 3),
+            'items_per_sec': round(self.processed / self.elapsed, 3) if self.elapsed > 0 else 0.0
+        }
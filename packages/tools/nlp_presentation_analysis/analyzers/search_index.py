@@ -0,0 +1,333 @@
+"""Hybrid semantic and keyword search over transcript chunks of all presentations."""
+
+from bisect import bisect_right
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from pathlib import Path
+import json
+import logging
+import os
+import shutil
+import numpy as np
+
+from .bm25_index import BM25Index, tokenize
+from utils import iter_text_windows, iter_timestamp_markers
+from utils.similarity import normalize_rows, top_k_rows
+
+logger = logging.getLogger(__name__)
+
+SEARCH_MODES = ('hybrid', 'semantic', 'keyword')
+
+# Offset added to ranks in reciprocal rank fusion; 60 is the usual choice
+RRF_K = 60
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[int]], k: int = RRF_K) -> List[Tuple[int, float]]:
+    """Fuse ranked lists by summing 1 / (k + rank) per item.
+
+    Rank-based fusion needs no calibration between cosine and BM25 scores.
+
+    Args:
+        rankings: Ranked item lists, best first
+        k: Rank offset damping the weight of the top positions
+
+    Returns:
+        (item, fused score) pairs, best first
+    """
+    fused: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            fused[item] = fused.get(item, 0.0) + 1.0 / (k + rank)
+
+    return sorted(fused.items(), key=lambda pair: -pair[1])
+
+
+def chunk_timestamps(text: str, offsets: Sequence[int]) -> List[int]:
+    """Time of each chunk from the transcript's timestamp markers.
+
+    A chunk gets the last marker at or before its start, or failing that the
+    first marker inside it.
+
+    Args:
+        text: Transcript text
+        offsets: Chunk start offsets in text, ascending
+
+    Returns:
+        Seconds per chunk (-1 where the transcript has no marker)
+    """
+    markers = list(iter_timestamp_markers(text))
+    positions = [position for position, _ in markers]
+
+    seconds = []
+    for offset in offsets:
+        i = bisect_right(positions, offset)
+        if i:
+            seconds.append(markers[i - 1][1])
+        else:
+            seconds.append(markers[0][1] if markers else -1)
+    return seconds
+
+
+def format_timestamp(seconds: int) -> str:
+    """Format seconds as H:MM:SS (or M:SS under an hour)."""
+    if seconds < 0:
+        return ''
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes}:{secs:02d}"
+
+
+class SearchIndexWriter:
+    """Build a SearchIndex one presentation at a time.
+
+    Chunk texts and embeddings are streamed to disk as they are added, so
+    building over a large corpus holds only the BM25 term counts in memory.
+    The index is written to a temporary directory and moved into place by
+    close(), so searches keep using the previous index during a rebuild.
+    """
+
+    def __init__(self, path: Union[str, Path], embedding_generator: Any,
+                 chunk_size: int = 512, overlap: int = 128, batch_size: int = 64):
+        """Initialize the writer.
+
+        Args:
+            path: Index directory
+            embedding_generator: Loaded EmbeddingGenerator
+            chunk_size: Chunk size in characters
+            overlap: Overlap between chunks in characters
+            batch_size: Chunks encoded per model call
+        """
+        self.path = Path(path)
+        self.generator = embedding_generator
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self.batch_size = batch_size
+
+        self._tmp_path = self.path.with_name(self.path.name + '.tmp')
+        if self._tmp_path.exists():
+            shutil.rmtree(self._tmp_path)
+        self._tmp_path.mkdir(parents=True)
+
+        self.bm25 = BM25Index()
+        self.presentations: List[Dict[str, Any]] = []
+        self._chunk_presentation: List[int] = []
+        self._chunk_offsets: List[int] = []
+        self._chunk_seconds: List[int] = []
+        self._text_offsets = [0]
+        self._dim: Optional[int] = None
+        self._texts = open(self._tmp_path / 'chunks.txt', 'wb')
+        self._vectors = open(self._tmp_path / 'embeddings.f32', 'wb')
+
+    def __len__(self) -> int:
+        return len(self._chunk_offsets)
+
+    def add_presentation(self, presentation_id: str, title: Optional[str], text: str) -> int:
+        """Chunk, embed and index one transcript.
+
+        Args:
+            presentation_id: UUID of the presentation
+            title: Presentation title (shown in results)
+            text: Transcript text
+
+        Returns:
+            Number of chunks added
+        """
+        windows = list(iter_text_windows(text or '', self.chunk_size, self.overlap))
+        if not windows:
+            return 0
+
+        offsets = [offset for offset, _ in windows]
+        chunks = [chunk for _, chunk in windows]
+
+        embeddings = self.generator.model.encode(chunks, batch_size=self.batch_size, convert_to_numpy=True)
+        embeddings = normalize_rows(embeddings)
+        self._dim = embeddings.shape[1]
+        self._vectors.write(embeddings.tobytes())
+
+        row = len(self.presentations)
+        self.presentations.append({'id': presentation_id, 'title': title or ''})
+
+        for chunk in chunks:
+            self.bm25.add(tokenize(chunk))
+            encoded = chunk.encode('utf-8')
+            self._texts.write(encoded)
+            self._text_offsets.append(self._text_offsets[-1] + len(encoded))
+
+        self._chunk_presentation.extend([row] * len(chunks))
+        self._chunk_offsets.extend(offsets)
+        self._chunk_seconds.extend(chunk_timestamps(text, offsets))
+        return len(chunks)
+
+    def close(self):
+        """Finalize the index files and replace the index at path."""
+        self._texts.close()
+        self._vectors.close()
+
+        n_chunks = len(self)
+        dim = self._dim or 0
+        raw = np.memmap(self._tmp_path / 'embeddings.f32', dtype=np.float32, mode='r',
+                        shape=(n_chunks, dim)) if n_chunks else np.zeros((0, dim), dtype=np.float32)
+        np.save(self._tmp_path / 'embeddings.npy', raw)
+        del raw
+        os.remove(self._tmp_path / 'embeddings.f32')
+
+        self.bm25.save(self._tmp_path / 'bm25')
+
+        np.savez(
+            self._tmp_path / 'chunks.npz',
+            presentation=np.asarray(self._chunk_presentation, dtype=np.int32),
+            offset=np.asarray(self._chunk_offsets, dtype=np.int64),
+            seconds=np.asarray(self._chunk_seconds, dtype=np.int32),
+            text_offsets=np.asarray(self._text_offsets, dtype=np.int64)
+        )
+
+        with open(self._tmp_path / 'index.json', 'w') as f:
+            json.dump({
+                'model_name': self.generator.model_name,
+                'chunk_size': self.chunk_size,
+                'overlap': self.overlap,
+                'built_at': datetime.utcnow().isoformat(),
+                'presentations': self.presentations
+            }, f)
+
+        # Swap the finished index in
+        if self.path.exists():
+            old_path = self.path.with_name(self.path.name + '.old')
+            if old_path.exists():
+                shutil.rmtree(old_path)
+            os.replace(self.path, old_path)
+            os.replace(self._tmp_path, self.path)
+            shutil.rmtree(old_path)
+        else:
+            os.replace(self._tmp_path, self.path)
+
+        logger.info(f"Wrote search index of {n_chunks} chunks from {len(self.presentations)} "
+                    f"presentations to {self.path}")
+
+
+class SearchIndex:
+    """Prebuilt chunk index answering free-text queries.
+
+    Semantic candidates come from one matrix-vector product over the
+    memory-mapped, pre-normalized chunk embeddings; keyword candidates from
+    BM25. The two rankings are fused with reciprocal rank fusion. Chunk
+    texts are read from disk only for the returned results, so opening the
+    index costs milliseconds regardless of corpus size.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """Open an index written by SearchIndexWriter.
+
+        Args:
+            path: Index directory
+        """
+        self.path = Path(path)
+
+        with open(self.path / 'index.json') as f:
+            info = json.load(f)
+        self.model_name: str = info['model_name']
+        self.presentations: List[Dict[str, Any]] = info['presentations']
+
+        self.embeddings = np.load(self.path / 'embeddings.npy', mmap_mode='r')
+        self.bm25 = BM25Index.load(self.path / 'bm25')
+
+        chunks = np.load(self.path / 'chunks.npz')
+        self.chunk_presentation = chunks['presentation']
+        self.chunk_offsets = chunks['offset']
+        self.chunk_seconds = chunks['seconds']
+        self._text_offsets = chunks['text_offsets']
+        self._texts = np.memmap(self.path / 'chunks.txt', dtype=np.uint8, mode='r') \
+            if self._text_offsets[-1] else np.zeros(0, dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return len(self.chunk_offsets)
+
+    def chunk_text(self, i: int) -> str:
+        """Text of chunk i."""
+        return self._texts[self._text_offsets[i]:self._text_offsets[i + 1]].tobytes().decode('utf-8')
+
+    def semantic_candidates(self, query_embedding: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Chunks closest to a query embedding.
+
+        Args:
+            query_embedding: Query vector of shape (dim,)
+            top_k: Number of chunks to return
+
+        Returns:
+            Tuple of (chunk indices, cosine similarities), best first
+        """
+        if not len(self):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        query = normalize_rows(np.asarray(query_embedding)[np.newaxis, :])
+        scores = self.embeddings @ query[0]
+        indices, top_scores = top_k_rows(scores[np.newaxis, :], top_k)
+        return indices[0], top_scores[0]
+
+    def search(self, query: str, query_embedding: Optional[np.ndarray] = None, top_k: int = 10,
+               mode: str = 'hybrid', candidates: int = 100, max_per_presentation: int = 3,
+               rrf_k: int = RRF_K) -> List[Dict[str, Any]]:
+        """Search the index.
+
+        Args:
+            query: Free-text query
+            query_embedding: Query embedding from the index's model
+                (required unless mode is 'keyword')
+            top_k: Number of results to return
+            mode: 'hybrid', 'semantic' or 'keyword'
+            candidates: Chunks taken from each ranking before fusion
+            max_per_presentation: Results kept per presentation (0 for no limit)
+            rrf_k: Reciprocal rank fusion offset
+
+        Returns:
+            Results best first, with presentation, timestamp, snippet and
+            the chunk's rank in each ranking
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {mode}. Choose from {', '.join(SEARCH_MODES)}")
+
+        rankings = []
+        similarity: Dict[int, float] = {}
+        semantic_rank: Dict[int, int] = {}
+        keyword_rank: Dict[int, int] = {}
+
+        if mode != 'keyword':
+            if query_embedding is None:
+                raise ValueError(f"{mode} search needs a query embedding")
+            indices, scores = self.semantic_candidates(query_embedding, candidates)
+            rankings.append(indices.tolist())
+            similarity = dict(zip(indices.tolist(), scores.tolist()))
+            semantic_rank = {i: rank for rank, i in enumerate(rankings[-1], start=1)}
+
+        if mode != 'semantic':
+            indices, _ = self.bm25.search(tokenize(query), candidates)
+            rankings.append(indices.tolist())
+            keyword_rank = {i: rank for rank, i in enumerate(rankings[-1], start=1)}
+
+        results = []
+        per_presentation: Dict[int, int] = {}
+
+        for chunk, score in reciprocal_rank_fusion(rankings, rrf_k):
+            row = int(self.chunk_presentation[chunk])
+            if max_per_presentation and per_presentation.get(row, 0) >= max_per_presentation:
+                continue
+            per_presentation[row] = per_presentation.get(row, 0) + 1
+
+            seconds = int(self.chunk_seconds[chunk])
+            results.append({
+                'presentation_id': self.presentations[row]['id'],
+                'title': self.presentations[row]['title'],
+                'chunk_index': chunk,
+                'offset': int(self.chunk_offsets[chunk]),
+                'seconds': seconds if seconds >= 0 else None,
+                'timestamp': format_timestamp(seconds),
+                'chunk_text': self.chunk_text(chunk),
+                'score': score,
+                'similarity': similarity.get(chunk),
+                'semantic_rank': semantic_rank.get(chunk),
+                'keyword_rank': keyword_rank.get(chunk)
+            })
+            if len(results) >= top_k:
+                break
+
+        return results
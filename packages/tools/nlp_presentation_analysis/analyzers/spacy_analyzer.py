@@ -0,0 +1,278 @@
+"""Shared spaCy infrastructure for spaCy-based analyzers."""
+
+from abc import abstractmethod
+from itertools import tee
+from typing import Dict, Any, FrozenSet, Iterable, Iterator, Optional, Tuple
+import logging
+import spacy
+from spacy.language import Language
+from spacy.tokens import Doc
+
+from .base_analyzer import BaseAnalyzer
+from .doc_cache import DocCache
+
+logger = logging.getLogger(__name__)
+
+# Components that may be excluded when no active analyzer needs them.
+# Embedding layers (tok2vec, transformer) are always kept because other
+# components listen to them.
+PRUNABLE_COMPONENTS = (
+    'tagger', 'morphologizer', 'attribute_ruler', 'lemmatizer',
+    'parser', 'senter', 'ner', 'entity_ruler', 'entity_linker',
+    'textcat', 'textcat_multilabel', 'spancat'
+)
+
+# Loaded pipelines keyed by (model_name, required components or None for full)
+_MODEL_CACHE: Dict[Tuple[str, Optional[FrozenSet[str]]], Language] = {}
+
+
+def required_components(analyzer_classes: Iterable[type]) -> Optional[FrozenSet[str]]:
+    """Get the union of components required by several analyzer classes.
+
+    Args:
+        analyzer_classes: SpacyAnalyzer subclasses that will share a pipeline
+
+    Returns:
+        Union of their REQUIRED_COMPONENTS, or None if any needs the full pipeline
+    """
+    components = set()
+    for analyzer_class in analyzer_classes:
+        if analyzer_class.REQUIRED_COMPONENTS is None:
+            return None
+        components.update(analyzer_class.REQUIRED_COMPONENTS)
+    return frozenset(components)
+
+
+def load_spacy_model(model_name: str, components: Optional[Iterable[str]] = None) -> Language:
+    """Load a spaCy model once per process, excluding unneeded components.
+
+    A pipeline already loaded with a superset of the requested components is
+    reused, so loading the union up front lets every analyzer share it.
+
+    Args:
+        model_name: spaCy model to load
+        components: Components to keep (None keeps the full pipeline)
+
+    Returns:
+        Loaded pipeline
+    """
+    required = frozenset(components) if components is not None else None
+
+    for (name, loaded), nlp in _MODEL_CACHE.items():
+        if name == model_name and (loaded is None or (required is not None and required <= loaded)):
+            return nlp
+
+    exclude = [] if required is None else [c for c in PRUNABLE_COMPONENTS if c not in required]
+    nlp = spacy.load(model_name, exclude=exclude)
+    _MODEL_CACHE[(model_name, required)] = nlp
+    logger.info(f"Loaded spaCy model: {model_name} (components: {', '.join(nlp.pipe_names)})")
+    return nlp
+
+
+def pipe_docs(nlp: Language, texts: Iterable[str], batch_size: int = 32,
+              n_process: int = 1) -> Iterator[Doc]:
+    """Parse many texts with nlp.pipe.
+
+    Args:
+        nlp: spaCy pipeline
+        texts: Texts to parse
+        batch_size: Number of texts buffered per batch
+        n_process: Number of worker processes (-1 for all cores)
+
+    Yields:
+        One Doc per text, in input order
+    """
+    yield from nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
+
+
+class SpacyAnalyzer(BaseAnalyzer):
+    """Base class for analyzers that work on spaCy Docs.
+
+    Subclasses implement new_state/accumulate/finalize, so a single parse can
+    feed several analyzers that share a model, and results can be merged
+    across the windows of a long transcript. Subclasses declare the pipeline components
+    they read in REQUIRED_COMPONENTS; everything else is excluded at load.
+    """
+
+    REQUIRED_COMPONENTS: Optional[FrozenSet[str]] = None
+
+    # The batch paths call these rather than analyze()
+    TIMED_METHODS = ('analyze', 'parse_many', 'accumulate', 'finalize')
+
+    def __init__(self, model_name: str = "en_core_web_sm", nlp: Optional[Language] = None,
+                 doc_cache: Optional[DocCache] = None):
+        """Initialize the analyzer.
+
+        Args:
+            model_name: spaCy model to use
+            nlp: Already-loaded pipeline to share instead of loading model_name
+            doc_cache: Cache of previously parsed Docs
+        """
+        self.nlp = nlp
+        self.doc_cache = doc_cache
+        super().__init__(model_name)
+
+    def _setup(self):
+        """Load the spaCy model unless a pipeline was provided."""
+        if self.nlp is not None:
+            return
+        try:
+            self.nlp = load_spacy_model(self.model_name, self.REQUIRED_COMPONENTS)
+        except OSError:
+            self.logger.error(f"Model {self.model_name} not found. Please install it first.")
+            raise
+
+    def warm_up(self):
+        """Run one small parse so the pipeline's lazily built tables exist before forking."""
+        self.nlp("Warm up the pipeline before forking workers.")
+
+    @property
+    def cache_key(self) -> str:
+        """Doc cache namespace: the model plus the components that produced the parse."""
+        return f"{self.model_name}-{'+'.join(sorted(self.nlp.pipe_names))}"
+
+    def parse(self, text: str) -> Doc:
+        """Preprocess and parse a single text, using the Doc cache if configured.
+
+        Args:
+            text: Text to parse
+
+        Returns:
+            Parsed document
+        """
+        text = self.preprocess(text)
+
+        if self.doc_cache is None:
+            return self.nlp(text)
+
+        doc = self.doc_cache.get(self.cache_key, text, self.nlp.vocab)
+        if doc is None:
+            doc = self.nlp(text)
+            self.doc_cache.put(self.cache_key, text, doc)
+        return doc
+
+    def parse_many(self, texts: Iterable[str], batch_size: int = 32, n_process: int = 1) -> Iterator[Doc]:
+        """Preprocess and parse many texts, piping only cache misses through spaCy.
+
+        Args:
+            texts: Texts to parse
+            batch_size: nlp.pipe batch size
+            n_process: nlp.pipe worker processes
+
+        Yields:
+            One Doc per text, in input order (texts are consumed lazily)
+        """
+        texts = (self.preprocess(t) for t in texts)
+
+        if self.doc_cache is None:
+            yield from pipe_docs(self.nlp, texts, batch_size=batch_size, n_process=n_process)
+            return
+
+        # Look each text up once; nlp.pipe reads its copy ahead of this loop
+        to_parse, to_yield = tee((t, self.doc_cache.contains(self.cache_key, t)) for t in texts)
+        parsed = pipe_docs(
+            self.nlp,
+            (t for t, hit in to_parse if not hit),
+            batch_size=batch_size,
+            n_process=n_process
+        )
+
+        for text, hit in to_yield:
+            doc = self.doc_cache.get(self.cache_key, text, self.nlp.vocab) if hit else None
+            if doc is None:
+                if hit:
+                    # Cached file was unreadable; re-parse it inline
+                    doc = self.nlp(text)
+                else:
+                    self.doc_cache.misses += 1
+                    doc = next(parsed)
+                self.doc_cache.put(self.cache_key, text, doc)
+            yield doc
+
+    def analyze(self, text: str, **kwargs) -> Dict[str, Any]:
+        """Parse and analyze text.
+
+        Args:
+            text: Text to analyze
+            **kwargs: Options forwarded to analyze_doc
+
+        Returns:
+            Dictionary containing analysis results
+        """
+        if not self.validate_input(text):
+            return {"error": "Invalid input"}
+
+        return self.analyze_doc(self.parse(text), **kwargs)
+
+    def analyze_windows(self, windows: Iterable[Tuple[int, str]], batch_size: int = 32,
+                        n_process: int = 1, **kwargs) -> Dict[str, Any]:
+        """Analyze a long text streamed as bounded-size windows.
+
+        Only one batch of window Docs is alive at a time; per-window results
+        are merged into a single result as the windows stream past. windows
+        is read once, so a generator is never materialized: only the windows
+        nlp.pipe has read ahead are held.
+
+        Args:
+            windows: (offset, text) pairs, e.g. from Presentation.iter_analysis_windows
+            batch_size: nlp.pipe batch size
+            n_process: nlp.pipe worker processes
+            **kwargs: Options forwarded to finalize
+
+        Returns:
+            Dictionary containing merged analysis results
+        """
+        state = self.new_state()
+
+        to_parse, to_merge = tee(windows)
+        docs = self.parse_many((text for _, text in to_parse), batch_size=batch_size, n_process=n_process)
+        for (offset, _), doc in zip(to_merge, docs):
+            self.accumulate(state, doc, offset)
+
+        return self.finalize(state, **kwargs)
+
+    def analyze_doc(self, doc: Doc, **kwargs) -> Dict[str, Any]:
+        """Analyze an already-parsed document.
+
+        Args:
+            doc: spaCy document
+            **kwargs: Options forwarded to finalize
+
+        Returns:
+            Dictionary containing analysis results
+        """
+        state = self.new_state()
+        self.accumulate(state, doc)
+        return self.finalize(state, **kwargs)
+
+    @abstractmethod
+    def new_state(self) -> Dict[str, Any]:
+        """Create an empty accumulator for merging results across Docs.
+
+        Returns:
+            Mutable accumulator passed to accumulate and finalize
+        """
+        pass
+
+    @abstractmethod
+    def accumulate(self, state: Dict[str, Any], doc: Doc, offset: int = 0):
+        """Merge one Doc's counts into an accumulator.
+
+        Args:
+            state: Accumulator from new_state
+            doc: spaCy document (typically one window of a longer text)
+            offset: Character offset of the Doc within the full text
+        """
+        pass
+
+    @abstractmethod
+    def finalize(self, state: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        """Turn an accumulator into analysis results.
+
+        Args:
+            state: Accumulator from new_state
+
+        Returns:
+            Dictionary containing analysis results
+        """
+        pass
@@ -0,0 +1,223 @@
+"""Corpus-level TF-IDF model for keyword scoring."""
+
+from typing import Dict, List, Iterable, Optional, Sequence, Tuple, Union
+from pathlib import Path
+from collections import Counter
+import json
+import logging
+import numpy as np
+from scipy import sparse
+
+logger = logging.getLogger(__name__)
+
+
+class CorpusTfidfModel:
+    """Document frequencies over the whole presentation library.
+
+    The model keeps a term vocabulary and a document-frequency vector. It is
+    built from sparse document-term matrices, can be updated incrementally as
+    new presentations arrive, and scores a document with vectorized lookups.
+    """
+
+    def __init__(self):
+        """Initialize an empty model."""
+        self.vocabulary: Dict[str, int] = {}
+        self.doc_freq = np.zeros(0, dtype=np.int64)
+        self.document_ids: List[str] = []
+        self._known_ids = set()
+        self.n_docs = 0
+
+    def __len__(self) -> int:
+        return self.n_docs
+
+    def contains_document(self, document_id: str) -> bool:
+        """Check whether a document has already been counted.
+
+        Args:
+            document_id: Document identifier
+
+        Returns:
+            True if the document contributed to the document frequencies
+        """
+        return document_id in self._known_ids
+
+    def add_documents(self, documents: Sequence[Sequence[str]],
+                      document_ids: Optional[Sequence[str]] = None) -> int:
+        """Add documents to the corpus statistics.
+
+        Args:
+            documents: Term lists, one per document
+            document_ids: Optional identifiers; already-counted ids are skipped
+
+        Returns:
+            Number of documents added
+        """
+        if document_ids is not None:
+            pairs = [(terms, doc_id) for terms, doc_id in zip(documents, document_ids)
+                     if doc_id not in self._known_ids]
+            documents = [terms for terms, _ in pairs]
+            new_ids = [doc_id for _, doc_id in pairs]
+        else:
+            new_ids = []
+
+        if not documents:
+            return 0
+
+        matrix = self._count_matrix(documents, grow=True)
+
+        # Binary occurrence per document, summed per term
+        matrix.data = np.ones_like(matrix.data)
+        self.doc_freq += np.asarray(matrix.sum(axis=0), dtype=np.int64).ravel()
+        self.n_docs += len(documents)
+
+        self.document_ids.extend(new_ids)
+        self._known_ids.update(new_ids)
+
+        return len(documents)
+
+    def idf(self) -> np.ndarray:
+        """Get inverse document frequencies for the vocabulary.
+
+        Returns:
+            IDF vector aligned with the vocabulary
+        """
+        return np.log((self.n_docs + 1) / (self.doc_freq + 1))
+
+    def transform(self, documents: Sequence[Sequence[str]]) -> sparse.csr_matrix:
+        """Compute TF-IDF vectors for documents (out-of-vocabulary terms are dropped).
+
+        Args:
+            documents: Term lists, one per document
+
+        Returns:
+            Sparse matrix of shape (n_documents, vocabulary_size)
+        """
+        counts = self._count_matrix(documents, grow=False).astype(np.float64)
+        totals = np.asarray(counts.sum(axis=1)).ravel()
+        totals[totals == 0] = 1.0
+
+        tf = sparse.diags(1.0 / totals) @ counts
+        return (tf @ sparse.diags(self.idf())).tocsr()
+
+    def top_keywords(self, terms: Sequence[str], top_k: int = 20) -> List[Tuple[str, float]]:
+        """Score one document's terms against the corpus.
+
+        Args:
+            terms: Candidate terms of the document (with repeats)
+            top_k: Number of keywords to return
+
+        Returns:
+            List of (keyword, score) tuples
+        """
+        return self.top_keywords_from_counts(Counter(terms), top_k)
+
+    def top_keywords_from_counts(self, counts: Dict[str, int], top_k: int = 20) -> List[Tuple[str, float]]:
+        """Score one document's term counts against the corpus.
+
+        Terms never seen in the corpus are scored with a document frequency of 0.
+
+        Args:
+            counts: Term frequencies of the document
+            top_k: Number of keywords to return
+
+        Returns:
+            List of (keyword, score) tuples
+        """
+        if not counts:
+            return []
+
+        unique_terms = list(counts)
+        term_counts = np.fromiter(counts.values(), dtype=np.float64, count=len(unique_terms))
+        indices = np.fromiter((self.vocabulary.get(t, -1) for t in unique_terms),
+                              dtype=np.int64, count=len(unique_terms))
+
+        doc_freq = np.zeros(len(unique_terms), dtype=np.int64)
+        known = indices >= 0
+        doc_freq[known] = self.doc_freq[indices[known]]
+
+        scores = (term_counts / term_counts.sum()) * np.log((self.n_docs + 1) / (doc_freq + 1))
+
+        k = min(top_k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind='stable')]
+
+        return [(unique_terms[i], round(float(scores[i]), 4)) for i in top]
+
+    def save(self, path: Union[str, Path]):
+        """Persist the model as <path>.npz (frequencies) and <path>.json (vocabulary).
+
+        Args:
+            path: Base path without extension
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        np.savez(path.with_suffix('.npz'), doc_freq=self.doc_freq, n_docs=self.n_docs)
+        with open(path.with_suffix('.json'), 'w') as f:
+            json.dump({
+                'terms': sorted(self.vocabulary, key=self.vocabulary.get),
+                'document_ids': self.document_ids
+            }, f)
+
+        logger.info(f"Saved TF-IDF model ({self.n_docs} documents, {len(self.vocabulary)} terms) to {path}")
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'CorpusTfidfModel':
+        """Load a model saved with save().
+
+        Args:
+            path: Base path without extension
+
+        Returns:
+            Loaded model
+        """
+        path = Path(path)
+        model = cls()
+
+        arrays = np.load(path.with_suffix('.npz'))
+        model.doc_freq = arrays['doc_freq'].astype(np.int64)
+        model.n_docs = int(arrays['n_docs'])
+
+        with open(path.with_suffix('.json')) as f:
+            sidecar = json.load(f)
+        model.vocabulary = {term: i for i, term in enumerate(sidecar['terms'])}
+        model.document_ids = sidecar['document_ids']
+        model._known_ids = set(model.document_ids)
+
+        return model
+
+    def _count_matrix(self, documents: Iterable[Sequence[str]], grow: bool) -> sparse.csr_matrix:
+        """Build a sparse document-term count matrix.
+
+        Args:
+            documents: Term lists, one per document
+            grow: Add unseen terms to the vocabulary instead of dropping them
+
+        Returns:
+            Sparse count matrix of shape (n_documents, vocabulary_size)
+        """
+        rows, cols = [], []
+        n_rows = 0
+
+        for row, terms in enumerate(documents):
+            n_rows += 1
+            for term in terms:
+                col = self.vocabulary.get(term)
+                if col is None:
+                    if not grow:
+                        continue
+                    col = self.vocabulary[term] = len(self.vocabulary)
+                rows.append(row)
+                cols.append(col)
+
+        if len(self.vocabulary) > len(self.doc_freq):
+            self.doc_freq = np.concatenate([
+                self.doc_freq,
+                np.zeros(len(self.vocabulary) - len(self.doc_freq), dtype=np.int64)
+            ])
+
+        # Duplicate (row, col) entries are summed into counts
+        return sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int64), (rows, cols)),
+            shape=(n_rows, len(self.vocabulary))
+        )
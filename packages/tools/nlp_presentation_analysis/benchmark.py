@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks for analysis hot paths."""
+
+import click
+import os
+import re
+import time
+import unicodedata
+from collections import Counter
+from typing import Callable, List, Optional
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from test_analyzers import SAMPLE_TEXT
+
+
+def load_transcript(transcript_file: Optional[str], repeat: int) -> str:
+    """Load a transcript from disk, or build a long one from the sample text.
+
+    Args:
+        transcript_file: Path to a transcript text file
+        repeat: Number of times to repeat the text
+
+    Returns:
+        Benchmark text
+    """
+    text = Path(transcript_file).read_text() if transcript_file else SAMPLE_TEXT
+    return '\n'.join([text] * repeat)
+
+
+def time_call(func: Callable, rounds: int) -> float:
+    """Return the best wall-clock time of several calls.
+
+    Args:
+        func: Zero-argument callable
+        rounds: Number of timed calls
+
+    Returns:
+        Best time in seconds
+    """
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def legacy_pos_patterns(doc, patterns: List[List[str]], top_k: int) -> List[str]:
+    """Reference implementation: every position times every pattern."""
+    keywords = Counter()
+
+    for sent in doc.sents:
+        tokens = [token for token in sent if not token.is_punct]
+
+        for i in range(len(tokens)):
+            for pattern in patterns:
+                if i + len(pattern) <= len(tokens):
+                    if all(tokens[i+j].pos_ == pattern[j] for j in range(len(pattern))):
+                        phrase = ' '.join(tokens[i+j].text for j in range(len(pattern)))
+                        if not all(tokens[i+j].is_stop for j in range(len(pattern))):
+                            keywords[phrase.lower()] += 1
+
+    return [phrase for phrase, _ in keywords.most_common(top_k)]
+
+
+def legacy_clean_text(text: str) -> str:
+    """Reference implementation: per-character category lookup and regex passes.
+
+    Same semantics as clean_text: NFKC, control characters other than
+    whitespace removed, all whitespace runs collapsed to one space.
+    """
+    text = unicodedata.normalize('NFKC', text)
+    text = ''.join(char for char in text if unicodedata.category(char)[0] != 'C' or char.isspace())
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+LEGACY_MEDICAL_PATTERNS = {
+    r'\bvit\.?\s*d\b': 'vitamin D',
+    r'\bvit\.?\s*b12\b': 'vitamin B12',
+    r'\bvit\.?\s*c\b': 'vitamin C',
+    r'\bmg\b': 'milligrams',
+    r'\bml\b': 'milliliters',
+    r'\bdr\.?\b': 'doctor',
+    r'\bmeds?\b': 'medications',
+    r'\bpt\b': 'patient',
+    r'\bhx\b': 'history',
+    r'\bdx\b': 'diagnosis',
+    r'\btx\b': 'treatment',
+    r'\brx\b': 'prescription'
+}
+
+
+def legacy_normalize_medical_terms(text: str) -> str:
+    """Reference implementation: one regex pass per replacement."""
+    for pattern, replacement in LEGACY_MEDICAL_PATTERNS.items():
+        text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
+    return text
+
+
+@click.group()
+def benchmark():
+    """Run micro-benchmarks."""
+
+
+@benchmark.command('pos-patterns')
+@click.option('--transcript-file', type=click.Path(exists=True, dir_okay=False),
+              help='Transcript to benchmark on (defaults to the repeated sample text)')
+@click.option('--repeat', default=200, help='Number of times to repeat the transcript')
+@click.option('--rounds', default=3, help='Timed rounds per implementation')
+def pos_patterns(transcript_file: Optional[str], repeat: int, rounds: int):
+    """Compare the compiled POS matcher with the per-position loop."""
+    from analyzers import KeywordExtractor
+
+    extractor = KeywordExtractor()
+    text = load_transcript(transcript_file, repeat)
+    extractor.nlp.max_length = max(extractor.nlp.max_length, len(text) + 1)
+    doc = extractor.parse(text)
+
+    click.echo(f"Transcript: {len(text):,} characters, {len(doc):,} tokens")
+
+    legacy = time_call(lambda: legacy_pos_patterns(doc, extractor.POS_PATTERNS, 20), rounds)
+    matcher = time_call(lambda: extractor._count_pos_patterns(doc).most_common(20), rounds)
+
+    click.echo(f"  legacy loop:      {legacy:8.3f}s  {len(doc) / legacy:12,.0f} tokens/s")
+    click.echo(f"  compiled matcher: {matcher:8.3f}s  {len(doc) / matcher:12,.0f} tokens/s")
+    click.echo(f"  speedup:          {legacy / matcher:8.1f}x")
+
+
+
+@benchmark.command('clean-text')
+@click.option('--transcript-file', type=click.Path(exists=True, dir_okay=False),
+              help='Transcript to benchmark on (defaults to the repeated sample text)')
+@click.option('--repeat', default=200, help='Number of times to repeat the transcript')
+@click.option('--rounds', default=3, help='Timed rounds per implementation')
+def clean_text_benchmark(transcript_file: Optional[str], repeat: int, rounds: int):
+    """Compare the compiled cleaning pipeline with the per-pass versions."""
+    from utils import clean_text, normalize_medical_terms
+
+    text = load_transcript(transcript_file, repeat)
+
+    click.echo(f"Transcript: {len(text):,} characters")
+
+    for name, legacy, compiled in [
+        ('clean_text', lambda: legacy_clean_text(text), lambda: clean_text(text)),
+        ('normalize_medical_terms',
+         lambda: legacy_normalize_medical_terms(text),
+         lambda: normalize_medical_terms(text))
+    ]:
+        # A speedup only means something if both do the same work
+        if legacy() != compiled():
+            raise click.ClickException(f"{name}: legacy and compiled outputs differ on this transcript")
+        legacy_time = time_call(legacy, rounds)
+        compiled_time = time_call(compiled, rounds)
+        click.echo(f"  {name}:")
+        click.echo(f"    legacy:   {legacy_time:8.3f}s  {len(text) / legacy_time / 1e6:8.1f} MB/s")
+        click.echo(f"    compiled: {compiled_time:8.3f}s  {len(text) / compiled_time / 1e6:8.1f} MB/s")
+        click.echo(f"    speedup:  {legacy_time / compiled_time:8.1f}x")
+
+
+@benchmark.command('worker-scaling')
+@click.option('--transcript-file', type=click.Path(exists=True, dir_okay=False),
+              help='Transcript to benchmark on (defaults to the repeated sample text)')
+@click.option('--repeat', default=20, help='Number of times to repeat the transcript per document')
+@click.option('--documents', default=48, help='Documents analyzed per worker count')
+@click.option('--max-workers', default=0, help='Largest worker count to try (0 for all cores)')
+@click.option('--embeddings', is_flag=True, help='Also generate an embedding per document')
+def worker_scaling(transcript_file: Optional[str], repeat: int, documents: int,
+                   max_workers: int, embeddings: bool):
+    """Measure analysis throughput with 1..N forked worker processes."""
+    from analyzers import (AnalyzerProcessPool, EntityExtractor, KeywordExtractor,
+                           EmbeddingGenerator, load_spacy_model, required_components)
+    from utils import iter_text_windows
+
+    load_spacy_model('en_core_web_sm', required_components([EntityExtractor, KeywordExtractor]))
+    analyzers = [EntityExtractor(), KeywordExtractor()]
+    embedding_generator = EmbeddingGenerator() if embeddings else None
+    if embedding_generator:
+        analyzers.append(embedding_generator)
+
+    text = load_transcript(transcript_file, repeat)
+    max_workers = max_workers if max_workers > 0 else (os.cpu_count() or 1)
+
+    def analyze(doc_index: int) -> int:
+        # Return only the index, so result pickling doesn't skew the timing
+        windows = list(iter_text_windows(text, 5000, overlap=0))
+        for analyzer in analyzers[:2]:
+            analyzer.analyze_windows(windows)
+        if embedding_generator:
+            embedding_generator.generate_presentation_embedding(title='', summary='', transcript=text)
+        return doc_index
+
+    click.echo(f"{documents} documents of {len(text):,} characters, up to {max_workers} workers")
+
+    baseline = None
+    for workers in range(1, max_workers + 1):
+        pool = AnalyzerProcessPool(analyzers, workers=workers)
+        list(pool.map(analyze, range(documents), ordered=False))
+        rate = pool.stats()['items_per_sec']
+        baseline = baseline or rate
+        click.echo(f"  {workers:3d} workers: {rate:8.2f} docs/s  speedup {rate / baseline:5.2f}x  "
+                   f"efficiency {rate / baseline / workers:6.1%}")
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Build the chunk search index used by search_presentations.py."""
+
+import click
+import logging
+from typing import Optional
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from analyzers import EmbeddingGenerator, SearchIndexWriter
+from db import PresentationQueries
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+@click.command()
+@click.option('--index-path', default='data/search_index', help='Index directory')
+@click.option('--model-type', default='general', help='Model type: general, medical, similarity')
+@click.option('--embedding-backend', default='torch', type=click.Choice(EmbeddingGenerator.BACKENDS),
+              help='Embedding inference backend (onnx needs export_embedding_model.py first)')
+@click.option('--onnx-model-dir', type=click.Path(file_okay=False),
+              help='Exported ONNX model directory (defaults to the export location)')
+@click.option('--quantization', help='Load the int8 ONNX model quantized for this preset, e.g. avx512_vnni')
+@click.option('--chunk-size', default=512, help='Chunk size in characters')
+@click.option('--overlap', default=128, help='Overlap between chunks in characters')
+@click.option('--batch-size', default=64, help='Chunks encoded per model call')
+@click.option('--page-size', default=50, help='Presentations fetched per request')
+@click.option('--limit', type=int, help='Index at most this many presentations')
+def build_search_index(index_path: str, model_type: str, embedding_backend: str, onnx_model_dir: Optional[str],
+                       quantization: Optional[str], chunk_size: int, overlap: int, batch_size: int,
+                       page_size: int, limit: Optional[int]):
+    """Chunk, embed and BM25-index every transcript."""
+
+    queries = PresentationQueries()
+    embedding_generator = EmbeddingGenerator(model_type=model_type, backend=embedding_backend,
+                                             onnx_model_dir=onnx_model_dir, quantization=quantization)
+
+    writer = SearchIndexWriter(index_path, embedding_generator, chunk_size=chunk_size,
+                               overlap=overlap, batch_size=batch_size)
+
+    for count, pres in enumerate(queries.iter_presentations(limit=limit, page_size=page_size,
+                                                            columns='id, title, transcript_text'), start=1):
+        writer.add_presentation(pres['id'], pres.get('title'), pres.get('transcript_text') or '')
+        if count % 100 == 0:
+            logger.info(f"  - {count} presentations, {len(writer)} chunks")
+
+    writer.close()
+
+
+if __name__ == '__main__':
+    build_search_index()
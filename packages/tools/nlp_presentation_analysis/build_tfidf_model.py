@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Build or update the corpus TF-IDF model used for keyword scoring."""
+
+import click
+import logging
+from itertools import islice
+from typing import Optional
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from analyzers import KeywordExtractor, CorpusTfidfModel, DocCache
+from db import PresentationQueries
+from models import Presentation
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+@click.command()
+@click.option('--model-path', default='data/tfidf_model', help='Base path of the TF-IDF model files')
+@click.option('--rebuild', is_flag=True, help='Ignore an existing model and rebuild from scratch')
+@click.option('--batch-size', default=50, help='Number of presentations parsed per batch')
+@click.option('--window-size', default=5000, help='Characters per analysis window')
+@click.option('--doc-cache-dir', type=click.Path(file_okay=False), help='Reuse cached spaCy Docs')
+def build_tfidf_model(model_path: str, rebuild: bool, batch_size: int, window_size: int,
+                      doc_cache_dir: Optional[str]):
+    """Count document frequencies over all presentations."""
+
+    queries = PresentationQueries()
+
+    if not rebuild and Path(model_path).with_suffix('.json').exists():
+        model = CorpusTfidfModel.load(model_path)
+        logger.info(f"Updating existing model with {len(model)} documents")
+    else:
+        model = CorpusTfidfModel()
+
+    keyword_extractor = KeywordExtractor(doc_cache=DocCache(doc_cache_dir) if doc_cache_dir else None)
+
+    # Page through the corpus by keyset; only the current batch is held in memory
+    presentations = queries.iter_presentations(page_size=batch_size, columns='id, title, summary, transcript_text')
+    new_presentations = (Presentation(**p) for p in presentations if not model.contains_document(p['id']))
+    added = 0
+
+    while True:
+        batch = list(islice(new_presentations, batch_size))
+        if not batch:
+            break
+
+        # Stream whole transcripts in windows; document frequency only needs distinct terms
+        windows = [(j, text) for j, pres in enumerate(batch) for _, text in pres.iter_analysis_windows(window_size)]
+        docs = keyword_extractor.parse_many([text for _, text in windows], batch_size=batch_size)
+
+        terms = [set() for _ in batch]
+        for (j, _), doc in zip(windows, docs):
+            terms[j].update(keyword_extractor.candidate_terms(doc))
+
+        model.add_documents([list(t) for t in terms], [pres.id for pres in batch])
+        added += len(batch)
+        logger.info(f"  - {added} new presentations added")
+
+    logger.info(f"Added {added} new presentations to the corpus ({len(model)} documents)")
+    model.save(model_path)
+
+
+if __name__ == '__main__':
+    build_tfidf_model()
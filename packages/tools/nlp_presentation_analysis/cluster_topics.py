@@ -4,8 +4,9 @@
 import click
 import logging
 import numpy as np
-from sklearn.cluster import KMeans
-from typing import List, Dict, Any
+import pandas as pd
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Set
 import sys
 from pathlib import Path
 
@@ -13,6 +14,10 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from db import PresentationQueries
 from models import TopicCluster
+from clustering import (CentroidModel, NOISE, METHODS, get_engine, centroid_confidence,
+                        member_statistics, partial_update, assignment_drift)
+from utils.embedding_snapshot import EmbeddingSnapshot
+from utils.similarity import to_vector
 
 logging.basicConfig(
     level=logging.INFO,
@@ -21,111 +26,364 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def aggregate_cluster_keywords(queries: PresentationQueries, clusters: Dict[int, List[str]],
+                               top_n: int = 10) -> Dict[int, List[str]]:
+    """Aggregate the top keywords of every cluster from one bulk keyword fetch.
+
+    Args:
+        queries: Database queries
+        clusters: Presentation IDs per cluster label
+        top_n: Number of keywords per cluster
+
+    Returns:
+        Keywords per cluster label, ordered by summed score
+
+    Raises:
+        Exception: If the keywords cannot be fetched
+    """
+    cluster_of = {pid: label for label, pids in clusters.items() for pid in pids}
+    keywords = pd.DataFrame(
+        queries.get_keywords_for_presentations(list(cluster_of)),
+        columns=['presentation_id', 'keyword', 'score']
+    )
+    result = {label: [] for label in clusters}
+
+    if keywords.empty:
+        return result
+
+    keywords['cluster'] = keywords['presentation_id'].map(cluster_of)
+    keywords['score'] = keywords['score'].astype(float)
+
+    # Sum scores per (cluster, keyword), then keep the best top_n per cluster
+    totals = keywords.groupby(['cluster', 'keyword'], sort=False)['score'].sum().reset_index()
+    totals = totals.sort_values(['cluster', 'score'], ascending=[True, False], kind='stable')
+    top = totals.groupby('cluster', sort=False).head(top_n)
+
+    for label, group in top.groupby('cluster', sort=False):
+        result[label] = group['keyword'].tolist()
+
+    return result
+
+
+def cluster_metadata(model: CentroidModel, label: int, method: str,
+                     fit_baseline: float, fitted_at: str,
+                     added_since_fit: int = 0, added_distance_sum: float = 0.0,
+                     unassigned_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Build the metadata stored with a topic cluster.
+
+    The member count and mean distance let later runs continue mini-batch
+    updates; the fit baseline and added-distance totals measure drift since
+    the last full clustering. unassigned_ids holds presentations the fit
+    covered but left out of every saved cluster (outliers and members of
+    undersized clusters); it is stored on one cluster only.
+    """
+    return {
+        'size': int(model.counts[label]),
+        'method': method,
+        'cluster_id': int(label),
+        'mean_distance': float(model.mean_distances[label]),
+        'fit_baseline_distance': fit_baseline,
+        'fitted_at': fitted_at,
+        'added_since_fit': int(added_since_fit),
+        'added_distance_sum': float(added_distance_sum),
+        'unassigned_ids': list(unassigned_ids or []),
+        'updated_at': datetime.utcnow().isoformat()
+    }
+
+
+def covered_presentation_ids(clusters: List[Dict[str, Any]]) -> Set[str]:
+    """Presentations the saved clustering has already seen.
+
+    Args:
+        clusters: topic_clusters rows
+
+    Returns:
+        Cluster members plus the ones the last full fit left unassigned
+    """
+    covered = set()
+    for cluster in clusters:
+        covered.update(cluster['presentation_ids'] or [])
+        covered.update((cluster.get('metadata') or {}).get('unassigned_ids', []))
+    return covered
+
+
+def load_centroid_model(clusters: List[Dict[str, Any]]) -> CentroidModel:
+    """Rebuild the centroid model from saved topic clusters.
+
+    Args:
+        clusters: topic_clusters rows, in label order
+
+    Returns:
+        Centroid model
+    """
+    return CentroidModel(
+        centroids=np.vstack([to_vector(c['centroid_embedding']) for c in clusters]),
+        counts=np.array([(c.get('metadata') or {}).get('size', len(c['presentation_ids'] or []))
+                         for c in clusters], dtype=np.int64),
+        mean_distances=np.array([(c.get('metadata') or {}).get('mean_distance', 0.0)
+                                 for c in clusters], dtype=np.float32)
+    )
+
+
+def delete_topic_clusters(queries: PresentationQueries, cluster_ids: List[str]):
+    """Delete topic clusters by id (their presentation_topics rows cascade)."""
+    if cluster_ids:
+        queries.db.client.table('topic_clusters').delete().in_('id', cluster_ids).execute()
+
+
+def full_recluster(
+    queries: PresentationQueries,
+    presentation_ids: List[str],
+    embeddings: np.ndarray,
+    n_clusters: int,
+    min_cluster_size: int,
+    method: str,
+    batch_size: int,
+    n_neighbors: int,
+    existing_clusters: List[Dict[str, Any]]
+):
+    """Cluster every embedding from scratch and replace the saved clusters."""
+    logger.info(f"Clustering {len(embeddings)} presentations with {method}")
+
+    # Perform clustering
+    try:
+        engine = get_engine(method, n_clusters=n_clusters, min_cluster_size=min_cluster_size,
+                            batch_size=batch_size, n_neighbors=n_neighbors)
+    except ValueError as e:
+        logger.error(str(e))
+        return
+
+    result = engine.fit(embeddings)
+    members = result.labels != NOISE
+    if not members.all():
+        logger.info(f"{int((~members).sum())} presentations left unassigned as outliers")
+
+    model = member_statistics(embeddings[members], result.labels[members], result.centroids)
+    fit_baseline = model.baseline_distance()
+    fitted_at = datetime.utcnow().isoformat()
+
+    # Group presentations by cluster
+    clusters = {}
+    confidence = {}
+    for i in np.flatnonzero(members):
+        label = int(result.labels[i])
+        clusters.setdefault(label, []).append(presentation_ids[i])
+        confidence[presentation_ids[i]] = round(float(result.confidence[i]), 4)
+
+    saved = {label: ids for label, ids in clusters.items() if len(ids) >= min_cluster_size}
+    for label, member_ids in clusters.items():
+        if label not in saved:
+            logger.warning(f"Cluster {label} has only {len(member_ids)} presentations")
+
+    saved_ids = {pid for ids in saved.values() for pid in ids}
+    unassigned_ids = [pid for pid in presentation_ids if pid not in saved_ids]
+
+    # Get top keywords for each cluster; without them the clusters would be saved unnamed
+    try:
+        cluster_keywords = aggregate_cluster_keywords(queries, saved)
+    except Exception as e:
+        logger.error(f"Error fetching cluster keywords; keeping the previous clustering: {e}")
+        return
+
+    # Save clusters to database
+    logger.info("Saving topic clusters to database...")
+
+    labels = sorted(saved)
+    cluster_records = []
+    for label in labels:
+        keywords = cluster_keywords[label]
+        cluster_records.append({
+            # Generate cluster name from top keywords
+            'cluster_name': ' / '.join(keywords[:3]),
+            'cluster_keywords': keywords,
+            'presentation_ids': saved[label],
+            'centroid_embedding': model.centroids[label].tolist(),
+            'metadata': cluster_metadata(model, label, method, fit_baseline, fitted_at,
+                                         unassigned_ids=unassigned_ids if label == labels[0] else None)
+        })
+
+    old_ids = [c['id'] for c in existing_clusters]
+
+    if not cluster_records:
+        delete_topic_clusters(queries, old_ids)
+        return
+
+    # Insert the new clusters before dropping the old ones (rows come back in
+    # insert order), so a failed save leaves the previous clustering in place
+    inserted = queries.db.batch_insert('topic_clusters', cluster_records)
+    cluster_uuids = {label: row['id'] for label, row in zip(labels, inserted)}
+
+    # Create presentation-topic assignments
+    saved_topics = queries.save_presentation_topics([
+        {
+            'presentation_id': pres_id,
+            'cluster_id': cluster_uuids[label],
+            'confidence_score': confidence[pres_id]
+        }
+        for label in labels
+        for pres_id in saved[label]
+    ])
+    if not saved_topics:
+        logger.error("Saving topic assignments failed; keeping the previous clustering")
+        delete_topic_clusters(queries, list(cluster_uuids.values()))
+        return
+
+    # Replace the previous clustering (assignments cascade)
+    delete_topic_clusters(queries, old_ids)
+
+    for label, record in zip(labels, cluster_records):
+        logger.info(f"Created cluster: {record['cluster_name']} ({len(saved[label])} presentations)")
+
+
+def incremental_update(
+    queries: PresentationQueries,
+    presentation_ids: List[str],
+    embeddings: np.ndarray,
+    existing_clusters: List[Dict[str, Any]],
+    batch_size: int
+) -> Optional[float]:
+    """Assign new presentations to saved clusters and move their centroids.
+
+    Returns:
+        Drift since the last full clustering, or None if there was nothing new
+
+    Raises:
+        Exception: If cluster keywords cannot be fetched (nothing is written)
+    """
+    covered = covered_presentation_ids(existing_clusters)
+    new_rows = [i for i, pid in enumerate(presentation_ids) if pid not in covered]
+
+    if not new_rows:
+        logger.info("No new presentations to assign")
+        return None
+
+    logger.info(f"Assigning {len(new_rows)} new presentations to {len(existing_clusters)} topics")
+
+    model = load_centroid_model(existing_clusters)
+    labels, distances = partial_update(model, embeddings[new_rows], batch_size=batch_size)
+    confidence = centroid_confidence(embeddings[new_rows], model.centroids, labels)
+
+    # Drift over everything added since the last full clustering
+    metadata = [c.get('metadata') or {} for c in existing_clusters]
+    fit_baseline = next((m['fit_baseline_distance'] for m in metadata if 'fit_baseline_distance' in m),
+                        None)
+    added = np.array([m.get('added_since_fit', 0) for m in metadata], dtype=np.int64)
+    added_distance = np.array([m.get('added_distance_sum', 0.0) for m in metadata], dtype=np.float64)
+    added += np.bincount(labels, minlength=len(existing_clusters))
+    added_distance += np.bincount(labels, weights=distances, minlength=len(existing_clusters))
+
+    if fit_baseline is None:
+        fit_baseline = model.baseline_distance()
+    drift = assignment_drift(fit_baseline, np.array([added_distance.sum() / max(added.sum(), 1)]))
+
+    touched = {
+        int(label): [presentation_ids[new_rows[i]] for i in np.flatnonzero(labels == label)]
+        for label in np.unique(labels)
+    }
+    new_confidence = {presentation_ids[row]: round(float(c), 4) for row, c in zip(new_rows, confidence)}
+    members = {label: (existing_clusters[label]['presentation_ids'] or []) + new_ids
+               for label, new_ids in touched.items()}
+    cluster_keywords = aggregate_cluster_keywords(queries, members)
+
+    updates = []
+    assignments = []
+    for label, new_ids in touched.items():
+        cluster = existing_clusters[label]
+        keywords = cluster_keywords[label]
+
+        updates.append({
+            'id': cluster['id'],
+            'cluster_name': ' / '.join(keywords[:3]),
+            'cluster_keywords': keywords,
+            'presentation_ids': members[label],
+            'centroid_embedding': model.centroids[label].tolist(),
+            'metadata': cluster_metadata(
+                model, label,
+                metadata[label].get('method', 'kmeans'),
+                fit_baseline,
+                metadata[label].get('fitted_at'),
+                added[label],
+                added_distance[label],
+                metadata[label].get('unassigned_ids')
+            )
+        })
+        assignments.extend({
+            'presentation_id': pres_id,
+            'cluster_id': cluster['id'],
+            'confidence_score': new_confidence[pres_id]
+        } for pres_id in new_ids)
+
+        logger.info(f"Updated cluster: {cluster['cluster_name']} (+{len(new_ids)} presentations)")
+
+    queries.db.batch_upsert('topic_clusters', updates, on_conflict='id')
+    queries.save_presentation_topics(assignments)
+
+    return drift
+
+
 @click.command()
 @click.option('--n-clusters', default=10, help='Number of topic clusters')
 @click.option('--min-cluster-size', default=3, help='Minimum presentations per cluster')
-@click.option('--method', default='kmeans', help='Clustering method (kmeans)')
-def cluster_topics(n_clusters: int, min_cluster_size: int, method: str):
+@click.option('--method', default='kmeans', type=click.Choice(METHODS),
+              help='Clustering engine (hdbscan discovers the number of topics)')
+@click.option('--n-neighbors', default=15, help='kNN graph degree for agglomerative clustering')
+@click.option('--incremental', is_flag=True,
+              help='Assign new presentations to the saved clusters instead of re-clustering')
+@click.option('--drift-threshold', default=0.25,
+              help='Re-cluster when new presentations sit this much further from centroids than at fit time')
+@click.option('--batch-size', default=256, help='Mini-batch size for centroid updates')
+@click.option('--snapshot', 'snapshot_path', help='Sync and read embeddings from this local snapshot '
+                                                  '(see snapshot_embeddings.py)')
+def cluster_topics(n_clusters: int, min_cluster_size: int, method: str, n_neighbors: int,
+                   incremental: bool, drift_threshold: float, batch_size: int,
+                   snapshot_path: Optional[str]):
     """Cluster presentations into topics based on embeddings."""
-    
+
     queries = PresentationQueries()
-    
+
     # Get all embeddings
     logger.info("Loading presentation embeddings...")
-    embeddings_data = queries.get_presentation_embeddings()
-    
-    if len(embeddings_data) < n_clusters:
-        logger.error(f"Not enough embeddings ({len(embeddings_data)}) for {n_clusters} clusters")
-        return
-        
-    # Extract embeddings and IDs
-    presentation_ids = [e['presentation_id'] for e in embeddings_data]
-    embeddings = np.array([e['embedding'] for e in embeddings_data])
-    
-    logger.info(f"Clustering {len(embeddings)} presentations into {n_clusters} topics")
-    
-    # Perform clustering
-    if method == 'kmeans':
-        clusterer = KMeans(n_clusters=n_clusters, random_state=42)
-        cluster_labels = clusterer.fit_predict(embeddings)
-        centroids = clusterer.cluster_centers_
+    if snapshot_path:
+        snapshot = EmbeddingSnapshot(snapshot_path)
+        try:
+            snapshot.sync(queries)
+        except Exception as e:
+            logger.error(f"Error syncing embedding snapshot: {e}")
+            return
+        presentation_ids, embeddings = snapshot.presentation_ids, snapshot.embeddings
     else:
-        logger.error(f"Unknown clustering method: {method}")
+        try:
+            presentation_ids, _, embeddings = queries.get_embedding_matrix()
+        except Exception as e:
+            logger.error(f"Error loading embedding matrix: {e}")
+            return
+
+    if len(presentation_ids) < n_clusters:
+        logger.error(f"Not enough embeddings ({len(presentation_ids)}) for {n_clusters} clusters")
         return
-        
-    # Get keywords for each cluster
-    clusters = {}
-    for i, label in enumerate(cluster_labels):
-        if label not in clusters:
-            clusters[label] = {
-                'presentation_ids': [],
-                'centroid': centroids[label]
-            }
-        clusters[label]['presentation_ids'].append(presentation_ids[i])
-        
-    # Get top keywords for each cluster
-    for cluster_id, cluster_data in clusters.items():
-        if len(cluster_data['presentation_ids']) < min_cluster_size:
-            logger.warning(f"Cluster {cluster_id} has only {len(cluster_data['presentation_ids'])} presentations")
-            continue
-            
-        # Get keywords from presentations in this cluster
-        cluster_keywords = []
-        for pres_id in cluster_data['presentation_ids']:
-            keywords = queries.db.select(
-                'presentation_keywords',
-                columns='keyword, score',
-                filters={'presentation_id': pres_id}
-            )
-            cluster_keywords.extend([(k['keyword'], k['score']) for k in keywords])
-            
-        # Aggregate and sort keywords
-        keyword_scores = {}
-        for keyword, score in cluster_keywords:
-            if keyword not in keyword_scores:
-                keyword_scores[keyword] = 0
-            keyword_scores[keyword] += score
-            
-        # Get top keywords
-        top_keywords = sorted(keyword_scores.items(), key=lambda x: x[1], reverse=True)[:10]
-        cluster_data['keywords'] = [kw[0] for kw in top_keywords]
-        
-        # Generate cluster name from top keywords
-        cluster_data['name'] = ' / '.join(cluster_data['keywords'][:3])
-        
-    # Save clusters to database
-    logger.info("Saving topic clusters to database...")
-    
-    for cluster_id, cluster_data in clusters.items():
-        if len(cluster_data['presentation_ids']) >= min_cluster_size:
-            # Create cluster record
-            cluster_record = {
-                'cluster_name': cluster_data['name'],
-                'cluster_keywords': cluster_data['keywords'],
-                'presentation_ids': cluster_data['presentation_ids'],
-                'centroid_embedding': cluster_data['centroid'].tolist(),
-                'metadata': {
-                    'size': len(cluster_data['presentation_ids']),
-                    'method': method,
-                    'cluster_id': int(cluster_id)
-                }
-            }
-            
-            # Insert cluster
-            result = queries.db.insert('topic_clusters', cluster_record)
-            cluster_uuid = result['id']
-            
-            # Create presentation-topic assignments
-            for pres_id in cluster_data['presentation_ids']:
-                assignment = {
-                    'presentation_id': pres_id,
-                    'cluster_id': cluster_uuid,
-                    'confidence_score': 1.0  # Could calculate distance to centroid
-                }
-                queries.db.insert('presentation_topics', assignment)
-                
-            logger.info(f"Created cluster: {cluster_data['name']} ({len(cluster_data['presentation_ids'])} presentations)")
-            
+
+    existing_clusters = queries.get_topic_clusters()
+
+    if incremental and existing_clusters:
+        try:
+            drift = incremental_update(queries, presentation_ids, embeddings, existing_clusters, batch_size)
+        except Exception as e:
+            logger.error(f"Error updating topic clusters; saved clusters left unchanged: {e}")
+            return
+        if drift is None or drift <= drift_threshold:
+            if drift is not None:
+                logger.info(f"Drift {drift:.3f} within threshold {drift_threshold}")
+            logger.info("Topic clustering complete!")
+            return
+
+        logger.info(f"Drift {drift:.3f} exceeds threshold {drift_threshold}; re-clustering")
+        existing_clusters = queries.get_topic_clusters()
+    elif incremental:
+        logger.info("No saved clusters; running a full clustering")
+
+    full_recluster(queries, presentation_ids, embeddings, n_clusters, min_cluster_size,
+                   method, batch_size, n_neighbors, existing_clusters)
+
     logger.info("Topic clustering complete!")
 
 
@@ -0,0 +1,41 @@
+"""Topic clustering utilities for NLP presentation analysis."""
+
+from .incremental import (
+    CentroidModel,
+    assign_to_centroids,
+    member_statistics,
+    partial_update,
+    assignment_drift
+)
+from .engines import (
+    NOISE,
+    METHODS,
+    ClusteringResult,
+    ClusteringEngine,
+    KMeansEngine,
+    HDBSCANEngine,
+    AgglomerativeEngine,
+    get_engine,
+    centroid_confidence,
+    label_centroids,
+    knn_graph
+)
+
+__all__ = [
+    'CentroidModel',
+    'assign_to_centroids',
+    'member_statistics',
+    'partial_update',
+    'assignment_drift',
+    'NOISE',
+    'METHODS',
+    'ClusteringResult',
+    'ClusteringEngine',
+    'KMeansEngine',
+    'HDBSCANEngine',
+    'AgglomerativeEngine',
+    'get_engine',
+    'centroid_confidence',
+    'label_centroids',
+    'knn_graph'
+]
@@ -0,0 +1,250 @@
+"""Pluggable clustering engines with per-assignment confidence."""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Optional
+import numpy as np
+from scipy import sparse
+
+from utils.similarity import normalize_rows, iter_top_k_similar
+
+# Label given to points that belong to no cluster
+NOISE = -1
+
+
+@dataclass
+class ClusteringResult:
+    """Labels, confidences and centroids from one clustering run."""
+    labels: np.ndarray       # (n,) cluster label per row, NOISE for outliers
+    confidence: np.ndarray   # (n,) confidence of each assignment in [0, 1]
+    centroids: np.ndarray    # (k, dim) centroid per label 0..k-1
+
+    @property
+    def n_clusters(self) -> int:
+        return len(self.centroids)
+
+
+def label_centroids(embeddings: np.ndarray, labels: np.ndarray) -> np.ndarray:
+    """Mean embedding of each non-noise label.
+
+    Args:
+        embeddings: Matrix of shape (n, dim)
+        labels: Label per row (NOISE rows are ignored)
+
+    Returns:
+        Matrix of shape (max_label + 1, dim)
+    """
+    members = labels != NOISE
+    k = int(labels[members].max()) + 1 if members.any() else 0
+
+    sums = np.zeros((k, embeddings.shape[1]), dtype=np.float64)
+    np.add.at(sums, labels[members], embeddings[members])
+    counts = np.bincount(labels[members], minlength=k)
+
+    return (sums / np.maximum(counts, 1)[:, None]).astype(np.float32)
+
+
+def centroid_confidence(embeddings: np.ndarray, centroids: np.ndarray, labels: np.ndarray,
+                        block_size: int = 4096) -> np.ndarray:
+    """Confidence from the margin between the assigned and the runner-up centroid.
+
+    confidence = 1 - d_assigned / d_runner_up, so a point on its centroid
+    scores 1 and a point equidistant from two centroids scores 0.
+
+    Args:
+        embeddings: Matrix of shape (n, dim)
+        centroids: Matrix of shape (k, dim)
+        labels: Assigned label per row (NOISE rows score 0)
+        block_size: Rows scored per block
+
+    Returns:
+        Confidence per row
+    """
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    centroids = np.asarray(centroids, dtype=np.float32)
+    confidence = np.zeros(len(embeddings), dtype=np.float32)
+
+    if len(centroids) < 2:
+        confidence[labels != NOISE] = 1.0
+        return confidence
+
+    centroid_sq = (centroids ** 2).sum(axis=1)
+
+    for start in range(0, len(embeddings), block_size):
+        block = embeddings[start:start + block_size]
+        block_labels = labels[start:start + len(block)]
+        rows = np.arange(len(block))
+
+        sq = (block ** 2).sum(axis=1, keepdims=True) - 2 * block @ centroids.T + centroid_sq
+        dist = np.sqrt(np.maximum(sq, 0))
+
+        members = block_labels != NOISE
+        assigned = dist[rows, np.where(members, block_labels, 0)]
+        dist[rows[members], block_labels[members]] = np.inf
+        runner_up = dist.min(axis=1)
+
+        block_conf = np.where(runner_up > 0, 1.0 - assigned / np.maximum(runner_up, 1e-12), 0.0)
+        confidence[start:start + len(block)] = np.where(members, np.clip(block_conf, 0.0, 1.0), 0.0)
+
+    return confidence
+
+
+def knn_graph(embeddings: np.ndarray, n_neighbors: int, block_size: int = 1024) -> sparse.csr_matrix:
+    """Symmetric cosine k-nearest-neighbour connectivity graph.
+
+    Built block by block, so memory is O(n * n_neighbors) rather than O(n^2).
+
+    Args:
+        embeddings: Matrix of shape (n, dim)
+        n_neighbors: Neighbours per row
+        block_size: Rows scored per block
+
+    Returns:
+        Sparse (n, n) adjacency matrix
+    """
+    n = len(embeddings)
+    normalized = normalize_rows(embeddings)
+    rows, cols = [], []
+
+    for start, indices, _ in iter_top_k_similar(normalized, n_neighbors, block_size):
+        rows.append(np.repeat(np.arange(start, start + len(indices)), indices.shape[1]))
+        cols.append(indices.ravel())
+
+    graph = sparse.csr_matrix(
+        (np.ones(sum(len(r) for r in rows), dtype=np.float32), (np.concatenate(rows), np.concatenate(cols))),
+        shape=(n, n)
+    )
+    return graph.maximum(graph.T).tocsr()
+
+
+class ClusteringEngine(ABC):
+    """Cluster an embedding matrix into topics."""
+
+    name = 'base'
+
+    @abstractmethod
+    def fit(self, embeddings: np.ndarray) -> ClusteringResult:
+        """Cluster embeddings.
+
+        Args:
+            embeddings: Matrix of shape (n, dim)
+
+        Returns:
+            Clustering result
+        """
+        pass
+
+
+class KMeansEngine(ClusteringEngine):
+    """K-means (optionally mini-batch) with centroid-margin confidence."""
+
+    name = 'kmeans'
+
+    def __init__(self, n_clusters: int = 10, minibatch: bool = False, batch_size: int = 256):
+        self.n_clusters = n_clusters
+        self.minibatch = minibatch
+        self.batch_size = batch_size
+
+    def fit(self, embeddings: np.ndarray) -> ClusteringResult:
+        from sklearn.cluster import KMeans, MiniBatchKMeans
+
+        if self.minibatch:
+            clusterer = MiniBatchKMeans(n_clusters=self.n_clusters, batch_size=self.batch_size,
+                                        random_state=42, n_init=3)
+        else:
+            clusterer = KMeans(n_clusters=self.n_clusters, random_state=42)
+
+        labels = clusterer.fit_predict(embeddings)
+        centroids = clusterer.cluster_centers_.astype(np.float32)
+
+        return ClusteringResult(
+            labels=labels,
+            confidence=centroid_confidence(embeddings, centroids, labels),
+            centroids=centroids
+        )
+
+
+class HDBSCANEngine(ClusteringEngine):
+    """Density-based clustering; outliers are left unassigned.
+
+    The number of topics is discovered rather than fixed, and confidence is
+    HDBSCAN's membership probability. Embeddings are L2-normalized first,
+    so Euclidean distance ranks neighbours like cosine distance while the
+    tree-based neighbour search avoids a full distance matrix.
+    """
+
+    name = 'hdbscan'
+
+    def __init__(self, min_cluster_size: int = 5, min_samples: Optional[int] = None):
+        self.min_cluster_size = min_cluster_size
+        self.min_samples = min_samples
+
+    def fit(self, embeddings: np.ndarray) -> ClusteringResult:
+        from sklearn.cluster import HDBSCAN
+
+        normalized = normalize_rows(embeddings)
+        clusterer = HDBSCAN(min_cluster_size=self.min_cluster_size, min_samples=self.min_samples)
+        labels = clusterer.fit_predict(normalized)
+
+        return ClusteringResult(
+            labels=labels,
+            confidence=np.where(labels != NOISE, clusterer.probabilities_, 0.0).astype(np.float32),
+            centroids=label_centroids(np.asarray(embeddings, dtype=np.float32), labels)
+        )
+
+
+class AgglomerativeEngine(ClusteringEngine):
+    """Ward agglomerative clustering restricted to a k-nearest-neighbour graph.
+
+    Only merges between graph neighbours are considered, so memory grows
+    with n * n_neighbors instead of n^2.
+    """
+
+    name = 'agglomerative'
+
+    def __init__(self, n_clusters: int = 10, n_neighbors: int = 15):
+        self.n_clusters = n_clusters
+        self.n_neighbors = n_neighbors
+
+    def fit(self, embeddings: np.ndarray) -> ClusteringResult:
+        from sklearn.cluster import AgglomerativeClustering
+
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        connectivity = knn_graph(embeddings, min(self.n_neighbors, len(embeddings) - 1))
+
+        clusterer = AgglomerativeClustering(n_clusters=self.n_clusters, connectivity=connectivity,
+                                            linkage='ward')
+        labels = clusterer.fit_predict(embeddings)
+        centroids = label_centroids(embeddings, labels)
+
+        return ClusteringResult(
+            labels=labels,
+            confidence=centroid_confidence(embeddings, centroids, labels),
+            centroids=centroids
+        )
+
+
+METHODS = ('kmeans', 'minibatch', 'hdbscan', 'agglomerative')
+
+
+def get_engine(method: str, n_clusters: int = 10, min_cluster_size: int = 3,
+               batch_size: int = 256, n_neighbors: int = 15) -> ClusteringEngine:
+    """Create the clustering engine for a method name.
+
+    Args:
+        method: One of METHODS
+        n_clusters: Number of clusters (kmeans, minibatch, agglomerative)
+        min_cluster_size: Smallest density cluster (hdbscan)
+        batch_size: Mini-batch size (minibatch)
+        n_neighbors: kNN graph degree (agglomerative)
+
+    Returns:
+        Configured engine
+    """
+    if method in ('kmeans', 'minibatch'):
+        return KMeansEngine(n_clusters, minibatch=method == 'minibatch', batch_size=batch_size)
+    if method == 'hdbscan':
+        return HDBSCANEngine(min_cluster_size=min_cluster_size)
+    if method == 'agglomerative':
+        return AgglomerativeEngine(n_clusters, n_neighbors=n_neighbors)
+    raise ValueError(f"Unknown clustering method: {method}. Choose from {', '.join(METHODS)}")
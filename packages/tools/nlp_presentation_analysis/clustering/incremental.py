@@ -0,0 +1,146 @@
+"""Incremental topic clustering against previously saved centroids."""
+
+from dataclasses import dataclass
+from typing import Tuple
+import numpy as np
+
+
+@dataclass
+class CentroidModel:
+    """Cluster centroids with the statistics needed for mini-batch updates."""
+    centroids: np.ndarray       # (k, dim)
+    counts: np.ndarray          # (k,) members per cluster
+    mean_distances: np.ndarray  # (k,) mean member distance to the centroid
+
+    @property
+    def n_clusters(self) -> int:
+        return len(self.centroids)
+
+    def baseline_distance(self) -> float:
+        """Member-weighted mean distance to the assigned centroid.
+
+        Returns:
+            Mean distance over all members of all clusters
+        """
+        total = self.counts.sum()
+        return float((self.mean_distances * self.counts).sum() / total) if total else 0.0
+
+
+def assign_to_centroids(embeddings: np.ndarray, centroids: np.ndarray,
+                        block_size: int = 4096) -> Tuple[np.ndarray, np.ndarray]:
+    """Assign each embedding to its nearest centroid (Euclidean).
+
+    Args:
+        embeddings: Matrix of shape (n, dim)
+        centroids: Matrix of shape (k, dim)
+        block_size: Rows scored per block, bounding memory to (block_size x k)
+
+    Returns:
+        Tuple of (labels, distances), each of shape (n,)
+    """
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    centroids = np.asarray(centroids, dtype=np.float32)
+    centroid_sq = (centroids ** 2).sum(axis=1)
+
+    labels = np.empty(len(embeddings), dtype=np.int64)
+    distances = np.empty(len(embeddings), dtype=np.float32)
+
+    for start in range(0, len(embeddings), block_size):
+        block = embeddings[start:start + block_size]
+        # ||x - c||^2 = ||x||^2 - 2 x.c + ||c||^2
+        sq = (block ** 2).sum(axis=1, keepdims=True) - 2 * block @ centroids.T + centroid_sq
+        block_labels = sq.argmin(axis=1)
+        labels[start:start + len(block)] = block_labels
+        distances[start:start + len(block)] = np.sqrt(
+            np.maximum(sq[np.arange(len(block)), block_labels], 0)
+        )
+
+    return labels, distances
+
+
+def member_statistics(embeddings: np.ndarray, labels: np.ndarray,
+                      centroids: np.ndarray) -> CentroidModel:
+    """Build a centroid model from a full clustering.
+
+    Args:
+        embeddings: Matrix of shape (n, dim)
+        labels: Cluster label per row
+        centroids: Matrix of shape (k, dim)
+
+    Returns:
+        Centroid model with member counts and mean distances
+    """
+    centroids = np.asarray(centroids, dtype=np.float32)
+    distances = np.linalg.norm(np.asarray(embeddings, dtype=np.float32) - centroids[labels], axis=1)
+
+    counts = np.bincount(labels, minlength=len(centroids)).astype(np.int64)
+    distance_sums = np.bincount(labels, weights=distances, minlength=len(centroids))
+
+    return CentroidModel(
+        centroids=centroids,
+        counts=counts,
+        mean_distances=(distance_sums / np.maximum(counts, 1)).astype(np.float32)
+    )
+
+
+def partial_update(model: CentroidModel, embeddings: np.ndarray,
+                   batch_size: int = 256) -> Tuple[np.ndarray, np.ndarray]:
+    """Assign new embeddings and move centroids with mini-batch steps.
+
+    Each centroid moves towards its new members with a per-centroid learning
+    rate of 1 / count, so a centroid stays the running mean of everything
+    ever assigned to it and established topics move slowly.
+
+    Args:
+        model: Centroid model, updated in place
+        embeddings: New embeddings of shape (n, dim)
+        batch_size: Embeddings assigned per mini-batch step
+
+    Returns:
+        Tuple of (labels, distances) for the new embeddings
+    """
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    k = model.n_clusters
+
+    labels = np.empty(len(embeddings), dtype=np.int64)
+    distances = np.empty(len(embeddings), dtype=np.float32)
+
+    for start in range(0, len(embeddings), batch_size):
+        batch = embeddings[start:start + batch_size]
+        batch_labels, batch_distances = assign_to_centroids(batch, model.centroids)
+        labels[start:start + len(batch)] = batch_labels
+        distances[start:start + len(batch)] = batch_distances
+
+        batch_counts = np.bincount(batch_labels, minlength=k)
+        touched = batch_counts > 0
+
+        sums = np.zeros_like(model.centroids)
+        np.add.at(sums, batch_labels, batch)
+        distance_sums = np.bincount(batch_labels, weights=batch_distances, minlength=k)
+
+        new_counts = model.counts + batch_counts
+        model.centroids[touched] = (
+            model.centroids[touched] * model.counts[touched, None] + sums[touched]
+        ) / new_counts[touched, None]
+        model.mean_distances[touched] = (
+            model.mean_distances[touched] * model.counts[touched] + distance_sums[touched]
+        ) / new_counts[touched]
+        model.counts = new_counts
+
+    return labels, distances
+
+
+def assignment_drift(baseline_distance: float, new_distances: np.ndarray) -> float:
+    """Relative increase of new items' centroid distance over the baseline.
+
+    Args:
+        baseline_distance: Mean member distance before the update
+        new_distances: Distances of new items to their assigned centroids
+
+    Returns:
+        0.0 when new items fit existing topics as well as current members,
+        larger when they sit further out (e.g. 0.3 = 30% further)
+    """
+    if len(new_distances) == 0 or baseline_distance <= 0:
+        return 0.0
+    return float(new_distances.mean() / baseline_distance - 1.0)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Precompute related presentations for every presentation."""
+
+import click
+import logging
+from datetime import datetime
+from typing import Optional
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from db import PresentationQueries
+from utils.embedding_snapshot import EmbeddingSnapshot
+from utils.similarity import normalize_rows, iter_top_k_similar
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+@click.command()
+@click.option('--top-k', default=10, help='Number of related presentations to store per presentation')
+@click.option('--block-size', default=1024, help='Rows scored per matrix multiplication block')
+@click.option('--dry-run', is_flag=True, help='Compute neighbours without saving to database')
+@click.option('--snapshot', 'snapshot_path', help='Sync and read embeddings from this local snapshot '
+                                                  '(see snapshot_embeddings.py)')
+@click.option('--model-name', help='Embedding model to compare (required when several are stored)')
+def compute_similarities(top_k: int, block_size: int, dry_run: bool, snapshot_path: Optional[str],
+                         model_name: Optional[str]):
+    """Compute top-k related presentations from embeddings and store them."""
+
+    queries = PresentationQueries()
+
+    logger.info("Loading presentation embeddings...")
+    if snapshot_path:
+        snapshot = EmbeddingSnapshot(snapshot_path)
+        try:
+            snapshot.sync(queries)
+        except Exception as e:
+            logger.error(f"Error syncing embedding snapshot: {e}")
+            return
+        presentation_ids, model_names, matrix = snapshot.presentation_ids, snapshot.model_names, snapshot.embeddings
+        if model_name:
+            keep = [i for i, name in enumerate(model_names) if name == model_name]
+            presentation_ids = [presentation_ids[i] for i in keep]
+            model_names = [model_names[i] for i in keep]
+            matrix = matrix[keep]
+    else:
+        try:
+            presentation_ids, model_names, matrix = queries.get_embedding_matrix(model_name=model_name)
+        except Exception as e:
+            logger.error(f"Error loading embedding matrix: {e}")
+            return
+
+    # Vectors from different models are not comparable
+    models = sorted(set(model_names), key=str)
+    if len(models) > 1:
+        logger.error(f"Embeddings from several models ({', '.join(map(str, models))}); "
+                     f"choose one with --model-name")
+        return
+
+    if len(presentation_ids) < 2:
+        logger.error(f"Not enough embeddings ({len(presentation_ids)}) to compute similarities")
+        return
+
+    matrix = normalize_rows(matrix)
+
+    logger.info(f"Computing top-{top_k} neighbours for {len(presentation_ids)} presentations "
+                f"({matrix.shape[1]} dimensions, block size {block_size})")
+
+    computed_at = datetime.utcnow().isoformat()
+    saved_count = 0
+    failed_blocks = 0
+
+    for start, indices, scores in iter_top_k_similar(matrix, top_k, block_size):
+        records = []
+        for row, (neighbour_indices, neighbour_scores) in enumerate(zip(indices, scores)):
+            source = start + row
+            for rank, (neighbour, score) in enumerate(zip(neighbour_indices, neighbour_scores), start=1):
+                records.append({
+                    'presentation_id': presentation_ids[source],
+                    'similar_presentation_id': presentation_ids[neighbour],
+                    'similarity_score': round(float(score), 6),
+                    'rank': rank,
+                    'model_name': model_names[source],
+                    'computed_at': computed_at
+                })
+
+        if dry_run:
+            logger.info(f"  - Rows {start}-{start + len(indices) - 1}: {len(records)} neighbours (dry run)")
+            continue
+
+        if queries.save_presentation_similarities(records):
+            saved_count += len(records)
+            logger.info(f"  - Rows {start}-{start + len(indices) - 1}: saved {len(records)} neighbours")
+        else:
+            failed_blocks += 1
+
+    if not dry_run:
+        logger.info(f"Saved {saved_count} related-presentation rows")
+        # Stale rows are only dropped once every block of this run is stored
+        if failed_blocks:
+            logger.warning(f"{failed_blocks} blocks failed to save; previous neighbours not pruned")
+        else:
+            queries.prune_presentation_similarities(models[0], computed_at)
+
+
+if __name__ == '__main__':
+    compute_similarities()
@@ -2,5 +2,6 @@
 
 from .supabase_client import SupabaseClient
 from .queries import PresentationQueries
+from .status_writer import ProcessingStatusWriter
 
-__all__ = ['SupabaseClient', 'PresentationQueries']
+__all__ = ['SupabaseClient', 'PresentationQueries', 'ProcessingStatusWriter']
@@ -0,0 +1,48 @@
+"""Async Supabase client shared with python-shared/database."""
+
+from pathlib import Path
+from typing import Optional
+import asyncio
+import sys
+
+# packages/python-shared holds the shared database clients; appended, so it
+# cannot shadow this package's own top-level modules
+_SHARED_PATH = str(Path(__file__).resolve().parents[3] / 'python-shared')
+if _SHARED_PATH not in sys.path:
+    sys.path.append(_SHARED_PATH)
+
+from database import AsyncSupabaseClient, LatencyHistogram  # noqa: E402
+
+_async_client: Optional[AsyncSupabaseClient] = None
+_async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_async_client(**kwargs) -> AsyncSupabaseClient:
+    """Get the process-wide async client, creating it on first use.
+    
+    A new client is created once the cached one has been closed or the
+    calling event loop differs (e.g. a second asyncio.run()), since its
+    connections belong to the loop that opened them.
+    
+    Args:
+        **kwargs: Client options (max_concurrency, max_retries, ...) used on creation
+        
+    Returns:
+        Shared AsyncSupabaseClient
+    """
+    global _async_client, _async_client_loop
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+        
+    if (_async_client is None or _async_client.is_closed
+            or (loop is not None and _async_client_loop not in (None, loop))):
+        _async_client = AsyncSupabaseClient.from_env(**kwargs)
+        _async_client_loop = loop
+    elif _async_client_loop is None:
+        _async_client_loop = loop
+    return _async_client
+
+
+__all__ = ['AsyncSupabaseClient', 'LatencyHistogram', 'get_async_client']
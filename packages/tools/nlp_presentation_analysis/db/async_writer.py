@@ -0,0 +1,146 @@
+"""Write analysis results through the pooled async Supabase client."""
+
+from typing import Any, Coroutine, Dict, List, Mapping, Optional, Union
+import asyncio
+import logging
+import threading
+import uuid
+
+import numpy as np
+
+from .async_client import AsyncSupabaseClient, get_async_client
+from .queries import PresentationQueries
+from .status_writer import ProcessingStatusWriter
+from .supabase_client import SupabaseClient
+
+
+class AsyncAnalysisWriter:
+    """Save analysis results from worker threads over one async HTTP pool.
+
+    An event loop runs in a background thread with the shared
+    AsyncSupabaseClient, so every save worker's requests share one
+    connection pool, one concurrency limit and the client's retries, and
+    the chunks of a save are sent concurrently. The save methods mirror
+    PresentationQueries (save_results accepts either) and block only the
+    calling thread until its own writes finish. Processing status is
+    buffered by a ProcessingStatusWriter that flushes through the same
+    client; close() flushes it and shuts the loop down.
+    """
+
+    def __init__(self, queries: PresentationQueries, status_flush_size: int = 1, **client_kwargs):
+        """Start the event loop and open the client.
+
+        Args:
+            queries: Queries whose row builders and embedding_format are used
+            status_flush_size: Presentations buffered per status write
+            **client_kwargs: AsyncSupabaseClient options (max_concurrency, ...)
+        """
+        self.queries = queries
+        self.logger = logging.getLogger(__name__)
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='async-writer', daemon=True)
+        self._thread.start()
+
+        self.client: AsyncSupabaseClient = self._run(self._open(client_kwargs))
+        self.status_writer = ProcessingStatusWriter(self, flush_size=status_flush_size)
+
+    async def _open(self, client_kwargs: Dict[str, Any]) -> AsyncSupabaseClient:
+        # Created on the writer's loop, which its connections belong to
+        return get_async_client(**client_kwargs)
+
+    def _run(self, coro: Coroutine[Any, Any, Any]) -> Any:
+        """Run a coroutine on the writer's loop and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def __enter__(self) -> 'AsyncAnalysisWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Flush buffered status, close the client and stop the loop."""
+        try:
+            self.status_writer.flush()
+            for name, stats in self.client.latency_stats().items():
+                self.logger.info(f"  {name:<32} n={stats['count']:<6} p50={stats['p50_ms']}ms "
+                                 f"p95={stats['p95_ms']}ms")
+            self._run(self.client.aclose())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+
+    def rpc(self, function_name: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """Call a Postgres function (the interface ProcessingStatusWriter writes through).
+
+        Only used for merge_nlp_processing, which is safe to apply twice, so
+        timeouts are retried.
+        """
+        return self._run(self.client.rpc(function_name, params, retry=True))
+
+    def save_presentation_entities(self, presentation_id: str, entities: Dict[str, Any],
+                                   mark_processed: bool = True, replace: bool = False) -> bool:
+        """Save extracted entities (see PresentationQueries.save_presentation_entities)."""
+        records = self.queries._entity_records(presentation_id, entities)
+        return self._save(presentation_id, 'entities', mark_processed, self._save_analysis_rows(
+            'presentation_entities', presentation_id, records, PresentationQueries.ENTITY_KEY, replace))
+
+    def save_presentation_keywords(self, presentation_id: str, keywords: Dict[str, Any],
+                                   mark_processed: bool = True, replace: bool = False) -> bool:
+        """Save extracted keywords (see PresentationQueries.save_presentation_keywords)."""
+        records = self.queries._keyword_records(presentation_id, keywords)
+        return self._save(presentation_id, 'keywords', mark_processed, self._save_analysis_rows(
+            'presentation_keywords', presentation_id, records, PresentationQueries.KEYWORD_KEY, replace))
+
+    def save_presentation_embedding(self, presentation_id: str, embedding: Union[List[float], np.ndarray],
+                                    model_name: str = "all-MiniLM-L6-v2",
+                                    mark_processed: bool = True) -> bool:
+        """Save an embedding (see PresentationQueries.save_presentation_embedding)."""
+        data = self.queries._embedding_record(presentation_id, embedding, model_name)
+        return self._save(presentation_id, 'embeddings', mark_processed, self.client.upsert(
+            'presentation_embeddings', data, on_conflict='presentation_id'))
+
+    def mark_presentation_processed(
+        self,
+        presentation_id: str,
+        process_type: Union[str, List[str], Mapping[str, Mapping[str, Any]]]
+    ) -> bool:
+        """Buffer completed stages (see PresentationQueries.mark_presentation_processed)."""
+        return self.status_writer.mark(presentation_id, process_type)
+
+    def _save(self, presentation_id: str, stage: str, mark_processed: bool,
+              coro: Coroutine[Any, Any, Any]) -> bool:
+        try:
+            self._run(coro)
+        except Exception as e:
+            self.logger.error(f"Error saving {stage} for presentation {presentation_id}: {e}")
+            return False
+
+        if mark_processed:
+            self.mark_presentation_processed(presentation_id, stage)
+        return True
+
+    async def _save_analysis_rows(self, table: str, presentation_id: str, records: List[Dict[str, Any]],
+                                  key: str, replace: bool):
+        """Upsert rows in concurrent chunks; a replacing save then drops other runs' rows.
+
+        Same generation swap as PresentationQueries._save_analysis_rows.
+        """
+        run_id = str(uuid.uuid4()) if replace else None
+        if run_id:
+            records = [{**record, 'analysis_run_id': run_id} for record in records]
+
+        # Postgres rejects an upsert touching the same row twice
+        key_columns = key.split(',')
+        records = list({tuple(r.get(c) for c in key_columns): r for r in records}.values())
+
+        await asyncio.gather(*(
+            self.client.upsert(table, chunk, on_conflict=key)
+            for chunk in SupabaseClient.chunk_rows(records)
+        ))
+
+        if run_id:
+            await self.client.delete(table, {'presentation_id': presentation_id},
+                                     params={'or': f"({PresentationQueries.other_runs_filter(run_id)})"})
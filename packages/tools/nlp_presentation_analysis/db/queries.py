@@ -1,19 +1,149 @@
 """Database queries for presentation analysis."""
 
-from typing import List, Dict, Any, Optional
+from typing import Iterable, Iterator, List, Dict, Any, Mapping, Optional, Tuple, Union
 from datetime import datetime
+from itertools import islice
 import json
 import logging
+import uuid
+import numpy as np
 from .supabase_client import SupabaseClient
+from .status_writer import ProcessingStatusWriter
+from utils.embedding_codec import EMBEDDING_FORMATS, encode_embedding, decode_embeddings
+from utils.similarity import build_embedding_matrix, normalize_rows
 
 class PresentationQueries:
     """Handle database queries for presentations."""
     
-    def __init__(self):
-        """Initialize with Supabase client."""
+    def __init__(self, status_flush_size: int = 1, embedding_format: str = 'vector'):
+        """Initialize with Supabase client.
+        
+        Args:
+            status_flush_size: Presentations whose processing status is
+                buffered before one batched write (see flush_processing_status)
+            embedding_format: How embeddings are written: 'vector' (pgvector
+                column) or a packed format ('float32', 'float16', 'int8')
+        """
+        if embedding_format not in EMBEDDING_FORMATS:
+            raise ValueError(f"Unknown embedding format: {embedding_format}. "
+                             f"Choose from {', '.join(EMBEDDING_FORMATS)}")
+        
+        self.embedding_format = embedding_format
         self.db = SupabaseClient()
         self.logger = logging.getLogger(__name__)
+        self.status_writer = ProcessingStatusWriter(self.db, flush_size=status_flush_size)
+        
+    # Columns the analyzers need; metadata is filtered server-side, not transferred
+    ANALYSIS_COLUMNS = 'id, title, summary, transcript_text, created_at, nlp_input_hash'
+    
+    # Analysis columns plus only the analysis manifest out of metadata
+    MANIFEST_COLUMNS = ANALYSIS_COLUMNS + ', nlp_processing:metadata->nlp_processing'
+    
+    # What incremental planning needs: the server-side text hash, no text
+    PLANNING_COLUMNS = 'id, nlp_input_hash, nlp_processing:metadata->nlp_processing'
+    
+    def iter_presentations(
+        self,
+        limit: Optional[int] = None,
+        page_size: int = 50,
+        columns: str = ANALYSIS_COLUMNS,
+        unprocessed_only: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream presentations page by page.
+        
+        Pages are fetched by keyset (id > last seen id), so updating rows
+        while iterating cannot make later pages skip anything.
+        
+        Args:
+            limit: Maximum number of presentations to yield (None for all)
+            page_size: Rows fetched per request
+            columns: Columns to select (must include id)
+            unprocessed_only: Only presentations without the nlp_processed flag
+                (filtered in the database)
+            
+        Yields:
+            Presentation records in id order
+        """
+        last_id = None
+        remaining = limit
+        
+        while remaining is None or remaining > 0:
+            size = page_size if remaining is None else min(page_size, remaining)
+            
+            query = self.db.client.table('presentations').select(columns)
+            if unprocessed_only:
+                query = query.or_('metadata->>nlp_processed.is.null,metadata->>nlp_processed.neq.true')
+            if last_id is not None:
+                query = query.gt('id', last_id)
+            page = query.order('id').limit(size).execute().data
+            
+            if not page:
+                return
+                
+            for pres in page:
+                yield pres
+                
+            last_id = page[-1]['id']
+            if remaining is not None:
+                remaining -= len(page)
+            if len(page) < size:
+                return
+    
+    def iter_presentations_by_ids(
+        self,
+        presentation_ids: Iterable[str],
+        page_size: int = 50,
+        columns: str = ANALYSIS_COLUMNS
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream the given presentations, fetching page_size of them per request.
+        
+        IDs are read lazily, so they can come from a generator (e.g.
+        AnalysisPlanner.iter_stale).
         
+        Args:
+            presentation_ids: Presentation UUIDs
+            page_size: Presentations fetched per request
+            columns: Columns to select (must include id)
+            
+        Yields:
+            Presentation records in the order of presentation_ids (missing
+            ones are skipped)
+        """
+        ids = iter(presentation_ids)
+        while True:
+            page_ids = list(islice(ids, page_size))
+            if not page_ids:
+                return
+                
+            rows = self.db.client.table('presentations').select(columns) \
+                .in_('id', page_ids).execute().data
+            by_id = {row['id']: row for row in rows}
+            for pres_id in page_ids:
+                if pres_id in by_id:
+                    yield by_id[pres_id]
+    
+    def iter_unprocessed_presentations(
+        self,
+        limit: Optional[int] = None,
+        page_size: int = 50,
+        columns: str = ANALYSIS_COLUMNS
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream presentations that haven't been processed yet.
+        
+        The nlp_processed flag is filtered in the database, so only
+        unprocessed rows are transferred.
+        
+        Args:
+            limit: Maximum number of presentations to yield (None for all)
+            page_size: Rows fetched per request
+            columns: Columns to select (must include id)
+            
+        Yields:
+            Presentation records in id order
+        """
+        return self.iter_presentations(limit=limit, page_size=page_size, columns=columns,
+                                       unprocessed_only=True)
+    
     def get_unprocessed_presentations(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get presentations that haven't been processed yet.
         
@@ -24,24 +154,7 @@ class PresentationQueries:
             List of presentation records
         """
         try:
-            # First check if nlp_processed column exists in metadata
-            presentations = self.db.select(
-                'presentations',
-                columns='id, title, summary, transcript_text, created_at, metadata',
-                filters={}
-            )
-            
-            # Filter unprocessed presentations
-            unprocessed = []
-            for pres in presentations:
-                metadata = pres.get('metadata', {}) or {}
-                if not metadata.get('nlp_processed', False):
-                    unprocessed.append(pres)
-                    
-                if len(unprocessed) >= limit:
-                    break
-                    
-            return unprocessed
+            return list(self.iter_unprocessed_presentations(limit=limit))
             
         except Exception as e:
             self.logger.error(f"Error fetching unprocessed presentations: {e}")
@@ -68,48 +181,36 @@ class PresentationQueries:
             self.logger.error(f"Error fetching presentation {presentation_id}: {e}")
             return None
             
-    def save_presentation_entities(self, presentation_id: str, entities: Dict[str, Any]) -> bool:
+    # Natural keys of analysis rows (matching the unique indexes in setup_tables.sql)
+    ENTITY_KEY = 'presentation_id,entity_type,entity_text'
+    KEYWORD_KEY = 'presentation_id,extraction_method,keyword'
+    
+    def save_presentation_entities(self, presentation_id: str, entities: Dict[str, Any],
+                                 mark_processed: bool = True, replace: bool = False) -> bool:
         """Save extracted entities for a presentation.
         
+        Rows are upserted on their natural key in bounded chunks, so saving
+        the same analysis twice does not duplicate them.
+        
         Args:
             presentation_id: UUID of the presentation
             entities: Extracted entities
+            mark_processed: Record the entities stage in the processing status
+            replace: Replace all previous entities of the presentation (old
+                rows are only dropped once every new row is written)
             
         Returns:
             Success status
         """
         try:
-            # Prepare entity records
-            entity_records = []
+            entity_records = self._entity_records(presentation_id, entities)
             
-            # Process different entity types
-            for entity_type, entity_list in entities.items():
-                if entity_type == 'metadata' or entity_type == 'key_phrases':
-                    continue
-                    
-                if isinstance(entity_list, list):
-                    for entity in entity_list:
-                        if isinstance(entity, dict):
-                            record = {
-                                'presentation_id': presentation_id,
-                                'entity_type': entity_type,
-                                'entity_text': entity.get('text', ''),
-                                'confidence_score': entity.get('confidence', 1.0),
-                                'extraction_method': 'spacy',
-                                'metadata': {
-                                    'label': entity.get('label', ''),
-                                    'start': entity.get('start', 0),
-                                    'end': entity.get('end', 0)
-                                }
-                            }
-                            entity_records.append(record)
-                            
-            # Batch insert entities
-            if entity_records:
-                self.db.batch_insert('presentation_entities', entity_records)
+            self._save_analysis_rows('presentation_entities', presentation_id, entity_records,
+                                     self.ENTITY_KEY, replace)
                 
             # Update presentation metadata
-            self.mark_presentation_processed(presentation_id, 'entities')
+            if mark_processed:
+                self.mark_presentation_processed(presentation_id, 'entities')
             
             return True
             
@@ -117,49 +218,32 @@ class PresentationQueries:
             self.logger.error(f"Error saving entities for presentation {presentation_id}: {e}")
             return False
             
-    def save_presentation_keywords(self, presentation_id: str, keywords: Dict[str, Any]) -> bool:
+    def save_presentation_keywords(self, presentation_id: str, keywords: Dict[str, Any],
+                                 mark_processed: bool = True, replace: bool = False) -> bool:
         """Save extracted keywords for a presentation.
         
+        Rows are upserted on their natural key in bounded chunks, so saving
+        the same analysis twice does not duplicate them.
+        
         Args:
             presentation_id: UUID of the presentation
             keywords: Extracted keywords
+            mark_processed: Record the keywords stage in the processing status
+            replace: Replace all previous keywords of the presentation (old
+                rows are only dropped once every new row is written)
             
         Returns:
             Success status
         """
         try:
-            # Prepare keyword records
-            keyword_records = []
+            keyword_records = self._keyword_records(presentation_id, keywords)
             
-            for method, keyword_list in keywords.items():
-                if method == 'metadata':
-                    continue
-                    
-                if isinstance(keyword_list, list):
-                    for item in keyword_list:
-                        if isinstance(item, tuple):
-                            keyword, score = item
-                            record = {
-                                'presentation_id': presentation_id,
-                                'keyword': keyword,
-                                'score': score,
-                                'extraction_method': method
-                            }
-                        else:
-                            record = {
-                                'presentation_id': presentation_id,
-                                'keyword': item,
-                                'score': 1.0,
-                                'extraction_method': method
-                            }
-                        keyword_records.append(record)
-                        
-            # Batch insert keywords
-            if keyword_records:
-                self.db.batch_insert('presentation_keywords', keyword_records)
+            self._save_analysis_rows('presentation_keywords', presentation_id, keyword_records,
+                                     self.KEYWORD_KEY, replace)
                 
             # Update presentation metadata
-            self.mark_presentation_processed(presentation_id, 'keywords')
+            if mark_processed:
+                self.mark_presentation_processed(presentation_id, 'keywords')
             
             return True
             
@@ -167,31 +251,141 @@ class PresentationQueries:
             self.logger.error(f"Error saving keywords for presentation {presentation_id}: {e}")
             return False
             
-    def save_presentation_embedding(self, presentation_id: str, embedding: List[float], 
-                                  model_name: str = "all-MiniLM-L6-v2") -> bool:
+    def _save_analysis_rows(self, table: str, presentation_id: str, records: List[Dict[str, Any]],
+                            key: str, replace: bool):
+        """Upsert a presentation's analysis rows, optionally replacing the rest.
+        
+        A replacing save tags its rows with a new analysis_run_id and, only
+        after every chunk is written, deletes the presentation's rows from
+        other runs in a single statement. An interrupted save therefore
+        leaves the previous rows in place (some updated) instead of none.
+        
+        Args:
+            table: presentation_entities or presentation_keywords
+            presentation_id: UUID of the presentation
+            records: Rows to write
+            key: Natural-key columns to upsert on
+            replace: Drop rows not written by this save
+        """
+        run_id = str(uuid.uuid4()) if replace else None
+        if run_id:
+            records = [{**record, 'analysis_run_id': run_id} for record in records]
+            
+        if records:
+            self.db.bulk_upsert(table, records, on_conflict=key)
+            
+        if run_id:
+            self.db.client.table(table).delete() \
+                .eq('presentation_id', presentation_id) \
+                .or_(self.other_runs_filter(run_id)) \
+                .execute()
+            
+    @staticmethod
+    def other_runs_filter(run_id: str) -> str:
+        """PostgREST or-filter matching rows not written by an analysis run."""
+        return f"analysis_run_id.is.null,analysis_run_id.neq.{run_id}"
+            
+    def _entity_records(self, presentation_id: str, entities: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Build presentation_entities rows from extractor output.
+        
+        Args:
+            presentation_id: UUID of the presentation
+            entities: Extracted entities
+            
+        Returns:
+            Entity rows
+        """
+        entity_records = []
+        
+        # Process different entity types
+        for entity_type, entity_list in entities.items():
+            if entity_type == 'metadata' or entity_type == 'key_phrases':
+                continue
+                
+            if isinstance(entity_list, list):
+                for entity in entity_list:
+                    if isinstance(entity, dict):
+                        record = {
+                            'presentation_id': presentation_id,
+                            'entity_type': entity_type,
+                            'entity_text': entity.get('text', ''),
+                            'confidence_score': entity.get('confidence', 1.0),
+                            'extraction_method': 'spacy',
+                            'metadata': {
+                                'label': entity.get('label', ''),
+                                'start': entity.get('start', 0),
+                                'end': entity.get('end', 0)
+                            }
+                        }
+                        entity_records.append(record)
+                        
+        return entity_records
+        
+    def _keyword_records(self, presentation_id: str, keywords: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Build presentation_keywords rows from extractor output.
+        
+        Args:
+            presentation_id: UUID of the presentation
+            keywords: Extracted keywords
+            
+        Returns:
+            Keyword rows
+        """
+        keyword_records = []
+        
+        for method, keyword_list in keywords.items():
+            if method == 'metadata':
+                continue
+                
+            if isinstance(keyword_list, list):
+                for item in keyword_list:
+                    if isinstance(item, (tuple, list)):
+                        keyword, score = item
+                        record = {
+                            'presentation_id': presentation_id,
+                            'keyword': keyword,
+                            'score': score,
+                            'extraction_method': method
+                        }
+                    else:
+                        record = {
+                            'presentation_id': presentation_id,
+                            'keyword': item,
+                            'score': 1.0,
+                            'extraction_method': method
+                        }
+                    keyword_records.append(record)
+                    
+        return keyword_records
+        
+    def save_presentation_embedding(self, presentation_id: str, embedding: Union[List[float], np.ndarray], 
+                                  model_name: str = "all-MiniLM-L6-v2",
+                                  mark_processed: bool = True) -> bool:
         """Save embedding for a presentation.
         
+        With a packed embedding_format the vector is sent as base64 binary
+        (2-15x smaller than JSON floats) and the pgvector column is cleared;
+        in 'vector' mode the packed columns are cleared, so a row written
+        earlier in another format is not read back stale.
+        
         Args:
             presentation_id: UUID of the presentation
             embedding: Embedding vector
             model_name: Name of the model used
+            mark_processed: Record the embeddings stage in the processing status
             
         Returns:
             Success status
         """
         try:
-            data = {
-                'presentation_id': presentation_id,
-                'embedding': embedding,
-                'model_name': model_name,
-                'created_at': datetime.utcnow().isoformat()
-            }
+            data = self._embedding_record(presentation_id, embedding, model_name)
             
             # Upsert embedding (update if exists)
             self.db.upsert('presentation_embeddings', data, on_conflict='presentation_id')
             
             # Update presentation metadata
-            self.mark_presentation_processed(presentation_id, 'embeddings')
+            if mark_processed:
+                self.mark_presentation_processed(presentation_id, 'embeddings')
             
             return True
             
@@ -199,51 +393,63 @@ class PresentationQueries:
             self.logger.error(f"Error saving embedding for presentation {presentation_id}: {e}")
             return False
             
-    def mark_presentation_processed(self, presentation_id: str, process_type: str) -> bool:
+    def _embedding_record(self, presentation_id: str, embedding: Union[List[float], np.ndarray],
+                          model_name: str) -> Dict[str, Any]:
+        """Build the presentation_embeddings row in the configured embedding_format.
+        
+        Args:
+            presentation_id: UUID of the presentation
+            embedding: Embedding vector
+            model_name: Name of the model used
+            
+        Returns:
+            Embedding row
+        """
+        data = {
+            'presentation_id': presentation_id,
+            'model_name': model_name,
+            'created_at': datetime.utcnow().isoformat()
+        }
+        
+        if self.embedding_format == 'vector':
+            data['embedding'] = np.asarray(embedding, dtype=np.float32).tolist()
+            data['embedding_packed'] = None
+            data['embedding_format'] = None
+        else:
+            data['embedding'] = None
+            data['embedding_packed'] = encode_embedding(embedding, self.embedding_format)
+            data['embedding_format'] = self.embedding_format
+            
+        return data
+        
+    def mark_presentation_processed(
+        self,
+        presentation_id: str,
+        process_type: Union[str, Iterable[str], Mapping[str, Mapping[str, Any]]]
+    ) -> bool:
         """Mark a presentation as processed.
         
+        The status is merged into the presentation metadata without reading
+        the row; with status_flush_size > 1 it is buffered until the batch is
+        full or flush_processing_status is called.
+        
         Args:
             presentation_id: UUID of the presentation
-            process_type: Type of processing done
+            process_type: Type or types of processing done, or a mapping of
+                type to the analysis manifest entry recorded with it
             
         Returns:
             Success status
         """
-        try:
-            # Get current metadata
-            pres = self.get_presentation_by_id(presentation_id)
-            if not pres:
-                return False
-                
-            metadata = pres.get('metadata', {}) or {}
-            
-            # Update processing status
-            if 'nlp_processing' not in metadata:
-                metadata['nlp_processing'] = {}
-                
-            metadata['nlp_processing'][process_type] = {
-                'processed': True,
-                'processed_at': datetime.utcnow().isoformat()
-            }
-            
-            # Check if all processing is complete
-            if all(metadata['nlp_processing'].get(pt, {}).get('processed', False) 
-                   for pt in ['entities', 'keywords', 'embeddings']):
-                metadata['nlp_processed'] = True
-                metadata['nlp_processed_at'] = datetime.utcnow().isoformat()
-                
-            # Update presentation
-            self.db.update(
-                'presentations',
-                {'metadata': metadata},
-                {'id': presentation_id}
-            )
-            
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"Error marking presentation {presentation_id} as processed: {e}")
-            return False
+        return self.status_writer.mark(presentation_id, process_type)
+        
+    def flush_processing_status(self) -> bool:
+        """Write any buffered processing status.
+        
+        Returns:
+            Success status
+        """
+        return self.status_writer.flush()
             
     def get_presentation_embeddings(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """Get all presentation embeddings.
@@ -267,54 +473,156 @@ class PresentationQueries:
             self.logger.error(f"Error fetching presentation embeddings: {e}")
             return []
             
-    def find_similar_presentations(self, presentation_id: str, top_k: int = 5) -> List[Dict[str, Any]]:
+    def get_embedding_matrix(self, page_size: int = 1000,
+                             model_name: Optional[str] = None) -> Tuple[List[str], List[str], np.ndarray]:
+        """Load presentation embeddings into one float32 matrix.
+        
+        Args:
+            page_size: Rows fetched per request
+            model_name: Only load embeddings from this model (None for all)
+            
+        Returns:
+            Tuple of (presentation_ids, model_names, matrix of shape (n, dim))
+            
+        Raises:
+            Exception: If a request fails
+            ValueError: If the embeddings have different dimensions
+        """
+        rows, matrix = self.get_embeddings_since(None, page_size=page_size, model_name=model_name)
+        return [r['presentation_id'] for r in rows], [r['model_name'] for r in rows], matrix
+        
+    def get_embeddings_since(self, since: Optional[str] = None, page_size: int = 1000,
+                             model_name: Optional[str] = None) -> Tuple[List[Dict[str, Any]], np.ndarray]:
+        """Load embeddings written (by the server's updated_at) at or after a timestamp.
+        
+        Packed rows are decoded from their binary payload straight into
+        arrays; only rows still stored in the pgvector column are parsed from
+        JSON floats. Both kinds are paged by keyset on presentation_id.
+        
+        Args:
+            since: ISO timestamp compared with updated_at (None for all rows)
+            page_size: Rows fetched per request
+            model_name: Only load embeddings from this model (None for all)
+            
+        Returns:
+            Tuple of (rows with presentation_id, model_name and updated_at,
+            matrix of shape (n, dim) in the same order)
+            
+        Raises:
+            Exception: If a request fails (nothing partial is returned)
+            ValueError: If the embeddings have different dimensions
+        """
+        rows: List[Dict[str, Any]] = []
+        blocks: List[np.ndarray] = []
+        meta_columns = 'presentation_id, model_name, updated_at'
+        
+        for page in self._iter_embedding_pages(
+            f"{meta_columns}, embedding_format, embedding_packed", True, since, page_size, model_name
+        ):
+            for fmt in dict.fromkeys(row['embedding_format'] for row in page):
+                fmt_rows = [row for row in page if row['embedding_format'] == fmt]
+                blocks.append(decode_embeddings([row['embedding_packed'] for row in fmt_rows], fmt))
+                rows.extend(fmt_rows)
+                
+        for page in self._iter_embedding_pages(f"{meta_columns}, embedding", False, since, page_size,
+                                               model_name):
+            vector_rows = [row for row in page if row['embedding'] is not None]
+            if vector_rows:
+                blocks.append(build_embedding_matrix([row['embedding'] for row in vector_rows]))
+                rows.extend(vector_rows)
+                
+        rows = [{'presentation_id': r['presentation_id'], 'model_name': r['model_name'],
+                 'updated_at': r['updated_at']} for r in rows]
+        dimensions = sorted({block.shape[1] for block in blocks})
+        if len(dimensions) > 1:
+            models = sorted({str(r['model_name']) for r in rows})
+            raise ValueError(f"Embeddings have different dimensions {dimensions} "
+                             f"(models: {', '.join(models)}); load one model at a time")
+        matrix = np.vstack(blocks) if blocks else np.zeros((0, 0), dtype=np.float32)
+        return rows, matrix
+        
+    def _iter_embedding_pages(self, columns: str, packed: bool, since: Optional[str],
+                              page_size: int, model_name: Optional[str] = None) -> Iterator[List[Dict[str, Any]]]:
+        """Page through packed or pgvector embedding rows by presentation_id.
+        
+        Args:
+            columns: Columns to select
+            packed: Select packed rows (embedding_format set) or pgvector rows
+            since: Only rows with updated_at at or after this timestamp
+            page_size: Rows fetched per request
+            model_name: Only rows from this model
+            
+        Yields:
+            Pages of rows
+        """
+        last_id = None
+        while True:
+            query = self.db.client.table('presentation_embeddings').select(columns)
+            query = query.not_.is_('embedding_format', 'null') if packed else query.is_('embedding_format', 'null')
+            if since is not None:
+                query = query.gte('updated_at', since)
+            if model_name is not None:
+                query = query.eq('model_name', model_name)
+            if last_id is not None:
+                query = query.gt('presentation_id', last_id)
+            page = query.order('presentation_id').limit(page_size).execute().data
+            
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
+            last_id = page[-1]['presentation_id']
+            
+    def find_similar_presentations(self, presentation_id: str, top_k: int = 5,
+                                   snapshot: Optional[Any] = None) -> List[Dict[str, Any]]:
         """Find similar presentations using embeddings.
         
+        With a snapshot, the target is scored against the local matrix.
+        Without one, the whole embedding table is not downloaded for a
+        single lookup: precomputed neighbours (compute_similarities.py) are
+        used, falling back to the pgvector find_similar_presentations
+        function, which only sees embeddings stored as vectors.
+        
         Args:
             presentation_id: UUID of the reference presentation
             top_k: Number of similar presentations to return
+            snapshot: EmbeddingSnapshot to score against locally
             
         Returns:
             List of similar presentations with similarity scores
         """
+        if snapshot is None:
+            related = self.get_related_presentations(presentation_id, top_k)
+            if related:
+                return related
+            try:
+                rows = self.db.rpc('find_similar_presentations', {
+                    'target_presentation_id': presentation_id,
+                    'limit_count': top_k
+                })
+                return [{'id': row['presentation_id'], 'title': row['title'], 'summary': row['summary'],
+                         'similarity_score': row['similarity_score']} for row in rows or []]
+            except Exception as e:
+                self.logger.error(f"Error finding similar presentations: {e}")
+                return []
+                
         try:
-            # This would ideally use pgvector for efficient similarity search
-            # For now, we'll implement a simple version
-            
-            # Get target embedding
-            target_result = self.db.select(
-                'presentation_embeddings',
-                filters={'presentation_id': presentation_id}
-            )
+            presentation_ids, matrix = snapshot.presentation_ids, snapshot.embeddings
             
-            if not target_result:
+            if presentation_id not in presentation_ids:
                 return []
                 
-            target_embedding = target_result[0]['embedding']
-            
-            # Get all other embeddings
-            all_embeddings = self.get_presentation_embeddings()
-            
-            # Calculate similarities (would be done in DB with pgvector)
-            similarities = []
-            for emb_record in all_embeddings:
-                if emb_record['presentation_id'] != presentation_id:
-                    # Simple cosine similarity calculation
-                    # In production, this should be done with pgvector
-                    similarity = self._calculate_similarity(
-                        target_embedding,
-                        emb_record['embedding']
-                    )
-                    similarities.append({
-                        'presentation_id': emb_record['presentation_id'],
-                        'similarity': similarity
-                    })
-                    
-            # Sort and get top k
-            similarities.sort(key=lambda x: x['similarity'], reverse=True)
+            # Cosine similarity of the target against every embedding at once
+            normalized = normalize_rows(matrix)
+            target = presentation_ids.index(presentation_id)
+            scores = normalized @ normalized[target]
+            scores[target] = -np.inf
             
             # Get presentation details for top results
-            top_similar = similarities[:top_k]
+            top_similar = [
+                {'presentation_id': presentation_ids[i], 'similarity': float(scores[i])}
+                for i in np.argsort(-scores, kind='stable')[:min(top_k, len(scores) - 1)]
+            ]
             presentation_ids = [s['presentation_id'] for s in top_similar]
             
             presentations = self.db.select(
@@ -338,26 +646,168 @@ class PresentationQueries:
             self.logger.error(f"Error finding similar presentations: {e}")
             return []
             
-    def _calculate_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        """Calculate cosine similarity between two vectors.
+    def get_keywords_for_presentations(self, presentation_ids: List[str], chunk_size: int = 200,
+                                       page_size: int = 1000) -> List[Dict[str, Any]]:
+        """Get keywords of many presentations in a few requests.
+        
+        IDs are sent in chunks with an IN filter, and each chunk is paged by
+        id so results larger than the API row limit are not truncated.
         
         Args:
-            vec1: First vector
-            vec2: Second vector
+            presentation_ids: UUIDs of the presentations
+            chunk_size: IDs per IN filter
+            page_size: Rows per request
             
         Returns:
-            Similarity score
+            Keyword records with presentation_id, keyword and score
+            
+        Raises:
+            Exception: If a request fails (nothing partial is returned, so
+                callers cannot mistake a failure for presentations without
+                keywords)
         """
-        import numpy as np
+        keywords = []
         
-        v1 = np.array(vec1)
-        v2 = np.array(vec2)
+        for start in range(0, len(presentation_ids), chunk_size):
+            chunk = presentation_ids[start:start + chunk_size]
+            last_id = None
+            
+            while True:
+                query = self.db.client.table('presentation_keywords') \
+                    .select('id, presentation_id, keyword, score') \
+                    .in_('presentation_id', chunk)
+                if last_id is not None:
+                    query = query.gt('id', last_id)
+                page = query.order('id').limit(page_size).execute().data
+                
+                keywords.extend(page)
+                if len(page) < page_size:
+                    break
+                last_id = page[-1]['id']
+                
+        return keywords
+            
+    def save_presentation_topics(self, assignments: List[Dict[str, Any]]) -> bool:
+        """Save presentation-topic assignments in bulk.
         
-        dot_product = np.dot(v1, v2)
-        norm1 = np.linalg.norm(v1)
-        norm2 = np.linalg.norm(v2)
+        Args:
+            assignments: Records with presentation_id, cluster_id and confidence_score
+            
+        Returns:
+            Success status
+        """
+        try:
+            if assignments:
+                self.db.bulk_upsert('presentation_topics', assignments,
+                                    on_conflict='presentation_id,cluster_id')
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Error saving {len(assignments)} topic assignments: {e}")
+            return False
+            
+    def get_topic_clusters(self) -> List[Dict[str, Any]]:
+        """Get the saved topic clusters.
         
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
+        Returns:
+            topic_clusters records ordered by creation time
+        """
+        try:
+            result = self.db.client.table('topic_clusters') \
+                .select('id, cluster_name, cluster_keywords, presentation_ids, centroid_embedding, metadata') \
+                .order('created_at') \
+                .execute()
+            return result.data
+            
+        except Exception as e:
+            self.logger.error(f"Error fetching topic clusters: {e}")
+            return []
             
-        return float(dot_product / (norm1 * norm2))
+    def save_presentation_similarities(self, records: List[Dict[str, Any]]) -> bool:
+        """Save precomputed related-presentation rows.
+
+        Rows are keyed by (presentation_id, rank), so re-running the batch job
+        overwrites previous neighbours in place. They are sent in size-bounded
+        chunks.
+
+        Args:
+            records: Similarity records with presentation_id, similar_presentation_id,
+                similarity_score and rank
+
+        Returns:
+            Success status
+        """
+        try:
+            self.db.bulk_upsert('presentation_similarities', records, on_conflict='presentation_id,rank')
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Error saving presentation similarities: {e}")
+            return False
+
+    def prune_presentation_similarities(self, model_name: str, computed_at: str) -> bool:
+        """Delete a model's neighbour rows not written by the run at computed_at.
+
+        After a complete run this drops ranks beyond the new top-k and the
+        rows of presentations whose embedding was removed. Rows without a
+        model name predate model tracking and are dropped too.
+
+        Args:
+            model_name: Embedding model the run scored
+            computed_at: The run's computed_at timestamp
+
+        Returns:
+            Success status
+        """
+        try:
+            self.db.client.table('presentation_similarities').delete() \
+                .or_(f'model_name.eq."{model_name}",model_name.is.null') \
+                .neq('computed_at', computed_at) \
+                .execute()
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Error pruning presentation similarities: {e}")
+            return False
+
+    def get_related_presentations(self, presentation_id: str, top_k: int = 5) -> List[Dict[str, Any]]:
+        """Get precomputed related presentations.
+
+        Args:
+            presentation_id: UUID of the reference presentation
+            top_k: Number of related presentations to return
+
+        Returns:
+            List of related presentations with similarity scores
+        """
+        try:
+            result = self.db.client.table('presentation_similarities') \
+                .select('similar_presentation_id, similarity_score, rank') \
+                .eq('presentation_id', presentation_id) \
+                .lte('rank', top_k) \
+                .order('rank') \
+                .execute()
+            neighbours = result.data
+
+            if not neighbours:
+                return []
+
+            presentations = self.db.select(
+                'presentations',
+                columns='id, title, summary',
+                filters={'id': [n['similar_presentation_id'] for n in neighbours]}
+            )
+
+            pres_dict = {p['id']: p for p in presentations}
+            results = []
+            for neighbour in neighbours:
+                pres = pres_dict.get(neighbour['similar_presentation_id'])
+                if pres:
+                    pres['similarity_score'] = neighbour['similarity_score']
+                    results.append(pres)
+
+            return results
+
+        except Exception as e:
+            self.logger.error(f"Error fetching related presentations for {presentation_id}: {e}")
+            return []
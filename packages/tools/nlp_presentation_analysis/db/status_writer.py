@@ -0,0 +1,99 @@
+"""Batched writer for presentation NLP processing status."""
+
+from typing import Any, Dict, Iterable, Mapping, Union
+from collections import defaultdict
+from datetime import datetime
+import logging
+import threading
+
+from .supabase_client import SupabaseClient
+
+
+class ProcessingStatusWriter:
+    """Accumulate completed analysis stages and flush them in one write.
+
+    Stages are merged into presentations.metadata.nlp_processing by the
+    merge_nlp_processing database function, which also sets nlp_processed
+    once entities, keywords and embeddings are all recorded. No presentation
+    row is read back, and a flush covers every pending presentation.
+    Wrap processing loops in the writer as a context manager, so stages
+    still pending are flushed when the loop ends, fails or is interrupted.
+    """
+
+    def __init__(self, db: SupabaseClient, flush_size: int = 1):
+        """Initialize the writer.
+
+        Args:
+            db: Supabase client
+            flush_size: Number of pending presentations that triggers a flush
+                (1 writes each presentation as soon as it is marked)
+        """
+        self.db = db
+        self.flush_size = max(1, flush_size)
+        self.logger = logging.getLogger(__name__)
+        self._pending: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> 'ProcessingStatusWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.flush()
+
+    @property
+    def pending_count(self) -> int:
+        """Number of presentations waiting to be flushed."""
+        with self._lock:
+            return len(self._pending)
+
+    def mark(self, presentation_id: str,
+             process_types: Union[str, Iterable[str], Mapping[str, Mapping[str, Any]]]) -> bool:
+        """Record completed stages for a presentation.
+
+        Args:
+            presentation_id: UUID of the presentation
+            process_types: Stage name or names (entities, keywords, embeddings),
+                or a mapping of stage name to manifest fields stored with it
+
+        Returns:
+            Success status of the flush this triggered, or True if none ran
+        """
+        if isinstance(process_types, str):
+            process_types = [process_types]
+        if not isinstance(process_types, Mapping):
+            process_types = {process_type: {} for process_type in process_types}
+
+        processed_at = datetime.utcnow().isoformat()
+        with self._lock:
+            stages = self._pending[presentation_id]
+            for process_type, fields in process_types.items():
+                stages[process_type] = {**fields, 'processed': True, 'processed_at': processed_at}
+            should_flush = len(self._pending) >= self.flush_size
+
+        return self.flush() if should_flush else True
+
+    def flush(self) -> bool:
+        """Write all pending stages in a single call.
+
+        Returns:
+            Success status
+        """
+        with self._lock:
+            if not self._pending:
+                return True
+            pending, self._pending = self._pending, defaultdict(dict)
+
+        updates = [{'id': pid, 'stages': stages} for pid, stages in pending.items()]
+
+        try:
+            self.db.rpc('merge_nlp_processing', {'updates': updates})
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Error writing processing status for {len(updates)} presentations: {e}")
+
+            # Keep the stages so a later flush can retry them
+            with self._lock:
+                for pid, stages in pending.items():
+                    self._pending[pid] = {**stages, **self._pending.get(pid, {})}
+            return False
@@ -1,11 +1,15 @@
 """Supabase client for database operations."""
 
 import os
-from typing import Optional, Dict, Any, List
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Sequence
 from supabase import create_client, Client
 from dotenv import load_dotenv
 import logging
 
+from utils.profiling import profiler, timed
+
 # Load environment variables
 load_dotenv()
 
@@ -43,6 +47,7 @@ class SupabaseClient:
             self._setup_client()
         return self._client
     
+    @timed('db.insert')
     def insert(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Insert data into a table.
         
@@ -54,8 +59,10 @@ class SupabaseClient:
             Inserted data
         """
         result = self.client.table(table).insert(data).execute()
+        profiler.count('db.rows_written')
         return result.data[0] if result.data else None
     
+    @timed('db.batch_insert')
     def batch_insert(self, table: str, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Batch insert data into a table.
         
@@ -67,8 +74,10 @@ class SupabaseClient:
             List of inserted data
         """
         result = self.client.table(table).insert(data).execute()
+        profiler.count('db.rows_written', len(data))
         return result.data
     
+    @timed('db.update')
     def update(self, table: str, data: Dict[str, Any], match: Dict[str, Any]) -> Dict[str, Any]:
         """Update data in a table.
         
@@ -86,8 +95,10 @@ class SupabaseClient:
             query = query.eq(key, value)
             
         result = query.execute()
+        profiler.count('db.rows_written', len(result.data or []))
         return result.data[0] if result.data else None
     
+    @timed('db.select')
     def select(self, table: str, columns: str = "*", filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Select data from a table.
         
@@ -109,8 +120,10 @@ class SupabaseClient:
                     query = query.eq(key, value)
                     
         result = query.execute()
+        profiler.count('db.rows_read', len(result.data or []))
         return result.data
     
+    @timed('db.delete')
     def delete(self, table: str, match: Dict[str, Any]) -> bool:
         """Delete data from a table.
         
@@ -129,6 +142,7 @@ class SupabaseClient:
         result = query.execute()
         return True
     
+    @timed('db.upsert')
     def upsert(self, table: str, data: Dict[str, Any], on_conflict: str = None) -> Dict[str, Any]:
         """Upsert data into a table.
         
@@ -141,8 +155,95 @@ class SupabaseClient:
             Upserted data
         """
         result = self.client.table(table).upsert(data, on_conflict=on_conflict).execute()
+        profiler.count('db.rows_written')
         return result.data[0] if result.data else None
+
+    @timed('db.batch_upsert')
+    def batch_upsert(self, table: str, data: List[Dict[str, Any]], on_conflict: str = None) -> List[Dict[str, Any]]:
+        """Batch upsert data into a table.
+
+        Args:
+            table: Table name
+            data: List of data to upsert
+            on_conflict: Column(s) to check for conflicts
+
+        Returns:
+            List of upserted data
+        """
+        result = self.client.table(table).upsert(data, on_conflict=on_conflict).execute()
+        profiler.count('db.rows_written', len(data))
+        return result.data
+
+    @timed('db.bulk_upsert')
+    def bulk_upsert(self, table: str, data: List[Dict[str, Any]], on_conflict: str,
+                    chunk_size: int = 500, max_payload_bytes: int = 1_000_000,
+                    max_workers: int = 4) -> int:
+        """Upsert many rows in size-bounded chunks sent concurrently.
+        
+        Rows sharing the conflict key are collapsed (last one wins) first,
+        since Postgres rejects an upsert that touches the same row twice.
+        
+        Args:
+            table: Table name
+            data: Rows to upsert
+            on_conflict: Comma-separated natural-key columns
+            chunk_size: Maximum rows per request
+            max_payload_bytes: Approximate maximum JSON size per request
+            max_workers: Maximum concurrent requests
+            
+        Returns:
+            Number of rows sent
+        """
+        key_columns = [c.strip() for c in on_conflict.split(',')]
+        rows = list({tuple(row.get(c) for c in key_columns): row for row in data}.values())
+        
+        chunks = self.chunk_rows(rows, chunk_size, max_payload_bytes)
+        if not chunks:
+            return 0
+            
+        def send(chunk: List[Dict[str, Any]]) -> int:
+            self.client.table(table).upsert(chunk, on_conflict=on_conflict).execute()
+            profiler.count('db.rows_written', len(chunk))
+            return len(chunk)
+            
+        if len(chunks) == 1 or max_workers <= 1:
+            return sum(send(chunk) for chunk in chunks)
+            
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+            # list() re-raises the first failed chunk
+            return sum(list(executor.map(send, chunks)))
     
+    @staticmethod
+    def chunk_rows(rows: Sequence[Dict[str, Any]], chunk_size: int = 500,
+                   max_payload_bytes: int = 1_000_000) -> List[List[Dict[str, Any]]]:
+        """Split rows into chunks bounded by row count and JSON size.
+        
+        Args:
+            rows: Rows to split
+            chunk_size: Maximum rows per chunk
+            max_payload_bytes: Approximate maximum JSON size per chunk
+            
+        Returns:
+            List of row chunks (a single oversized row gets its own chunk)
+        """
+        chunks = []
+        current: List[Dict[str, Any]] = []
+        current_bytes = 0
+        
+        for row in rows:
+            row_bytes = len(json.dumps(row, default=str)) + 1
+            if current and (len(current) >= chunk_size or current_bytes + row_bytes > max_payload_bytes):
+                chunks.append(current)
+                current, current_bytes = [], 0
+            current.append(row)
+            current_bytes += row_bytes
+            
+        if current:
+            chunks.append(current)
+            
+        return chunks
+
+    @timed('db.rpc')
     def rpc(self, function_name: str, params: Optional[Dict[str, Any]] = None) -> Any:
         """Call a Postgres function.
         
@@ -154,4 +255,6 @@ class SupabaseClient:
             Function result
         """
         result = self.client.rpc(function_name, params or {}).execute()
+        # Writing functions take their rows as list parameters
+        profiler.count('db.rows_written', sum(len(v) for v in (params or {}).values() if isinstance(v, list)))
         return result.data
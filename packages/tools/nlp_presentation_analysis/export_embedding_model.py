@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Export the embedding model to ONNX (int8) and verify it against PyTorch."""
+
+import click
+import logging
+from datetime import datetime
+from typing import Optional
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from analyzers import EmbeddingGenerator
+from analyzers.onnx_backend import (
+    QUANTIZATION_CONFIGS, REFERENCE_SENTENCES, DEFAULT_EXPORT_DIR, default_model_dir,
+    export_onnx_model, load_onnx_model, cosine_agreement, measure_throughput, write_export_info
+)
+from sentence_transformers import SentenceTransformer
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+@click.command()
+@click.option('--model-name', help='Model to export (defaults to the --model-type model)')
+@click.option('--model-type', default='general', help='Model type: general, medical, similarity')
+@click.option('--output-dir', default=DEFAULT_EXPORT_DIR, help='Parent directory of exported models')
+@click.option('--quantization', default='avx512_vnni', type=click.Choice(QUANTIZATION_CONFIGS),
+              help='Instruction set the int8 model is quantized for')
+@click.option('--min-cosine', default=0.99, help='Lowest acceptable cosine to the PyTorch embedding')
+@click.option('--benchmark-repeat', default=16, help='Times the sample is repeated for the throughput check')
+def export_embedding_model(model_name: Optional[str], model_type: str, output_dir: str,
+                           quantization: str, min_cosine: float, benchmark_repeat: int):
+    """Export, verify and benchmark an ONNX Runtime embedding model."""
+
+    model_name = model_name or EmbeddingGenerator.MODELS.get(model_type, EmbeddingGenerator.MODELS['general'])
+    model_dir = default_model_dir(model_name, output_dir)
+
+    export_onnx_model(model_name, model_dir, quantization)
+
+    reference = SentenceTransformer(model_name, device='cpu')
+    sentences = REFERENCE_SENTENCES * benchmark_repeat
+
+    info = {
+        'model_name': model_name,
+        'exported_at': datetime.utcnow().isoformat(),
+        'min_cosine_required': min_cosine,
+        'agreement': {},
+        'sentences_per_sec': {'torch': round(measure_throughput(reference, sentences), 1)},
+        'verified': {}
+    }
+
+    for variant, variant_quantization in (('fp32', None), (quantization, quantization)):
+        candidate = load_onnx_model(model_dir, variant_quantization)
+        agreement = cosine_agreement(reference, candidate)
+
+        info['agreement'][variant] = {k: round(v, 5) for k, v in agreement.items()}
+        info['sentences_per_sec'][variant] = round(measure_throughput(candidate, sentences), 1)
+        info['verified'][variant] = agreement['min_cosine'] >= min_cosine
+
+    write_export_info(model_dir, info)
+
+    torch_rate = info['sentences_per_sec']['torch']
+    click.echo(f"{model_name} -> {model_dir}")
+    click.echo(f"  torch fp32:  {torch_rate:10.1f} sentences/s")
+    for variant in ('fp32', quantization):
+        rate = info['sentences_per_sec'][variant]
+        agreement = info['agreement'][variant]
+        status = 'ok' if info['verified'][variant] else 'FAILED'
+        click.echo(f"  onnx {variant:12s} {rate:10.1f} sentences/s ({rate / torch_rate:4.1f}x)  "
+                   f"cosine mean {agreement['mean_cosine']:.4f} min {agreement['min_cosine']:.4f}  {status}")
+
+    if not info['verified'][quantization]:
+        logger.error(f"int8 model disagrees with the reference (min cosine below {min_cosine}); "
+                     f"use the fp32 ONNX model or a different quantization preset")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    export_embedding_model()
@@ -12,6 +12,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 from analyzers import EmbeddingGenerator
 from db import PresentationQueries
 from models import Presentation
+from utils.embedding_codec import EMBEDDING_FORMATS
 
 logging.basicConfig(
     level=logging.INFO,
@@ -24,12 +25,22 @@ logger = logging.getLogger(__name__)
 @click.option('--all', 'process_all', is_flag=True, help='Generate embeddings for all presentations')
 @click.option('--missing', is_flag=True, help='Only process presentations without embeddings')
 @click.option('--model-type', default='general', help='Model type: general, medical, similarity')
+@click.option('--embedding-backend', default='torch', type=click.Choice(EmbeddingGenerator.BACKENDS),
+              help='Embedding inference backend (onnx needs export_embedding_model.py first)')
+@click.option('--onnx-model-dir', type=click.Path(file_okay=False),
+              help='Exported ONNX model directory (defaults to the export location)')
+@click.option('--quantization', help='Load the int8 ONNX model quantized for this preset, e.g. avx512_vnni')
+@click.option('--embedding-format', default='vector', type=click.Choice(EMBEDDING_FORMATS),
+              help='Embedding storage: pgvector column, or packed float32/float16/int8 (smaller payloads)')
 @click.option('--batch-size', default=10, help='Number of presentations to process at once')
-def generate_embeddings(process_all: bool, missing: bool, model_type: str, batch_size: int):
+def generate_embeddings(process_all: bool, missing: bool, model_type: str, embedding_backend: str,
+                        onnx_model_dir: Optional[str], quantization: Optional[str], embedding_format: str,
+                        batch_size: int):
     """Generate embeddings for presentations."""
     
-    queries = PresentationQueries()
-    embedding_generator = EmbeddingGenerator(model_type=model_type)
+    queries = PresentationQueries(status_flush_size=batch_size, embedding_format=embedding_format)
+    embedding_generator = EmbeddingGenerator(model_type=model_type, backend=embedding_backend,
+                                             onnx_model_dir=onnx_model_dir, quantization=quantization)
     
     # Get presentations
     if process_all:
@@ -48,33 +59,35 @@ def generate_embeddings(process_all: bool, missing: bool, model_type: str, batch
     logger.info(f"Processing {len(presentations)} presentations with {model_type} model")
     
     success_count = 0
-    for i in range(0, len(presentations), batch_size):
-        batch = presentations[i:i + batch_size]
-        
-        for pres_data in batch:
-            try:
-                pres = Presentation(**pres_data)
-                logger.info(f"Generating embedding for: {pres.title}")
-                
-                # Generate embedding
-                embedding = embedding_generator.generate_presentation_embedding(
-                    title=pres.title or "",
-                    summary=pres.summary or "",
-                    transcript=pres.transcript_text or ""
-                )
-                
-                # Save embedding
-                queries.save_presentation_embedding(
-                    pres.id,
-                    embedding.tolist(),
-                    embedding_generator.model_name
-                )
-                
-                success_count += 1
-                
-            except Exception as e:
-                logger.error(f"Error processing presentation {pres_data['id']}: {e}")
-                
+    # Buffered processing status is flushed on the way out, even on errors or Ctrl-C
+    with queries.status_writer:
+        for i in range(0, len(presentations), batch_size):
+            batch = presentations[i:i + batch_size]
+            
+            for pres_data in batch:
+                try:
+                    pres = Presentation(**pres_data)
+                    logger.info(f"Generating embedding for: {pres.title}")
+                    
+                    # Generate embedding
+                    embedding = embedding_generator.generate_presentation_embedding(
+                        title=pres.title or "",
+                        summary=pres.summary or "",
+                        transcript=pres.transcript_text or ""
+                    )
+                    
+                    # Save embedding
+                    queries.save_presentation_embedding(
+                        pres.id,
+                        embedding,
+                        embedding_generator.model_name
+                    )
+                    
+                    success_count += 1
+                    
+                except Exception as e:
+                    logger.error(f"Error processing presentation {pres_data['id']}: {e}")
+                    
     logger.info(f"Successfully generated {success_count} embeddings")
 
 
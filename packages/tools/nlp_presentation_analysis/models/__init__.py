@@ -1,9 +1,11 @@
 """Data models for presentation analysis."""
 
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
+from typing import Iterator, List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
+from utils import clean_text, iter_text_windows
+
 @dataclass
 class Presentation:
     """Presentation data model."""
@@ -13,6 +15,7 @@ class Presentation:
     transcript_text: Optional[str] = None
     created_at: Optional[datetime] = None
     metadata: Optional[Dict[str, Any]] = None
+    nlp_input_hash: Optional[str] = None  # computed by the database (see pipeline.manifest.hash_text)
     
     def __post_init__(self):
         """Convert string dates to datetime."""
@@ -38,13 +41,37 @@ class Presentation:
         """Get text optimized for analysis."""
         # Prioritize summary and transcript
         if self.summary and self.transcript_text:
-            return f"{self.summary}\n\n{self.transcript_text[:5000]}"  # Limit transcript length
+            return f"{self.summary}\n\n{self.transcript_text}"
         elif self.transcript_text:
-            return self.transcript_text[:8000]
+            return self.transcript_text
         elif self.summary:
             return self.summary
         else:
             return self.title
+    
+    def get_clean_analysis_text(self) -> str:
+        """Get the analysis text as the analyzers see it (see utils.clean_text).
+        
+        Entity offsets index into this text, not the raw analysis text.
+        """
+        return clean_text(self.get_analysis_text() or "")
+    
+    def iter_analysis_windows(self, window_size: int = 5000) -> Iterator[Tuple[int, str]]:
+        """Stream the cleaned analysis text in bounded-size windows.
+        
+        The text is cleaned once before windowing, so cleaning a window again
+        (analyzer preprocessing) leaves it unchanged and positions within a
+        window plus its offset are positions in get_clean_analysis_text().
+        Windows break at sentence boundaries and do not overlap, so counts
+        merged across windows are not double-counted.
+        
+        Args:
+            window_size: Maximum window size in characters
+            
+        Yields:
+            (offset, window_text) pairs covering the whole cleaned text
+        """
+        yield from iter_text_windows(self.get_clean_analysis_text(), window_size, overlap=0)
 
 
 @dataclass
@@ -0,0 +1,14 @@
+"""Concurrent pipeline utilities for presentation analysis."""
+
+from .staged_pipeline import StagedPipeline, StageStats
+from .manifest import AnalysisPlan, AnalysisPlanner, STAGES, hash_text, stage_input_hash
+
+__all__ = [
+    'StagedPipeline',
+    'StageStats',
+    'AnalysisPlan',
+    'AnalysisPlanner',
+    'STAGES',
+    'hash_text',
+    'stage_input_hash'
+]
@@ -0,0 +1,180 @@
+"""Per-presentation analysis manifest and incremental re-analysis planning."""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, Set
+import hashlib
+import logging
+
+from models import Presentation
+
+logger = logging.getLogger(__name__)
+
+# Analysis stages recorded in presentations.metadata.nlp_processing
+STAGES = ('entities', 'keywords', 'embeddings')
+
+# Manifest fields that must match for a stage to be up to date
+_MANIFEST_KEYS = ('input_hash', 'analyzer', 'version', 'model')
+
+
+def hash_text(*parts: Optional[str]) -> str:
+    """Hash one or more text fields like the presentations.nlp_input_hash column.
+
+    Must stay in sync with the generated column in setup_tables.sql:
+    md5 of the fields joined by U+001F (so ('ab', '') != ('a', 'b')).
+
+    Args:
+        parts: Text fields (None is treated as empty)
+
+    Returns:
+        Hex MD5 digest
+    """
+    return hashlib.md5('\x1f'.join(part or '' for part in parts).encode('utf-8')).hexdigest()
+
+
+def stage_input_hash(pres: Presentation, stage: str) -> str:
+    """Hash the text a stage analyzes.
+
+    All stages share one hash over title, summary and transcript, which the
+    database computes (nlp_input_hash), so planning never needs the text.
+    It is only computed here for records fetched without that column.
+
+    Args:
+        pres: Presentation
+        stage: One of STAGES
+
+    Returns:
+        Input hash for the stage
+    """
+    return pres.nlp_input_hash or hash_text(pres.title, pres.summary, pres.transcript_text)
+
+
+@dataclass
+class AnalysisPlan:
+    """Stages to run for one presentation."""
+    presentation: Presentation
+    stages: Set[str]
+    manifest: Dict[str, Dict[str, str]] = field(default_factory=dict)  # entry to record per stage
+
+    def needs(self, stage: str) -> bool:
+        return stage in self.stages
+
+
+class AnalysisPlanner:
+    """Schedule only the (presentation, analyzer) pairs whose inputs or versions changed.
+
+    Each completed stage is recorded in the presentation's nlp_processing
+    metadata with the hash of its input text and the analyzer name, version
+    and model. A stage is stale when that entry is missing, predates the
+    manifest (no input hash), or differs from the current text or analyzer.
+
+    Staleness only needs each presentation's id, nlp_input_hash and
+    manifest, so incremental runs scan those with iter_stale() and fetch the
+    text of the stale presentations alone.
+    """
+
+    def __init__(self, analyzers: Mapping[str, Any], force: bool = False):
+        """Initialize the planner.
+
+        Args:
+            analyzers: Active analyzer per stage (entities, keywords, embeddings)
+            force: Schedule every active stage regardless of the manifest
+        """
+        unknown = set(analyzers) - set(STAGES)
+        if unknown:
+            raise ValueError(f"Unknown analysis stages: {', '.join(sorted(unknown))}")
+
+        self.force = force
+        self.versions = {stage: analyzer.version_info() for stage, analyzer in analyzers.items()}
+
+    def plan(self, pres: Presentation,
+             manifest: Optional[Mapping[str, Any]] = None) -> AnalysisPlan:
+        """Work out which active stages are stale for a presentation.
+
+        Args:
+            pres: Presentation
+            manifest: Its recorded nlp_processing entries (defaults to the
+                ones in pres.metadata)
+
+        Returns:
+            Plan with the stale stages and the manifest entries to record
+        """
+        if manifest is None:
+            manifest = (pres.metadata or {}).get('nlp_processing') or {}
+
+        plan = AnalysisPlan(presentation=pres, stages=set())
+        for stage, version in self.versions.items():
+            entry = {'input_hash': stage_input_hash(pres, stage), **version}
+            plan.manifest[stage] = entry
+            if self.force or self.is_stale(manifest.get(stage), entry):
+                plan.stages.add(stage)
+
+        return plan
+
+    def iter_stale(self, records: Iterable[Mapping[str, Any]]) -> Iterator[str]:
+        """Find presentations with a stale stage from their hashes alone.
+
+        Args:
+            records: Records with id, nlp_input_hash and an 'nlp_processing'
+                manifest column (no text needed)
+
+        Yields:
+            IDs of presentations with at least one stage to run
+        """
+        scanned = 0
+        stale = 0
+        for record in records:
+            scanned += 1
+            manifest = record.get('nlp_processing') or {}
+            if self.force or any(
+                self.is_stale(manifest.get(stage), {'input_hash': record.get('nlp_input_hash'), **version})
+                for stage, version in self.versions.items()
+            ):
+                stale += 1
+                yield record['id']
+
+        logger.info(f"Found {stale} of {scanned} scanned presentations with stale analysis")
+
+    def iter_plans(self, presentations: Iterable[Dict[str, Any]]) -> Iterator[AnalysisPlan]:
+        """Plan presentation records, yielding only those with stale stages.
+
+        Args:
+            presentations: Presentation records, with their manifest either in
+                an 'nlp_processing' column or inside 'metadata'
+
+        Yields:
+            Plans with at least one stage to run
+        """
+        scanned = 0
+        scheduled = 0
+        for pres_data in presentations:
+            pres_data = dict(pres_data)
+            manifest = pres_data.pop('nlp_processing', None)
+            scanned += 1
+            try:
+                pres = Presentation(**pres_data)
+            except Exception as e:
+                logger.error(f"Error loading presentation {pres_data.get('id')}: {e}")
+                continue
+
+            plan = self.plan(pres, manifest)
+            if plan.stages:
+                scheduled += 1
+                yield plan
+
+        logger.info(f"Planned {scheduled} of {scanned} scanned presentations for analysis")
+
+    @staticmethod
+    def is_stale(recorded: Optional[Mapping[str, Any]], current: Mapping[str, str]) -> bool:
+        """Check a recorded manifest entry against the current one.
+
+        Args:
+            recorded: Recorded entry for a stage, if any
+            current: Entry the current text and analyzer would produce
+
+        Returns:
+            True if the stage must be re-run
+        """
+        if not recorded or not recorded.get('processed'):
+            return True
+        # Entries written before the manifest carry no input hash and are stale
+        return any(recorded.get(key) != current[key] for key in _MANIFEST_KEYS)
@@ -0,0 +1,296 @@
+"""Multi-stage pipeline with worker threads connected by bounded queues."""
+
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+import logging
+import queue
+import threading
+import time
+
+from utils.profiling import profiler
+
+logger = logging.getLogger(__name__)
+
+# Sentinel telling a worker that its input is exhausted
+_DONE = object()
+
+
+@dataclass
+class StageStats:
+    """Throughput counters for one pipeline stage."""
+    name: str
+    workers: int
+    processed: int = 0
+    dropped: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+    queue_depth: int = 0
+    queue_capacity: int = 0
+
+    def to_dict(self, elapsed: float) -> Dict[str, Any]:
+        """Convert to a dictionary with derived rates.
+
+        Args:
+            elapsed: Wall-clock seconds since the pipeline started
+
+        Returns:
+            Stats dictionary including items/sec and worker utilization
+        """
+        stats = asdict(self)
+        stats['items_per_sec'] = round(self.processed / elapsed, 3) if elapsed > 0 else 0.0
+        stats['utilization'] = (
+            round(self.busy_seconds / (elapsed * self.workers), 3) if elapsed > 0 else 0.0
+        )
+        return stats
+
+
+class _Stage:
+    """A named step with its own input queue and worker threads."""
+
+    def __init__(self, name: str, func: Callable[[Any], Any], workers: int, queue_size: int,
+                 streaming: bool = False):
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.streaming = streaming
+        self.input: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.stats = StageStats(name=name, workers=workers, queue_capacity=queue_size)
+        self.lock = threading.Lock()
+        self.finished_workers = 0
+
+
+class StagedPipeline:
+    """Run items through stages concurrently, connected by bounded queues.
+
+    Each stage has its own worker threads, so network I/O in one stage
+    overlaps with CPU work in another. Bounded queues apply backpressure:
+    a fast stage blocks instead of buffering the whole backlog in memory.
+    A stage function returns the item for the next stage, or None to drop
+    it; exceptions are logged and the item is dropped. A stream stage
+    instead maps the whole item stream, for steps that batch across items.
+    """
+
+    def __init__(self, queue_size: int = 8, report_interval: float = 30.0):
+        """Initialize the pipeline.
+
+        Args:
+            queue_size: Capacity of each inter-stage queue
+            report_interval: Seconds between progress log lines (0 disables)
+        """
+        self.queue_size = queue_size
+        self.report_interval = report_interval
+        self.stages: List[_Stage] = []
+        self.source_stats = StageStats(name='source', workers=1)
+        self.results: List[Any] = []
+        self._results_lock = threading.Lock()
+        self._started_at: Optional[float] = None
+        self._finished = threading.Event()
+
+    def add_stage(self, name: str, func: Callable[[Any], Any], workers: int = 1) -> 'StagedPipeline':
+        """Append a stage.
+
+        Args:
+            name: Stage name used in stats
+            func: Function applied to each item
+            workers: Number of worker threads
+
+        Returns:
+            The pipeline, for chaining
+        """
+        self.stages.append(_Stage(name, func, max(1, workers), self.queue_size))
+        return self
+
+    def add_stream_stage(self, name: str,
+                         func: Callable[[Iterator[Any]], Iterable[Any]]) -> 'StagedPipeline':
+        """Append a single-worker stage that maps the whole item stream.
+
+        func receives an iterator over the stage's input and yields one
+        output (or None to drop it) per item, in order; it may read ahead of
+        its outputs, e.g. to batch items through nlp.pipe. An exception it
+        raises ends the stage, and the remaining input is dropped.
+
+        Args:
+            name: Stage name used in stats
+            func: Generator function over the input items
+
+        Returns:
+            The pipeline, for chaining
+        """
+        self.stages.append(_Stage(name, func, 1, self.queue_size, streaming=True))
+        return self
+
+    def run(self, source: Iterable[Any]) -> List[Any]:
+        """Feed items from source through all stages and wait for completion.
+
+        Args:
+            source: Iterable of input items (consumed on a dedicated thread)
+
+        Returns:
+            Non-None outputs of the last stage
+        """
+        if not self.stages:
+            raise ValueError("Pipeline has no stages")
+
+        self._started_at = time.perf_counter()
+        self._finished.clear()
+
+        threads = [threading.Thread(target=self._feed, args=(source,), name='pipeline-source', daemon=True)]
+        for index, stage in enumerate(self.stages):
+            for i in range(stage.workers):
+                threads.append(threading.Thread(
+                    target=self._work,
+                    args=(index,),
+                    name=f"pipeline-{stage.name}-{i}",
+                    daemon=True
+                ))
+
+        monitor = None
+        if self.report_interval > 0:
+            monitor = threading.Thread(target=self._monitor, name='pipeline-monitor', daemon=True)
+            monitor.start()
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self._finished.set()
+        if monitor:
+            monitor.join()
+
+        return self.results
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Snapshot per-stage throughput and queue depth.
+
+        Returns:
+            One stats dictionary per stage, source first
+        """
+        elapsed = time.perf_counter() - self._started_at if self._started_at else 0.0
+        snapshots = [self.source_stats.to_dict(elapsed)]
+        for stage in self.stages:
+            with stage.lock:
+                stage.stats.queue_depth = stage.input.qsize()
+                snapshots.append(stage.stats.to_dict(elapsed))
+        return snapshots
+
+    def log_stats(self, level: int = logging.INFO):
+        """Log a one-line summary per stage.
+
+        Args:
+            level: Logging level
+        """
+        for stats in self.stats():
+            logger.log(
+                level,
+                f"  {stats['name']:<10} processed={stats['processed']:<6} "
+                f"rate={stats['items_per_sec']:.2f}/s errors={stats['errors']} "
+                f"queue={stats['queue_depth']}/{stats['queue_capacity']} "
+                f"utilization={stats['utilization']:.0%}"
+            )
+
+    def _feed(self, source: Iterable[Any]):
+        """Push source items into the first stage."""
+        first = self.stages[0]
+        try:
+            for item in source:
+                self.source_stats.processed += 1
+                first.input.put(item)
+        except Exception as e:
+            self.source_stats.errors += 1
+            logger.error(f"Pipeline source failed: {e}")
+        finally:
+            for _ in range(first.workers):
+                first.input.put(_DONE)
+
+    def _work(self, index: int):
+        """Worker loop for stage index."""
+        stage = self.stages[index]
+        next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+
+        if stage.streaming:
+            self._work_stream(stage, next_stage)
+        else:
+            while True:
+                item = stage.input.get()
+                if item is _DONE:
+                    break
+
+                start = time.perf_counter()
+                try:
+                    output = stage.func(item)
+                    error = False
+                except Exception as e:
+                    logger.error(f"Stage {stage.name} failed: {e}")
+                    output = None
+                    error = True
+                self._emit(stage, next_stage, output, time.perf_counter() - start, error)
+
+        # The last worker of a stage to finish closes the next stage
+        with stage.lock:
+            stage.finished_workers += 1
+            last = stage.finished_workers == stage.workers
+        if last and next_stage:
+            for _ in range(next_stage.workers):
+                next_stage.input.put(_DONE)
+
+    def _work_stream(self, stage: _Stage, next_stage: Optional[_Stage]):
+        """Run a stream stage's generator over its input queue."""
+        waited = [0.0]
+
+        def inputs() -> Iterator[Any]:
+            while True:
+                start = time.perf_counter()
+                item = stage.input.get()
+                waited[0] += time.perf_counter() - start
+                if item is _DONE:
+                    return
+                yield item
+
+        items = inputs()
+        outputs = iter(stage.func(items))
+        while True:
+            start = time.perf_counter()
+            waited[0] = 0.0
+            try:
+                output = next(outputs)
+            except StopIteration:
+                break
+            except Exception as e:
+                logger.error(f"Stage {stage.name} failed: {e}")
+                with stage.lock:
+                    stage.stats.errors += 1
+                # Drain the input so upstream stages are not blocked
+                for _ in items:
+                    pass
+                break
+            # Time spent waiting for input is not busy time
+            self._emit(stage, next_stage, output, time.perf_counter() - start - waited[0], False)
+
+    def _emit(self, stage: _Stage, next_stage: Optional[_Stage], output: Any,
+              elapsed: float, error: bool):
+        """Record one processed item and pass its output on."""
+        profiler.record(f"stage.{stage.name}", elapsed)
+
+        with stage.lock:
+            stage.stats.busy_seconds += elapsed
+            if error:
+                stage.stats.errors += 1
+            elif output is None:
+                stage.stats.dropped += 1
+            else:
+                stage.stats.processed += 1
+
+        if output is None:
+            return
+        if next_stage:
+            next_stage.input.put(output)
+        else:
+            with self._results_lock:
+                self.results.append(output)
+
+    def _monitor(self):
+        """Periodically log stage stats until the pipeline finishes."""
+        while not self._finished.wait(self.report_interval):
+            logger.info("Pipeline progress:")
+            self.log_stats()
@@ -46,6 +46,35 @@ CREATE TABLE IF NOT EXISTS presentation_embeddings (
     INDEX idx_presentation_embeddings_vector (embedding vector_cosine_ops)
 );
 
+-- Compact embedding storage (see utils/embedding_codec.py): base64 of
+-- little-endian float32/float16 values, or of a float32 scale followed by int8
+-- values. Rows with embedding_format set are read from embedding_packed; the
+-- pgvector column (and find_similar_presentations below) is left NULL for them.
+ALTER TABLE presentation_embeddings ADD COLUMN IF NOT EXISTS embedding_packed TEXT;
+ALTER TABLE presentation_embeddings ADD COLUMN IF NOT EXISTS embedding_format TEXT
+    CHECK (embedding_format IN ('float32', 'float16', 'int8'));
+
+-- Server-side write time for incremental snapshot syncs (created_at is set by
+-- the writing client, whose clock may lag). Existing rows get the migration time.
+ALTER TABLE presentation_embeddings ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT NOW();
+CREATE INDEX IF NOT EXISTS idx_presentation_embeddings_updated_at
+    ON presentation_embeddings(updated_at);
+
+CREATE OR REPLACE FUNCTION set_updated_at()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_presentation_embeddings_updated_at ON presentation_embeddings;
+CREATE TRIGGER trg_presentation_embeddings_updated_at
+    BEFORE INSERT OR UPDATE ON presentation_embeddings
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
 -- Store topic clusters
 CREATE TABLE IF NOT EXISTS topic_clusters (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -68,6 +97,18 @@ CREATE TABLE IF NOT EXISTS presentation_topics (
     UNIQUE(presentation_id, cluster_id)
 );
 
+-- Store precomputed related presentations (see compute_similarities.py)
+CREATE TABLE IF NOT EXISTS presentation_similarities (
+    presentation_id UUID REFERENCES presentations(id) ON DELETE CASCADE,
+    similar_presentation_id UUID REFERENCES presentations(id) ON DELETE CASCADE,
+    similarity_score FLOAT NOT NULL,
+    rank INTEGER NOT NULL,
+    model_name TEXT,
+    computed_at TIMESTAMPTZ DEFAULT NOW(),
+
+    PRIMARY KEY (presentation_id, rank)
+);
+
 -- Create function to find similar presentations using pgvector
 CREATE OR REPLACE FUNCTION find_similar_presentations(
     target_presentation_id UUID,
@@ -102,6 +143,87 @@ BEGIN
 END;
 $$;
 
+-- Natural keys so re-analysis upserts instead of duplicating rows.
+-- extraction_method is part of the keyword key; unique indexes treat NULLs as
+-- distinct, so it must not be NULL for rows to conflict.
+UPDATE presentation_keywords SET extraction_method = '' WHERE extraction_method IS NULL;
+ALTER TABLE presentation_keywords ALTER COLUMN extraction_method SET DEFAULT '';
+ALTER TABLE presentation_keywords ALTER COLUMN extraction_method SET NOT NULL;
+
+-- Earlier re-runs inserted duplicates; keep the lowest id of each key first,
+-- or the unique indexes cannot be built.
+DELETE FROM presentation_entities a
+USING presentation_entities b
+WHERE a.presentation_id = b.presentation_id
+  AND a.entity_type = b.entity_type
+  AND a.entity_text = b.entity_text
+  AND a.id > b.id;
+
+DELETE FROM presentation_keywords a
+USING presentation_keywords b
+WHERE a.presentation_id = b.presentation_id
+  AND a.extraction_method = b.extraction_method
+  AND a.keyword = b.keyword
+  AND a.id > b.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_presentation_entities_natural
+    ON presentation_entities(presentation_id, entity_type, entity_text);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_presentation_keywords_natural
+    ON presentation_keywords(presentation_id, extraction_method, keyword);
+
+-- Generation of a replacing save: new rows are upserted in chunks tagged with
+-- a fresh analysis_run_id, then rows of other generations are deleted in one
+-- statement, so an interrupted save never leaves a presentation without rows
+ALTER TABLE presentation_entities ADD COLUMN IF NOT EXISTS analysis_run_id UUID;
+ALTER TABLE presentation_keywords ADD COLUMN IF NOT EXISTS analysis_run_id UUID;
+
+-- Superseded by the generation swap above (payloads stay bounded)
+DROP FUNCTION IF EXISTS replace_presentation_entities(UUID, JSONB);
+DROP FUNCTION IF EXISTS replace_presentation_keywords(UUID, JSONB);
+
+-- Hash of the text the analyzers read, computed in the database so incremental
+-- runs can find changed presentations without downloading transcripts.
+-- Must match pipeline/manifest.py hash_text(title, summary, transcript_text).
+ALTER TABLE presentations ADD COLUMN IF NOT EXISTS nlp_input_hash TEXT
+    GENERATED ALWAYS AS (md5(
+        coalesce(title, '') || chr(31) || coalesce(summary, '') || chr(31) || coalesce(transcript_text, '')
+    )) STORED;
+
+-- Merge NLP processing status into presentation metadata in one statement.
+-- updates: [{"id": "<uuid>", "stages": {"entities": {"processed": true, "processed_at": "..."}, ...}}]
+CREATE OR REPLACE FUNCTION merge_nlp_processing(updates JSONB)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    updated_count INTEGER;
+BEGIN
+    WITH merged AS (
+        SELECT
+            p.id,
+            COALESCE(p.metadata, '{}'::jsonb)
+                || jsonb_build_object(
+                    'nlp_processing',
+                    COALESCE(p.metadata->'nlp_processing', '{}'::jsonb) || (u->'stages')
+                ) AS metadata
+        FROM presentations p
+        JOIN jsonb_array_elements(updates) AS u ON p.id = (u->>'id')::uuid
+    )
+    UPDATE presentations p
+    SET metadata = CASE
+        WHEN m.metadata->'nlp_processing' ?& ARRAY['entities', 'keywords', 'embeddings']
+             AND COALESCE(m.metadata->>'nlp_processed', 'false') <> 'true'
+        THEN m.metadata || jsonb_build_object('nlp_processed', true, 'nlp_processed_at', now())
+        ELSE m.metadata
+    END
+    FROM merged m
+    WHERE p.id = m.id;
+
+    GET DIAGNOSTICS updated_count = ROW_COUNT;
+    RETURN updated_count;
+END;
+$$;
+
 -- Create view for presentation analysis summary
 CREATE OR REPLACE VIEW presentation_analysis_summary AS
 SELECT 
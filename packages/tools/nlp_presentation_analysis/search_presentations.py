@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Search transcripts of all presentations with hybrid semantic and keyword ranking."""
+
+import click
+import json
+import logging
+import time
+from typing import Optional
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from analyzers import EmbeddingGenerator, SearchIndex
+from analyzers.search_index import SEARCH_MODES
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+@click.command()
+@click.argument('query')
+@click.option('--index-path', default='data/search_index', help='Index directory (see build_search_index.py)')
+@click.option('--top-k', default=10, help='Number of results')
+@click.option('--mode', default='hybrid', type=click.Choice(SEARCH_MODES),
+              help='Fuse embedding and BM25 rankings, or use one of them')
+@click.option('--candidates', default=100, help='Chunks taken from each ranking before fusion')
+@click.option('--max-per-presentation', default=3, help='Results kept per presentation (0 for no limit)')
+@click.option('--embedding-backend', default='torch', type=click.Choice(EmbeddingGenerator.BACKENDS),
+              help='Embedding inference backend for the query (onnx loads faster)')
+@click.option('--onnx-model-dir', type=click.Path(file_okay=False),
+              help='Exported ONNX model directory (defaults to the export location)')
+@click.option('--quantization', help='Load the int8 ONNX model quantized for this preset, e.g. avx512_vnni')
+@click.option('--json', 'as_json', is_flag=True, help='Print results as JSON')
+def search_presentations(query: str, index_path: str, top_k: int, mode: str, candidates: int,
+                         max_per_presentation: int, embedding_backend: str, onnx_model_dir: Optional[str],
+                         quantization: Optional[str], as_json: bool):
+    """Find the presentations and moments that best match QUERY."""
+
+    index = SearchIndex(index_path)
+
+    query_embedding = None
+    if mode != 'keyword':
+        # The query must be embedded by the model the index was built with
+        embedding_generator = EmbeddingGenerator(model_name=index.model_name, backend=embedding_backend,
+                                                 onnx_model_dir=onnx_model_dir, quantization=quantization)
+        query_embedding = embedding_generator.model.encode([query], convert_to_numpy=True)[0]
+
+    start = time.perf_counter()
+    results = index.search(query, query_embedding, top_k=top_k, mode=mode, candidates=candidates,
+                           max_per_presentation=max_per_presentation)
+    elapsed = time.perf_counter() - start
+
+    if as_json:
+        click.echo(json.dumps(results, indent=2))
+        return
+
+    logger.info(f"Searched {len(index)} chunks in {elapsed * 1000:.1f} ms")
+    for rank, result in enumerate(results, start=1):
+        where = result['timestamp'] or f"char {result['offset']}"
+        snippet = ' '.join(result['chunk_text'].split())[:160]
+        click.echo(f"{rank:2d}. [{where}] {result['title']} ({result['presentation_id']})")
+        click.echo(f"    {snippet}...")
+
+
+if __name__ == '__main__':
+    search_presentations()
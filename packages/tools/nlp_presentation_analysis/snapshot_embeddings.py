@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""Export presentation embeddings to a local memory-mapped snapshot."""
+
+import click
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from db import PresentationQueries
+from utils.embedding_snapshot import EmbeddingSnapshot
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+@click.command()
+@click.option('--path', default='data/embedding_snapshot', help='Snapshot base path (.npy and .json are added)')
+@click.option('--rebuild', is_flag=True, help='Refetch every embedding (drops embeddings deleted upstream)')
+@click.option('--page-size', default=1000, help='Rows fetched per request')
+def snapshot_embeddings(path: str, rebuild: bool, page_size: int):
+    """Create or incrementally update the local embedding snapshot."""
+
+    queries = PresentationQueries()
+    snapshot = EmbeddingSnapshot(path)
+
+    try:
+        updated, appended = snapshot.sync(queries, rebuild=rebuild, page_size=page_size)
+    except Exception as e:
+        logger.error(f"Error syncing embedding snapshot: {e}")
+        sys.exit(1)
+
+    dim = snapshot.embeddings.shape[1] if len(snapshot) else 0
+    click.echo(f"{snapshot.matrix_path}: {len(snapshot)} embeddings x {dim} dimensions "
+               f"({updated} updated, {appended} appended, synced to {snapshot.synced_at})")
+
+
+if __name__ == '__main__':
+    snapshot_embeddings()
@@ -2,12 +2,19 @@
 """Test the analyzers with sample text."""
 
 import sys
+import tempfile
 from pathlib import Path
 
+import numpy as np
+
 sys.path.insert(0, str(Path(__file__).parent))
 
 from analyzers import EntityExtractor, KeywordExtractor, EmbeddingGenerator
 from utils import clean_text, extract_medical_abbreviations, normalize_medical_terms
+from utils.term_matcher import TermMatcher
+from utils.embedding_codec import encode_embedding, decode_embedding, decode_embeddings
+from utils.embedding_snapshot import EmbeddingSnapshot, _append_rows
+from models import Presentation
 
 # Sample medical text for testing
 SAMPLE_TEXT = """
@@ -50,6 +57,34 @@ def test_entity_extraction():
         print(f"  - {phrase}")
 
 
+def test_windowed_entity_offsets():
+    """Test that entity offsets from windowed analysis index the cleaned text."""
+    print("\n" + "=" * 50)
+    print("TESTING WINDOWED ENTITY OFFSETS")
+    print("=" * 50)
+    
+    # Whitespace runs and a ligature change length when cleaned
+    messy_text = SAMPLE_TEXT.replace(". ", ".\n\n   ") + "\n\nDr. Müller at the Café Zürich clinic \ufb01led a report."
+    pres = Presentation(id='test', title='Offsets', transcript_text=messy_text)
+    
+    extractor = EntityExtractor()
+    state = extractor.new_state()
+    for offset, window in pres.iter_analysis_windows(window_size=300):
+        extractor.accumulate(state, extractor.parse(window), offset)
+    entities = extractor.finalize(state)
+    
+    text = pres.get_clean_analysis_text()
+    checked = 0
+    for entity_type, values in entities.items():
+        if entity_type in ('metadata', 'key_phrases'):
+            continue
+        for entity in values:
+            assert text[entity['start']:entity['end']] == entity['text'], entity
+            checked += 1
+            
+    print(f"\nAll {checked} entity offsets match the cleaned text")
+
+
 def test_keyword_extraction():
     """Test keyword extraction."""
     print("\n" + "=" * 50)
@@ -95,6 +130,14 @@ def test_embedding_generation():
     print(f"\nSimilarity scores:")
     print(f"  '{text1}' vs '{text2}': {sim1_2:.3f}")
     print(f"  '{text1}' vs '{text3}': {sim1_3:.3f}")
+    
+    # Test chunk index search
+    index = generator.build_chunk_index(SAMPLE_TEXT, chunk_size=200, overlap=50)
+    matches = generator.find_similar_chunks("energy production in cells", index, top_k=2)
+    
+    print(f"\nChunk search over {len(index)} chunks:")
+    for match in matches:
+        print(f"  - [{match['similarity']:.3f}] {match['chunk_text'][:60]}...")
 
 
 def test_utilities():
@@ -112,6 +155,124 @@ def test_utilities():
     normalized = normalize_medical_terms(test_text)
     print(f"\nOriginal: {test_text}")
     print(f"Normalized: {normalized}")
+    
+    # Test multi-term matching
+    matcher = TermMatcher({'ATP': 'adenosine triphosphate', 'HPA axis': 'hypothalamic-pituitary-adrenal axis'},
+                          whole_words=True)
+    print("\nVocabulary matches:")
+    for match in matcher.find_all(SAMPLE_TEXT):
+        print(f"  - [{match.start}:{match.end}] {match.term} -> {match.value}")
+        
+    assert normalized == "The patient received 50mg vitamin D and 10ml of prescription medications", normalized
+    assert {'ATP', 'NAC', 'ME/CFS', 'CoQ10'} <= set(abbrevs), abbrevs
+    
+    # Terms differing only by case must not silently drop a replacement
+    try:
+        TermMatcher({'ATP': 'adenosine triphosphate', 'atp': 'ATP synthase'})
+    except ValueError:
+        print("\nCase-only term collision rejected")
+    else:
+        raise AssertionError("Terms differing only by case were accepted")
+
+
+def test_embedding_codec():
+    """Test that packed embeddings round-trip within each format's precision."""
+    print("\n" + "=" * 50)
+    print("TESTING EMBEDDING CODEC")
+    print("=" * 50)
+    
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(5, 384)).astype(np.float32)
+    
+    for fmt, tolerance in [('float32', 0.0), ('float16', 2e-3), ('int8', None)]:
+        packed = [encode_embedding(vector, fmt) for vector in vectors]
+        decoded = decode_embeddings(packed, fmt)
+        assert decoded.shape == vectors.shape and decoded.dtype == np.float32, (fmt, decoded.shape)
+        assert np.array_equal(decode_embedding(packed[2], fmt), decoded[2]), fmt
+        
+        error = np.abs(decoded - vectors)
+        if fmt == 'int8':
+            # Rounding to the per-vector scale loses at most half a step
+            scales = np.abs(vectors).max(axis=1, keepdims=True) / 127
+            assert np.all(error <= scales / 2 + 1e-6), fmt
+        else:
+            assert np.all(error <= tolerance * np.maximum(1.0, np.abs(vectors))), fmt
+        print(f"  {fmt:<8} {len(packed[0]):>5} chars/vector, max error {error.max():.5f}")
+        
+    # A zero vector has no scale to divide by
+    assert np.array_equal(decode_embedding(encode_embedding(np.zeros(8), 'int8'), 'int8'), np.zeros(8))
+    assert decode_embeddings([], 'int8').shape == (0, 0)
+    try:
+        encode_embedding(vectors[0], 'bfloat16')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Unknown format was accepted")
+
+
+class _SnapshotQueries:
+    """Stands in for PresentationQueries.get_embeddings_since in snapshot tests."""
+    
+    def __init__(self):
+        self.rows = []
+        self.matrix = np.zeros((0, 0), dtype=np.float32)
+        self.since = []
+        
+    def get_embeddings_since(self, since=None, page_size=1000):
+        self.since.append(since)
+        return self.rows, self.matrix
+
+
+def test_embedding_snapshot():
+    """Test that snapshot syncs update rows in place and append new ones."""
+    print("\n" + "=" * 50)
+    print("TESTING EMBEDDING SNAPSHOT")
+    print("=" * 50)
+    
+    def rows(ids, updated_at):
+        return [{'presentation_id': pid, 'model_name': 'test-model', 'updated_at': updated_at} for pid in ids]
+        
+    with tempfile.TemporaryDirectory() as tmp:
+        queries = _SnapshotQueries()
+        first = np.arange(12, dtype=np.float32).reshape(3, 4)
+        queries.rows, queries.matrix = rows(['a', 'b', 'c'], '2024-01-01T00:00:00+00:00'), first
+        
+        snapshot = EmbeddingSnapshot(Path(tmp) / 'snapshot')
+        assert snapshot.sync(queries) == (0, 3)
+        assert queries.since == [None]
+        assert snapshot.presentation_ids == ['a', 'b', 'c']
+        assert np.array_equal(snapshot.embeddings, first)
+        
+        # 'b' changed, 'd' and 'e' are new
+        changed = np.full((3, 4), -1.0, dtype=np.float32)
+        changed[1:] = [[100, 101, 102, 103], [200, 201, 202, 203]]
+        queries.rows = rows(['b', 'd', 'e'], '2024-01-02T00:00:00+00:00')
+        queries.matrix = changed
+        
+        reopened = EmbeddingSnapshot(Path(tmp) / 'snapshot')
+        assert reopened.sync(queries) == (1, 2)
+        assert queries.since[-1] == '2023-12-31T23:50:00+00:00', queries.since
+        assert reopened.presentation_ids == ['a', 'b', 'c', 'd', 'e']
+        assert reopened.row('d') == 3 and reopened.row('x') is None
+        expected = np.vstack([first[0], changed[0], first[2], changed[1], changed[2]])
+        assert reopened.embeddings.shape == (5, 4)
+        assert np.array_equal(reopened.embeddings, expected)
+        
+        # The appended header must describe the file for plain readers too
+        assert np.array_equal(np.load(reopened.matrix_path), expected)
+        opened = EmbeddingSnapshot.open(Path(tmp) / 'snapshot')
+        assert opened.synced_at == '2024-01-02T00:00:00+00:00'
+        assert np.array_equal(opened.embeddings, expected)
+        
+        # Rows past n_rows (an interrupted sync) are overwritten, not kept
+        path = Path(tmp) / 'append.npy'
+        np.save(path, np.ones((4, 3), dtype=np.float32))
+        _append_rows(path, 3, np.full((2, 3), 7, dtype=np.float32))
+        appended = np.load(path)
+        assert appended.shape == (5, 3), appended.shape
+        assert np.array_equal(appended[:3], np.ones((3, 3))) and np.array_equal(appended[3:], np.full((2, 3), 7))
+        
+    print("\nSnapshot rebuild, in-place update and append verified")
 
 
 if __name__ == '__main__':
@@ -119,9 +280,12 @@ if __name__ == '__main__':
     
     try:
         test_entity_extraction()
+        test_windowed_entity_offsets()
         test_keyword_extraction()
         test_embedding_generation()
         test_utilities()
+        test_embedding_codec()
+        test_embedding_snapshot()
         
         print("\n" + "=" * 50)
         print("ALL TESTS COMPLETED SUCCESSFULLY!")
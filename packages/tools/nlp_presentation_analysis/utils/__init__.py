@@ -2,14 +2,24 @@
 
 import re
 import unicodedata
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
 import logging
 
+from .term_matcher import TermMatcher
+
 logger = logging.getLogger(__name__)
 
+# ASCII control characters other than whitespace, deleted via str.translate
+_ASCII_CONTROL_TABLE = {code: None for code in [*range(0x20), 0x7f] if not chr(code).isspace()}
+
+
 def clean_text(text: str) -> str:
     """Clean text for NLP processing.
     
+    Unicode is NFKC-normalized: compatibility characters (ligatures,
+    full-width forms) are folded, but accented letters stay composed, so
+    extracted terms match text stored in the usual NFC form.
+    
     Args:
         text: Raw text
         
@@ -19,22 +29,23 @@ def clean_text(text: str) -> str:
     if not text:
         return ""
         
-    # Normalize unicode characters
-    text = unicodedata.normalize('NFKD', text)
-    
-    # Remove control characters
-    text = ''.join(char for char in text if unicodedata.category(char)[0] != 'C')
-    
-    # Replace multiple newlines with double newline
-    text = re.sub(r'\n\s*\n', '\n\n', text)
-    
-    # Replace multiple spaces with single space
-    text = re.sub(r'\s+', ' ', text)
-    
-    # Remove leading/trailing whitespace
-    text = text.strip()
-    
-    return text
+    if text.isascii():
+        # ASCII is already in NFKC form; translate has a fast path for it
+        text = text.translate(_ASCII_CONTROL_TABLE)
+    else:
+        # Normalize unicode characters
+        text = unicodedata.normalize('NFKC', text)
+        
+        # Remove control characters, looking up each distinct character once
+        controls = ''.join(
+            char for char in set(text)
+            if unicodedata.category(char)[0] == 'C' and not char.isspace()
+        )
+        if controls:
+            text = re.sub(f"[{re.escape(controls)}]+", '', text)
+            
+    # Collapse whitespace (including newlines and tabs) to single spaces
+    return ' '.join(text.split())
 
 
 def remove_urls(text: str) -> str:
@@ -99,10 +110,23 @@ def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 200) -> List[st
     Returns:
         List of text chunks
     """
+    return [chunk for _, chunk in iter_text_windows(text, chunk_size, overlap)]
+
+
+def iter_text_windows(text: str, chunk_size: int = 1000, overlap: int = 200) -> Iterator[Tuple[int, str]]:
+    """Lazily split text into overlapping chunks with their offsets.
+    
+    Args:
+        text: Text to chunk
+        chunk_size: Size of each chunk in characters
+        overlap: Overlap between chunks
+        
+    Yields:
+        (offset, chunk) where offset is the chunk's start position in text
+    """
     if not text:
-        return []
+        return
         
-    chunks = []
     start = 0
     text_length = len(text)
     
@@ -118,68 +142,107 @@ def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 200) -> List[st
                     end = start + last_marker + len(marker)
                     break
                     
-        chunk = text[start:end].strip()
+        window = text[start:end]
+        chunk = window.strip()
         if chunk:
-            chunks.append(chunk)
+            yield start + len(window) - len(window.lstrip()), chunk
             
         # Move start position
         start = max(start + 1, end - overlap)
-        
-    return chunks
 
 
-def extract_medical_abbreviations(text: str) -> List[str]:
+# Known medical abbreviations, including mixed-case forms that are not all caps
+MEDICAL_ABBREVIATIONS = frozenset({
+    'ADHD', 'ASD', 'ATP', 'BMI', 'CBC', 'CDR', 'CFS', 'CoQ10', 'CRP', 'DNA', 'GABA', 'GI',
+    'HbA1c', 'HPA', 'IBS', 'IgE', 'IgG', 'LDL', 'HDL', 'ME/CFS', 'MTHFR', 'mRNA', 'mtDNA',
+    'NAC', 'NAD+', 'NADH', 'PCOS', 'POTS', 'PTSD', 'RNA', 'SIBO', 'SNP', 'T3', 'T4', 'TSH'
+})
+
+_ABBREVIATION_MATCHER = TermMatcher(MEDICAL_ABBREVIATIONS, case_sensitive=True, whole_words=True)
+
+# Unknown abbreviations: uppercase words of 2-6 letters
+_ABBREVIATION_RE = re.compile(r'\b[A-Z]{2,6}\b')
+
+# Common words that look like abbreviations
+_COMMON_UPPERCASE_WORDS = frozenset({'THE', 'AND', 'FOR', 'ARE', 'NOT', 'YOU', 'ALL', 'USE', 'HER', 'HIS'})
+
+
+def extract_medical_abbreviations(text: str,
+                                  vocabulary: Optional[Union[TermMatcher, Iterable[str]]] = None,
+                                  include_unknown: bool = True) -> List[str]:
     """Extract potential medical abbreviations.
     
+    Known abbreviations are looked up with a case-sensitive, whole-word
+    TermMatcher in one scan, so mixed-case forms such as "mRNA" are found;
+    uppercase words outside the vocabulary are added as candidates.
+    
     Args:
         text: Input text
+        vocabulary: Known abbreviations, or a prebuilt TermMatcher to reuse
+            across calls (defaults to MEDICAL_ABBREVIATIONS)
+        include_unknown: Also return uppercase words not in the vocabulary
         
     Returns:
-        List of abbreviations
+        Unique abbreviations, known ones first, in text order
     """
-    # Pattern for uppercase abbreviations (2-6 letters)
-    abbrev_pattern = re.compile(r'\b[A-Z]{2,6}\b')
-    
-    abbreviations = abbrev_pattern.findall(text)
-    
-    # Filter common words
-    common_words = {'THE', 'AND', 'FOR', 'ARE', 'NOT', 'YOU', 'ALL', 'USE', 'HER', 'HIS'}
-    abbreviations = [abbr for abbr in abbreviations if abbr not in common_words]
-    
-    # Return unique abbreviations
-    return list(set(abbreviations))
+    if vocabulary is None:
+        matcher = _ABBREVIATION_MATCHER
+    elif isinstance(vocabulary, TermMatcher):
+        matcher = vocabulary
+    else:
+        matcher = TermMatcher(vocabulary, case_sensitive=True, whole_words=True)
+        
+    abbreviations = dict.fromkeys(match.term for match in matcher.find_longest(text))
+    if include_unknown:
+        abbreviations.update(dict.fromkeys(
+            abbr for abbr in _ABBREVIATION_RE.findall(text)
+            if abbr not in _COMMON_UPPERCASE_WORDS
+        ))
+    return list(abbreviations)
+
+
+_VITAMINS = {'d': 'vitamin D', 'b12': 'vitamin B12', 'c': 'vitamin C'}
+
+# Common medical term variations (matched case-insensitively as whole words)
+MEDICAL_TERM_REPLACEMENTS = {
+    **{f"vit{sep}{vitamin}": name for vitamin, name in _VITAMINS.items() for sep in ('', ' ', '.', '. ')},
+    'mg': 'milligrams',
+    'ml': 'milliliters',
+    'dr': 'doctor',
+    'med': 'medications',
+    'meds': 'medications',
+    'pt': 'patient',
+    'hx': 'history',
+    'dx': 'diagnosis',
+    'tx': 'treatment',
+    'rx': 'prescription'
+}
+
+_MEDICAL_TERM_MATCHER = TermMatcher(MEDICAL_TERM_REPLACEMENTS, whole_words=True)
 
 
-def normalize_medical_terms(text: str) -> str:
+def normalize_medical_terms(text: str, matcher: Optional[TermMatcher] = None) -> str:
     """Normalize common medical term variations.
     
+    Every variation is found in one TermMatcher scan; overlapping matches
+    resolve to the leftmost-longest one.
+    
     Args:
         text: Input text
+        matcher: TermMatcher whose values are the replacements (defaults to
+            MEDICAL_TERM_REPLACEMENTS)
         
     Returns:
         Text with normalized medical terms
     """
-    # Common medical term variations
-    replacements = {
-        r'\bvit\.?\s*d\b': 'vitamin D',
-        r'\bvit\.?\s*b12\b': 'vitamin B12',
-        r'\bvit\.?\s*c\b': 'vitamin C',
-        r'\bmg\b': 'milligrams',
-        r'\bml\b': 'milliliters',
-        r'\bdr\.?\b': 'doctor',
-        r'\bmeds?\b': 'medications',
-        r'\bpt\b': 'patient',
-        r'\bhx\b': 'history',
-        r'\bdx\b': 'diagnosis',
-        r'\btx\b': 'treatment',
-        r'\brx\b': 'prescription'
-    }
-    
-    normalized_text = text
-    for pattern, replacement in replacements.items():
-        normalized_text = re.sub(pattern, replacement, normalized_text, flags=re.IGNORECASE)
-        
-    return normalized_text
+    parts = []
+    last_end = 0
+    for match in (matcher or _MEDICAL_TERM_MATCHER).find_longest(text):
+        parts.append(text[last_end:match.start])
+        parts.append(match.value)
+        last_end = match.end
+    parts.append(text[last_end:])
+    return ''.join(parts)
 
 
 def extract_dosages(text: str) -> List[str]:
@@ -233,6 +296,31 @@ def extract_timestamps(text: str) -> List[str]:
     return timestamps
 
 
+# Bracketed or line-leading timestamps such as "[01:02:03]", "(12:30)" or "05:10 "
+_TIMESTAMP_MARKER_RE = re.compile(
+    r'(?:[\[\(](?:(\d{1,2}):)?(\d{1,2}):(\d{2})[\]\)])|(?:^(?:(\d{1,2}):)?(\d{1,2}):(\d{2})\b)',
+    re.MULTILINE
+)
+
+
+def iter_timestamp_markers(text: str) -> Iterator[Tuple[int, int]]:
+    """Find transcript timestamp markers and their positions.
+    
+    Only markers in brackets or at the start of a line count, so clock
+    times mentioned in speech ("at 10:30") are not mistaken for them.
+    
+    Args:
+        text: Transcript text
+        
+    Yields:
+        (offset, seconds) for each marker, in text order
+    """
+    for match in _TIMESTAMP_MARKER_RE.finditer(text):
+        groups = match.groups()
+        hours, minutes, seconds = groups[:3] if groups[2] is not None else groups[3:]
+        yield match.start(), int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds)
+
+
 def prepare_for_embedding(text: str, max_length: int = 512) -> str:
     """Prepare text for embedding generation.
     
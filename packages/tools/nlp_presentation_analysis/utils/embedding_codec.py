@@ -0,0 +1,84 @@
+"""Compact binary storage format for embeddings."""
+
+from typing import Any, Sequence
+import base64
+import numpy as np
+
+# 'vector' is the pgvector column (JSON floats on the wire); the others are
+# packed little-endian binary, base64-encoded into a text column
+EMBEDDING_FORMATS = ('vector', 'float32', 'float16', 'int8')
+PACKED_FORMATS = ('float32', 'float16', 'int8')
+
+_DTYPES = {'float32': np.dtype('<f4'), 'float16': np.dtype('<f2')}
+
+# int8 rows start with their float32 scale
+_SCALE_BYTES = 4
+
+
+def encode_embedding(embedding: Any, fmt: str) -> str:
+    """Pack an embedding into a base64 string.
+
+    int8 uses symmetric scalar quantization with one scale per vector
+    (max |x| / 127), stored ahead of the values.
+
+    Args:
+        embedding: 1-D vector (list or array)
+        fmt: One of PACKED_FORMATS
+
+    Returns:
+        Base64-encoded packed vector
+    """
+    vector = np.asarray(embedding, dtype=np.float32).ravel()
+
+    if fmt == 'int8':
+        peak = float(np.abs(vector).max()) if len(vector) else 0.0
+        scale = peak / 127 if peak > 0 else 1.0
+        values = np.clip(np.rint(vector / scale), -127, 127).astype(np.int8)
+        payload = np.float32(scale).astype('<f4').tobytes() + values.tobytes()
+    elif fmt in _DTYPES:
+        payload = vector.astype(_DTYPES[fmt]).tobytes()
+    else:
+        raise ValueError(f"Unknown packed embedding format: {fmt}. Choose from {', '.join(PACKED_FORMATS)}")
+
+    return base64.b64encode(payload).decode('ascii')
+
+
+def decode_embeddings(packed: Sequence[str], fmt: str) -> np.ndarray:
+    """Decode packed embeddings of one format straight into a float32 matrix.
+
+    The rows are base64-decoded into one buffer and viewed as an array, so
+    no per-value Python objects are created.
+
+    Args:
+        packed: Base64 strings from encode_embedding, all of the same dimension
+        fmt: Their format (one of PACKED_FORMATS)
+
+    Returns:
+        Matrix of shape (n, dim)
+    """
+    if not packed:
+        return np.zeros((0, 0), dtype=np.float32)
+
+    buffer = b''.join(base64.b64decode(p) for p in packed)
+
+    if fmt == 'int8':
+        raw = np.frombuffer(buffer, dtype=np.uint8).reshape(len(packed), -1)
+        scales = raw[:, :_SCALE_BYTES].copy().view('<f4')
+        return raw[:, _SCALE_BYTES:].view(np.int8).astype(np.float32) * scales
+    if fmt in _DTYPES:
+        return np.frombuffer(buffer, dtype=_DTYPES[fmt]).reshape(len(packed), -1).astype(np.float32)
+
+    raise ValueError(f"Unknown packed embedding format: {fmt}. Choose from {', '.join(PACKED_FORMATS)}")
+
+
+def decode_embedding(packed: str, fmt: str) -> np.ndarray:
+    """Decode one packed embedding.
+
+    Args:
+        packed: Base64 string from encode_embedding
+        fmt: Its format
+
+    Returns:
+        1-D float32 array
+    """
+    return decode_embeddings([packed], fmt)[0]
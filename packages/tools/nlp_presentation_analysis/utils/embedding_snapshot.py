@@ -0,0 +1,247 @@
+"""Memory-mapped local snapshot of the presentation embeddings table."""
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import io
+import json
+import logging
+import os
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Incremental syncs re-read rows written this long before the watermark, so
+# transactions that committed after a sync with an earlier updated_at are seen
+SYNC_OVERLAP = timedelta(minutes=10)
+
+
+class EmbeddingSnapshot:
+    """Embedding matrix in <path>.npy with an ID index in <path>.json.
+
+    The matrix is opened memory-mapped, so loading is instant and pages are
+    read only as they are touched. sync() fetches only rows written since the
+    last sync (by the server-side updated_at, minus an overlap window):
+    changed embeddings are overwritten in place and new ones appended to the
+    .npy without rewriting it. The sidecar is
+    replaced atomically after the matrix is written and records the row
+    count, so an interrupted sync leaves the previous snapshot readable.
+    Deleted embeddings are only dropped by a rebuild.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """Initialize the snapshot.
+
+        Args:
+            path: Base path without extension
+        """
+        self.path = Path(path)
+        self.presentation_ids: List[str] = []
+        self.model_names: List[str] = []
+        self.synced_at: Optional[str] = None
+        self.embeddings = np.zeros((0, 0), dtype=np.float32)
+        self._rows: Dict[str, int] = {}
+
+    @property
+    def matrix_path(self) -> Path:
+        return self.path.with_suffix('.npy')
+
+    @property
+    def sidecar_path(self) -> Path:
+        return self.path.with_suffix('.json')
+
+    def __len__(self) -> int:
+        return len(self.presentation_ids)
+
+    def exists(self) -> bool:
+        """Check whether the snapshot has been written."""
+        return self.matrix_path.exists() and self.sidecar_path.exists()
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> 'EmbeddingSnapshot':
+        """Open a snapshot read-only and memory-mapped.
+
+        Args:
+            path: Base path without extension
+
+        Returns:
+            Snapshot (empty if none has been written yet)
+        """
+        snapshot = cls(path)
+        if snapshot.exists():
+            snapshot._load()
+        return snapshot
+
+    def row(self, presentation_id: str) -> Optional[int]:
+        """Matrix row of a presentation.
+
+        Args:
+            presentation_id: UUID of the presentation
+
+        Returns:
+            Row index, or None if the presentation has no embedding
+        """
+        return self._rows.get(presentation_id)
+
+    def sync(self, queries: Any, rebuild: bool = False, page_size: int = 1000,
+             overlap: timedelta = SYNC_OVERLAP) -> Tuple[int, int]:
+        """Bring the snapshot up to date with the database.
+
+        Args:
+            queries: PresentationQueries
+            rebuild: Refetch every row and rewrite the snapshot
+            page_size: Rows fetched per request
+            overlap: How far before the last watermark to re-read; rows
+                committed that much after their updated_at are still seen
+
+        Returns:
+            Tuple of (rows updated in place, rows appended)
+        """
+        if not rebuild and self.exists():
+            self._load()
+            since = (_parse_timestamp(self.synced_at) - overlap).isoformat() if self.synced_at else None
+        else:
+            since = None
+            rebuild = True
+
+        rows, matrix = queries.get_embeddings_since(since, page_size=page_size)
+
+        if rebuild:
+            self._write(rows, matrix)
+            logger.info(f"Wrote embedding snapshot of {len(rows)} rows to {self.matrix_path}")
+            return 0, len(rows)
+
+        updated, appended = self._merge(rows, matrix)
+        logger.info(f"Synced embedding snapshot: {updated} updated, {appended} appended, {len(self)} rows")
+        return updated, appended
+
+    def _load(self):
+        """Read the sidecar and memory-map the matrix read-only."""
+        with open(self.sidecar_path) as f:
+            sidecar = json.load(f)
+
+        self.presentation_ids = sidecar['presentation_ids']
+        self.model_names = sidecar['model_names']
+        self.synced_at = sidecar.get('synced_at')
+        self._rows = {pid: i for i, pid in enumerate(self.presentation_ids)}
+
+        # Rows past the sidecar's count belong to an interrupted sync
+        self.embeddings = np.load(self.matrix_path, mmap_mode='r')[:len(self.presentation_ids)]
+
+    def _write(self, rows: List[Dict[str, Any]], matrix: np.ndarray):
+        """Replace the snapshot with the given rows."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp_path = self.matrix_path.with_suffix('.npy.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.save(f, np.ascontiguousarray(matrix, dtype=np.float32))
+        os.replace(tmp_path, self.matrix_path)
+
+        self._write_sidecar([r['presentation_id'] for r in rows], [r['model_name'] for r in rows],
+                            self._watermark(rows, None))
+        self._load()
+
+    def _merge(self, rows: List[Dict[str, Any]], matrix: np.ndarray) -> Tuple[int, int]:
+        """Overwrite changed rows in place and append new ones."""
+        if not rows:
+            return 0, 0
+
+        presentation_ids = list(self.presentation_ids)
+        model_names = list(self.model_names)
+        existing = [(self._rows[r['presentation_id']], i) for i, r in enumerate(rows)
+                    if r['presentation_id'] in self._rows]
+        new = [i for i, r in enumerate(rows) if r['presentation_id'] not in self._rows]
+
+        if len(self) and matrix.shape[1] != self.embeddings.shape[1]:
+            raise ValueError(f"Embedding dimension changed ({self.embeddings.shape[1]} -> "
+                             f"{matrix.shape[1]}); rebuild the snapshot")
+
+        # Release the read-only map before writing
+        self.embeddings = np.zeros((0, 0), dtype=np.float32)
+
+        if existing:
+            writable = np.load(self.matrix_path, mmap_mode='r+')
+            for target, source in existing:
+                writable[target] = matrix[source]
+                model_names[target] = rows[source]['model_name']
+            writable.flush()
+            del writable
+
+        if new:
+            _append_rows(self.matrix_path, len(presentation_ids), matrix[new])
+            presentation_ids.extend(rows[i]['presentation_id'] for i in new)
+            model_names.extend(rows[i]['model_name'] for i in new)
+
+        self._write_sidecar(presentation_ids, model_names, self._watermark(rows, self.synced_at))
+        self._load()
+        return len(existing), len(new)
+
+    def _write_sidecar(self, presentation_ids: Sequence[str], model_names: Sequence[str],
+                       synced_at: Optional[str]):
+        tmp_path = self.sidecar_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'presentation_ids': list(presentation_ids),
+                'model_names': list(model_names),
+                'synced_at': synced_at
+            }, f)
+        os.replace(tmp_path, self.sidecar_path)
+
+    @staticmethod
+    def _watermark(rows: List[Dict[str, Any]], previous: Optional[str]) -> Optional[str]:
+        """Latest server-side updated_at seen (sync() re-reads an overlap window before it)."""
+        timestamps = [_parse_timestamp(r['updated_at']) for r in rows if r.get('updated_at')]
+        if previous:
+            timestamps.append(_parse_timestamp(previous))
+        return max(timestamps).isoformat() if timestamps else None
+
+
+def _parse_timestamp(value: str) -> datetime:
+    """Parse an ISO timestamp, reading naive values (older sidecars) as UTC."""
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _append_rows(path: Path, n_rows: int, rows: np.ndarray):
+    """Append rows to a 2-D float32 .npy file, rewriting only its header.
+
+    The header is padded to a multiple of 64 bytes, so the larger shape
+    almost always fits in place; otherwise the file is rewritten once.
+
+    Args:
+        path: .npy file
+        n_rows: Rows currently in use (later rows are from an interrupted sync)
+        rows: Rows to append
+    """
+    rows = np.ascontiguousarray(rows, dtype=np.float32)
+
+    with open(path, 'r+b') as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            _, _, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            _, _, dtype = np.lib.format.read_array_header_2_0(f)
+        data_offset = f.tell()
+
+        header = io.BytesIO()
+        new_shape = (n_rows + len(rows), rows.shape[1])
+        np.lib.format.write_array_header_1_0(
+            header, {'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False, 'shape': new_shape}
+        )
+
+        if dtype == np.float32 and len(header.getvalue()) == data_offset:
+            f.seek(data_offset + n_rows * rows.shape[1] * dtype.itemsize)
+            f.write(rows.tobytes())
+            f.truncate()
+            f.seek(0)
+            f.write(header.getvalue())
+            return
+
+    # Header grew: rewrite the whole file
+    existing = np.load(path, mmap_mode='r')[:n_rows]
+    combined = np.vstack([existing, rows])
+    del existing
+    tmp_path = path.with_suffix('.npy.tmp')
+    with open(tmp_path, 'wb') as f:
+        np.save(f, combined)
+    os.replace(tmp_path, path)
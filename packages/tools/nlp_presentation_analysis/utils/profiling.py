@@ -0,0 +1,314 @@
+"""Lightweight timers, counters and sampled profiling for analysis runs."""
+
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+import inspect
+import logging
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ENGINES = ('cprofile', 'pyinstrument')
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted values.
+
+    Args:
+        sorted_values: Values in ascending order
+        q: Percentile between 0 and 100
+
+    Returns:
+        Percentile value (0.0 for no values)
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[min(int(rank), len(sorted_values)) - 1]
+
+
+class Profiler:
+    """Collect named durations and counters across threads.
+
+    Disabled profilers make timer() and count() no-ops, so instrumentation
+    can stay in hot paths. Durations are kept per call, which is what the
+    p50/p95 summary needs; a run records a few per presentation and stage.
+    """
+
+    def __init__(self, enabled: bool = False):
+        """Initialize the profiler.
+
+        Args:
+            enabled: Start recording immediately
+        """
+        self.enabled = enabled
+        self.durations: Dict[str, List[float]] = {}
+        self.counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+
+    def reset(self):
+        """Drop everything recorded and restart the run clock."""
+        with self._lock:
+            self.durations = {}
+            self.counters = {}
+            self._started = time.perf_counter()
+
+    def record(self, name: str, seconds: float):
+        """Record one measured duration.
+
+        Args:
+            name: Timer name, e.g. 'stage.spacy' or 'db.upsert'
+            seconds: Duration
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self.durations.setdefault(name, []).append(seconds)
+
+    def count(self, name: str, value: float = 1):
+        """Add to a counter.
+
+        Args:
+            name: Counter name, e.g. 'tokens' or 'db.rows_written'
+            value: Amount to add
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Time a block.
+
+        Args:
+            name: Timer name
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def iter_timed(self, name: str, iterable: Iterable[Any]) -> Iterator[Any]:
+        """Time how long each item of a lazy iterable takes to produce.
+
+        Args:
+            name: Timer name
+            iterable: Iterable whose work happens on next() (e.g. a generator)
+
+        Yields:
+            The iterable's items
+        """
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self.record(name, time.perf_counter() - start)
+            yield item
+
+    def drain(self) -> Dict[str, Any]:
+        """Take and clear everything recorded so far.
+
+        Used in worker processes, whose records would otherwise die with them.
+
+        Returns:
+            Durations and counters, for merge() in the parent
+        """
+        with self._lock:
+            records = {'durations': self.durations, 'counters': self.counters}
+            self.durations = {}
+            self.counters = {}
+        return records
+
+    def merge(self, records: Dict[str, Any]):
+        """Add records taken with drain() in another process.
+
+        Args:
+            records: Output of drain()
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            for name, values in records['durations'].items():
+                self.durations.setdefault(name, []).extend(values)
+            for name, value in records['counters'].items():
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    def summary(self) -> Dict[str, Any]:
+        """Summarize the run.
+
+        tokens_per_sec divides the 'tokens' counter by the time spent in
+        'stage.spacy' (time spent parsing, not wall-clock time).
+
+        Returns:
+            Wall-clock seconds, per-timer count/total/mean/p50/p95/max
+            (seconds), counters, and tokens/sec
+        """
+        with self._lock:
+            durations = {name: sorted(values) for name, values in self.durations.items()}
+            counters = dict(self.counters)
+
+        timers = {}
+        for name, values in sorted(durations.items()):
+            total = sum(values)
+            timers[name] = {
+                'count': len(values),
+                'total': round(total, 4),
+                'mean': round(total / len(values), 4),
+                'p50': round(percentile(values, 50), 4),
+                'p95': round(percentile(values, 95), 4),
+                'max': round(values[-1], 4)
+            }
+
+        spacy_seconds = timers.get('stage.spacy', {}).get('total', 0.0)
+        return {
+            'elapsed': round(time.perf_counter() - self._started, 3),
+            'timers': timers,
+            'counters': counters,
+            'tokens_per_sec': round(counters.get('tokens', 0) / spacy_seconds, 1) if spacy_seconds > 0 else 0.0
+        }
+
+    def log_summary(self, level: int = logging.INFO):
+        """Log the run summary as a table."""
+        summary = self.summary()
+        logger.log(level, f"Timing summary ({summary['elapsed']}s wall clock):")
+        for name, stats in summary['timers'].items():
+            logger.log(
+                level,
+                f"  {name:<28} n={stats['count']:<6} total={stats['total']:>9.3f}s "
+                f"p50={stats['p50'] * 1000:>8.1f}ms p95={stats['p95'] * 1000:>8.1f}ms "
+                f"max={stats['max'] * 1000:>8.1f}ms"
+            )
+        for name, value in sorted(summary['counters'].items()):
+            logger.log(level, f"  {name:<28} {value:g}")
+        if summary['tokens_per_sec']:
+            logger.log(level, f"  {'tokens/sec (spaCy)':<28} {summary['tokens_per_sec']:g}")
+
+
+# Process-wide profiler; instrumented code records into it once enabled
+profiler = Profiler()
+
+
+def timed(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorate a function to record its duration in the process-wide profiler.
+
+    Generator functions are timed per item they produce, since their work
+    happens on next() rather than in the call.
+
+    Args:
+        name: Timer name
+
+    Returns:
+        Decorator
+    """
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        if inspect.isgeneratorfunction(func):
+            @wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                if not profiler.enabled:
+                    return func(*args, **kwargs)
+                return profiler.iter_timed(name, func(*args, **kwargs))
+            return generator_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.record(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+class SampleProfiler:
+    """Run a full profiler on every Nth presentation and save its output.
+
+    cProfile writes <label>.prof (open with pstats or snakeviz);
+    pyinstrument (optional dependency) writes <label>.html. Only one sample
+    is profiled at a time: samples that would overlap are skipped.
+    """
+
+    def __init__(self, output_dir: Union[str, Path], every: int = 1, engine: str = 'cprofile'):
+        """Initialize the sample profiler.
+
+        Args:
+            output_dir: Directory for profile files
+            every: Profile every Nth call of profile()
+            engine: 'cprofile' or 'pyinstrument'
+
+        Raises:
+            ImportError: If pyinstrument is requested but not installed
+        """
+        if engine not in PROFILE_ENGINES:
+            raise ValueError(f"Unknown profile engine: {engine}. Choose from {', '.join(PROFILE_ENGINES)}")
+        if engine == 'pyinstrument':
+            import pyinstrument  # noqa: F401  (fail before the run, not at the first sample)
+
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.every = max(1, every)
+        self.engine = engine
+        self.written: List[Path] = []
+        self._calls = 0
+        self._lock = threading.Lock()
+        self._active = threading.Lock()
+
+    @contextmanager
+    def profile(self, label: str) -> Iterator[Optional[Path]]:
+        """Profile a block if it is a selected sample.
+
+        Args:
+            label: Sample name, used for the output file name
+
+        Yields:
+            Output path if the block is profiled, else None
+        """
+        with self._lock:
+            self._calls += 1
+            selected = (self._calls - 1) % self.every == 0
+
+        if not selected or not self._active.acquire(blocking=False):
+            yield None
+            return
+
+        path = self.output_dir / re.sub(r'[^\w-]+', '_', label)
+        try:
+            if self.engine == 'pyinstrument':
+                from pyinstrument import Profiler as InstrumentProfiler
+
+                sampler = InstrumentProfiler()
+                sampler.start()
+                try:
+                    yield path.with_suffix('.html')
+                finally:
+                    sampler.stop()
+                    path.with_suffix('.html').write_text(sampler.output_html())
+                    self.written.append(path.with_suffix('.html'))
+            else:
+                import cProfile
+
+                tracer = cProfile.Profile()
+                tracer.enable()
+                try:
+                    yield path.with_suffix('.prof')
+                finally:
+                    tracer.disable()
+                    tracer.dump_stats(str(path.with_suffix('.prof')))
+                    self.written.append(path.with_suffix('.prof'))
+        finally:
+            self._active.release()
@@ -0,0 +1,134 @@
+"""Vectorized similarity utilities for embedding matrices."""
+
+from typing import Iterator, List, Tuple, Any, Sequence
+import json
+import numpy as np
+
+
+def to_vector(value: Any) -> np.ndarray:
+    """Convert a stored embedding into a float32 vector.
+
+    Args:
+        value: Embedding as a list of floats or a pgvector string ("[0.1,0.2,...]")
+
+    Returns:
+        1-D float32 array
+    """
+    if isinstance(value, str):
+        value = json.loads(value)
+    return np.asarray(value, dtype=np.float32)
+
+
+def build_embedding_matrix(embeddings: Sequence[Any]) -> np.ndarray:
+    """Stack stored embeddings into a single float32 matrix.
+
+    Args:
+        embeddings: Sequence of embeddings (lists or pgvector strings)
+
+    Returns:
+        Matrix of shape (n, dim)
+    """
+    if not embeddings:
+        return np.zeros((0, 0), dtype=np.float32)
+    return np.vstack([to_vector(e) for e in embeddings])
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize each row so dot products equal cosine similarities.
+
+    Args:
+        matrix: Matrix of shape (n, dim)
+
+    Returns:
+        Normalized float32 matrix (zero rows are left as zeros)
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def iter_top_k_similar(normalized: np.ndarray, k: int, block_size: int = 1024,
+                       exclude_self: bool = True) -> Iterator[Tuple[int, np.ndarray, np.ndarray]]:
+    """Compute top-k neighbours for every row using blocked matrix multiplication.
+
+    Only a (block_size x n) score matrix is held in memory at a time, so
+    memory stays bounded regardless of corpus size.
+
+    Args:
+        normalized: Row-normalized matrix of shape (n, dim)
+        k: Number of neighbours per row
+        block_size: Number of rows scored per block
+        exclude_self: Whether to exclude each row from its own neighbours
+
+    Yields:
+        (start_row, indices, scores) for each block, where indices and scores
+        have shape (rows_in_block, k) sorted by descending similarity
+    """
+    n = normalized.shape[0]
+    k = min(k, n - 1 if exclude_self else n)
+    if k <= 0:
+        return
+
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        scores = normalized[start:stop] @ normalized.T
+
+        if exclude_self:
+            rows = np.arange(stop - start)
+            scores[rows, rows + start] = -np.inf
+
+        indices, top_scores = top_k_rows(scores, k)
+        yield start, indices, top_scores
+
+
+def top_k_rows(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Select the k highest scores in each row of a score matrix.
+
+    Args:
+        scores: Matrix of shape (rows, n)
+        k: Number of entries to keep per row (clipped to n)
+
+    Returns:
+        Tuple of (indices, scores), each of shape (rows, k) sorted by descending score
+    """
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        empty = np.zeros((scores.shape[0], 0))
+        return empty.astype(np.int64), empty.astype(scores.dtype)
+
+    # Partial selection is O(n) per row, then sort only the k winners
+    if k < scores.shape[1]:
+        indices = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        indices = np.tile(np.arange(scores.shape[1]), (scores.shape[0], 1))
+    top_scores = np.take_along_axis(scores, indices, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind='stable')
+
+    return np.take_along_axis(indices, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+
+def top_k_similar(normalized: np.ndarray, k: int, block_size: int = 1024,
+                  exclude_self: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """Compute top-k neighbours for every row.
+
+    Args:
+        normalized: Row-normalized matrix of shape (n, dim)
+        k: Number of neighbours per row
+        block_size: Number of rows scored per block
+        exclude_self: Whether to exclude each row from its own neighbours
+
+    Returns:
+        Tuple of (indices, scores), each of shape (n, k)
+    """
+    index_blocks: List[np.ndarray] = []
+    score_blocks: List[np.ndarray] = []
+
+    for _, indices, scores in iter_top_k_similar(normalized, k, block_size, exclude_self):
+        index_blocks.append(indices)
+        score_blocks.append(scores)
+
+    if not index_blocks:
+        return np.zeros((0, 0), dtype=np.int64), np.zeros((0, 0), dtype=np.float32)
+
+    return np.vstack(index_blocks), np.vstack(score_blocks)
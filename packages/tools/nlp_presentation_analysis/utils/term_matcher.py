@@ -0,0 +1,184 @@
+"""Multi-pattern term matching (Aho-Corasick) over large vocabularies."""
+
+from collections import deque
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Union
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+class TermMatch(NamedTuple):
+    """One vocabulary term found in a text."""
+    start: int
+    end: int
+    term: str
+    value: Any
+
+
+class TermMatcher:
+    """Find every vocabulary term in a text in a single linear scan.
+
+    Uses pyahocorasick when it is installed and a pure-Python Aho-Corasick
+    automaton otherwise, so matching costs O(len(text) + matches) whatever
+    the vocabulary size. Each term carries a value (e.g. a canonical form
+    for synonyms and abbreviations) that is returned with its matches.
+    """
+
+    def __init__(self, terms: Union[Mapping[str, Any], Iterable[str]],
+                 case_sensitive: bool = False, whole_words: bool = False):
+        """Build the automaton.
+
+        Args:
+            terms: Terms to find, or a mapping of term to value
+            case_sensitive: Match case exactly
+            whole_words: Only report matches not preceded or followed by a
+                letter or digit
+
+        Raises:
+            ValueError: If two terms of a mapping differ only by case (with
+                case_sensitive=False) and have different values
+        """
+        self.case_sensitive = case_sensitive
+        self.whole_words = whole_words
+
+        check_values = isinstance(terms, Mapping)
+        if not check_values:
+            terms = {term: term for term in terms}
+
+        # Pattern id -> (term as given, value, key length)
+        self._patterns: List[tuple] = []
+        keys: Dict[str, int] = {}
+        for term, value in terms.items():
+            key = self._normalize(term)
+            if not key:
+                continue
+            if key in keys:
+                other_term, other_value, _ = self._patterns[keys[key]]
+                if check_values and other_value != value:
+                    raise ValueError(f"Terms {other_term!r} and {term!r} only differ by case but map to "
+                                     f"{other_value!r} and {value!r}; use case_sensitive=True")
+                self._patterns[keys[key]] = (term, value, len(key))
+            else:
+                keys[key] = len(self._patterns)
+                self._patterns.append((term, value, len(key)))
+
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for key, pattern_id in keys.items():
+                self._automaton.add_word(key, pattern_id)
+            if keys:
+                self._automaton.make_automaton()
+        else:
+            self._build(keys)
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    @property
+    def terms(self) -> List[str]:
+        """Vocabulary terms in insertion order."""
+        return [term for term, _, _ in self._patterns]
+
+    def find_all(self, text: str) -> List[TermMatch]:
+        """Find all (possibly overlapping) term occurrences.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Matches ordered by end offset
+        """
+        if not text or not self._patterns:
+            return []
+
+        haystack = self._normalize(text)
+        matches = []
+
+        for end, pattern_id in self._iter(haystack):
+            term, value, length = self._patterns[pattern_id]
+            start = end - length + 1
+            if self.whole_words and not self._on_word_boundary(text, start, end + 1):
+                continue
+            matches.append(TermMatch(start, end + 1, term, value))
+
+        return matches
+
+    def find_longest(self, text: str) -> List[TermMatch]:
+        """Find leftmost-longest, non-overlapping term occurrences.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Matches ordered by start offset
+        """
+        matches = sorted(self.find_all(text), key=lambda m: (m.start, m.start - m.end))
+
+        selected = []
+        last_end = 0
+        for match in matches:
+            if match.start >= last_end:
+                selected.append(match)
+                last_end = match.end
+
+        return selected
+
+    def _normalize(self, text: str) -> str:
+        """Case-fold text without changing its length, so offsets stay valid."""
+        if self.case_sensitive:
+            return text
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            return lowered
+        return ''.join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+    @staticmethod
+    def _on_word_boundary(text: str, start: int, end: int) -> bool:
+        return ((start == 0 or not text[start - 1].isalnum())
+                and (end == len(text) or not text[end].isalnum()))
+
+    def _build(self, keys: Dict[str, int]):
+        """Build the goto, failure and output tables of the automaton."""
+        self._goto: List[Dict[str, int]] = [{}]
+        self._output: List[List[int]] = [[]]
+
+        for key, pattern_id in keys.items():
+            state = 0
+            for char in key:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(pattern_id)
+
+        # Breadth-first failure links; outputs inherit their suffix's outputs
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def _iter(self, haystack: str):
+        """Yield (end index, pattern id) for every occurrence."""
+        if ahocorasick is not None:
+            yield from self._automaton.iter(haystack)
+            return
+
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for index, char in enumerate(haystack):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for pattern_id in output[state]:
+                yield index, pattern_id